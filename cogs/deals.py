@@ -1,555 +1,1001 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-import aiohttp
 from rapidfuzz import process
 from discord.ext import tasks
-
-class CurrencySelect(discord.ui.Select):
-    def __init__(self, cog, game_data):
-        self.cog = cog
-        self.game_data = game_data
-        
-        common_currencies = [
-            "USD", "EUR", "GBP", "INR", "CAD", "AUD", "BRL", "JPY", "CNY", 
-            "RUB", "KRW", "TRY", "MXN", "IDR", "PLN", "SEK", "CHF", "SGD", 
-            "HKD", "NZD", "THB", "PHP", "MYR", "ZAR", "SAR"
-        ]
+import time
+import asyncio
+import re
+import json
+
+from utils.scheduler import TrackerScheduler
+from utils.track_index import TrackIndex
+from utils.ratelimit import PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND
+from utils.breaker import CircuitOpenError
+from utils.price_history import price_history
+from utils.catalog import title_catalog, normalize_title, CATALOG_PREFIX
+from utils.models import SearchHit, GameDetail, DealListing
+from utils.verdict import verdict_tier, rank_deals, BUY_NOW, VERY_GOOD, GOOD
+from utils.snapshot import warm_snapshot
+from utils.cache import cache
+from utils.metrics import registry
+from utils.tracing import tracer
+
+# Full reload of tracked rows, on top of the reloads triggered by track changes.
+TRACKS_RESYNC_SECONDS = 15 * 60
+
+# /isgood answers from the local price history while its snapshot is this fresh
+ISGOOD_LOCAL_MAX_AGE = 30 * 60
+
+# Discord allows at most 10 embeds per message
+ALERTS_PER_MESSAGE = 10
+
+# g!track flag for threshold mode, e.g. "-below 9.99" or "-below $10"
+BELOW_FLAG = re.compile(r"-below\s+\$?(\d+(?:\.\d+)?)", re.IGNORECASE)
+ATL_FLAG = re.compile(r"-atl\b", re.IGNORECASE)
+SALE_FLAG = re.compile(r"-sale\b", re.IGNORECASE)
+
+# g!trackimport limits: titles per import, attachment size, concurrent CheapShark searches for
+# titles the catalog cannot resolve, and the match score a search result needs to be accepted
+IMPORT_MAX_TITLES = 500
+IMPORT_MAX_BYTES = 1_000_000
+IMPORT_SEARCH_CONCURRENCY = 8
+IMPORT_SEARCH_CUTOFF = 85
+
+# How long a speculatively fetched game detail stays usable
+PREFETCH_TTL = 120
+
+# Search results kept so selection pages and "search for something else" can be re-rendered on click
+SEARCH_CACHE_TTL = 10 * 60
+SEARCH_CACHE_SIZE = 256
+
+# Raw CheapShark game details reused by interactive lookups (the tracker always fetches)
+DETAIL_CACHE_TTL = 2 * 60
+DETAIL_CACHE_SIZE = 1024
+
+# /deals reads one page of the CheapShark deals feed and shows the best of it
+DIGEST_PAGE_SIZE = 60
+DIGEST_SHOWN = 10
+VERDICT_EMOJI = {BUY_NOW: "💎", VERY_GOOD: "🟢", GOOD: "🟡"}
+
+# CheapShark store IDs the bot compares prices across
+STORES = {
+    "1": "Steam", "2": "GamersGate", "3": "GreenManGaming", "4": "Amazon",
+    "5": "GameStop", "6": "Direct2Drive", "7": "GOG", "8": "Origin",
+    "11": "Humble Store", "13": "Uplay", "15": "Fanatical", "25": "Epic Games",
+}
+
+# USD exchange rates are refetched at most this often; older rates are still used if a refetch fails
+RATES_TTL = 6 * 3600
+
+UNAVAILABLE_MESSAGE = "⚠️ CheapShark is currently unavailable. Please try again in a few minutes."
+THRESHOLD_UNSUPPORTED_MESSAGE = (
+    "❌ `-below` tracking isn't available yet: the bot's database has no `threshold` column. "
+    "Ask the bot owner to apply the migration described in the README."
+)
+
+# A tracker sweep fetches each due game once, so it can run from seconds to many minutes
+SWEEP_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1200)
+
+tracker_sweep_seconds = registry.histogram("gameclaim_tracker_sweep_seconds", "Duration of one tracker sweep", buckets=SWEEP_BUCKETS)
+tracker_games = registry.counter(
+    "gameclaim_tracker_games_total", "Distinct games visited by tracker sweeps: checked, failed, deferred or untracked", ("result",)
+)
+tracker_due = registry.gauge("gameclaim_tracker_due_games", "Distinct games due in the last tracker sweep")
+tracker_tracked = registry.gauge("gameclaim_tracker_tracked_games", "Distinct games with at least one tracker")
+tracker_alerts = registry.counter("gameclaim_tracker_alerts_total", "Tracker alerts delivered or dropped", ("result",))
+
+def parse_track_flags(args):
+    """Split g!track style flags off `args`. Returns (track_type, threshold, rest, error)."""
+    if not args:
+        return "sale", None, args, None
+    below = BELOW_FLAG.search(args)
+    if below:
+        threshold = float(below.group(1))
+        if threshold <= 0:
+            return None, None, None, "❌ The target price must be greater than 0."
+        return "below", threshold, BELOW_FLAG.sub("", args, count=1).strip(), None
+    if "-below" in args.lower():
+        return None, None, None, "❌ Please give a target price, e.g. `g!track hades -below 10`."
+    if ATL_FLAG.search(args):
+        return "atl", None, ATL_FLAG.sub("", args, count=1).strip(), None
+    return "sale", None, SALE_FLAG.sub("", args, count=1).strip(), None
+
+def parse_title_list(text):
+    """Titles from a pasted list or file: one per line, or a Steam wishlist JSON export."""
+    text = text.strip()
+    titles = None
+    if text[:1] in ("{", "["):
+        try:
+            data = json.loads(text)
+        except ValueError:
+            data = None
+        if isinstance(data, dict):
+            # Steam wishlistdata: {"<appid>": {"name": ..., ...}, ...}
+            titles = [item.get("name") for item in data.values() if isinstance(item, dict)]
+        elif isinstance(data, list):
+            titles = [item.get("name") if isinstance(item, dict) else item for item in data]
+    if titles is None:
+        titles = [line.strip().lstrip("-•*").strip() for line in text.splitlines()]
+
+    # Drop blanks and repeats, keep the user's order
+    unique = {}
+    for title in titles:
+        if isinstance(title, str) and title.strip():
+            unique.setdefault(normalize_title(title), title.strip())
+    return [title for norm, title in unique.items() if norm]
+
+def describe_track(track_type, threshold=None, short=False):
+    """Human-readable tracking preference."""
+    if track_type == "atl":
+        return "ATL" if short else "All-time low"
+    if track_type == "below":
+        return f"Below ${float(threshold or 0):.2f}"
+    return "Sale" if short else "Any sale"
+
+# Selection and management views are stateless: every component is a DynamicItem whose
+# custom_id carries the little state it needs (gameID, currency, page, action, owner).
+# Clicks re-read data from the search cache, price history, title catalog and tracks
+# cache, so no match lists or game data are held per message and buttons keep working
+# across restarts.
+
+ITEMS_PER_PAGE = 5
+
+COMMON_CURRENCIES = [
+    "USD", "EUR", "GBP", "INR", "CAD", "AUD", "BRL", "JPY", "CNY",
+    "RUB", "KRW", "TRY", "MXN", "IDR", "PLN", "SEK", "CHF", "SGD",
+    "HKD", "NZD", "THB", "PHP", "MYR", "ZAR", "SAR"
+]
+
+def _deals_cog(interaction):
+    return interaction.client.get_cog("Deals")
+
+def _custom_id(*parts):
+    """Join custom_id parts; the free-text query always comes last, so truncating to Discord's 100-char limit only shortens it."""
+    return ":".join(str(part).replace("\n", " ") for part in parts)[:100]
+
+def _currency_code(currency):
+    currency = (currency or "USD").upper()
+    return currency if len(currency) == 3 and currency.isalpha() else "USD"
+
+def _threshold_part(threshold):
+    return f"{threshold:.2f}" if threshold is not None else ""
+
+def _parse_threshold(text):
+    return float(text) if text else None
+
+async def _not_owner_of(interaction, user_id, message="❌ This is not your tracking request."):
+    if str(interaction.user.id) != user_id:
+        await interaction.response.send_message(message, ephemeral=True)
+        return True
+    return False
+
+class CurrencySelect(discord.ui.DynamicItem[discord.ui.Select], template=r"gc:cur:(?P<game_id>[0-9]+)"):
+    def __init__(self, game_id):
+        self.game_id = str(game_id)
         options = [
-            discord.SelectOption(label=curr, description=f"Show prices in {curr}") 
-            for curr in common_currencies
+            discord.SelectOption(label=curr, description=f"Show prices in {curr}")
+            for curr in COMMON_CURRENCIES
         ]
-        
-        super().__init__(placeholder="Change Currency", min_values=1, max_values=1, options=options)
+        super().__init__(discord.ui.Select(
+            placeholder="Change Currency", min_values=1, max_values=1, options=options,
+            custom_id=_custom_id("gc", "cur", self.game_id)
+        ))
+
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls(match["game_id"])
 
+    @tracer.traced("price.currency")
     async def callback(self, interaction: discord.Interaction):
-        await interaction.response.defer()
-        currency = self.values[0]
-        
+        with tracer.span("defer"):
+            await interaction.response.defer()
+        cog = _deals_cog(interaction)
+        currency = self.item.values[0]
+
         # Re-generate embed with new currency
-        embed = await self.cog.create_price_embed(self.game_data, interaction.user.color, currency)
-        await interaction.edit_original_response(embed=embed, view=self.view)
+        data, error = await cog.get_game_details(self.game_id)
+        if error:
+            await interaction.edit_original_response(content=error, embed=None, view=None)
+            return
+        await cog.send_price_embed(interaction, data, currency)
+
+def price_view(detail):
+    view = discord.ui.View(timeout=None)
+    view.add_item(CurrencySelect(detail.game_id))
+
+    # Add a link button to the cheapest deal if available
+    if detail.deals:
+        # Cheapest deal is usually the first one in the list? Or logic in embed.
+        # The API returns deals sorted by savings? Unsure.
+        # We'll use the first one or the "cheapest" field from game lookup.
+        # Actually, let's use the first deal's ID.
+        link = detail.deals[0].url
+        if link:
+            view.add_item(discord.ui.Button(label="View Best Deal", style=discord.ButtonStyle.link, url=link))
+    return view
+
+class GamePickButton(
+    discord.ui.DynamicItem[discord.ui.Button],
+    template=r"gc:pick:(?P<action>price|isgood):(?P<currency>[A-Z]{3}):(?P<game_id>[0-9]+)"
+):
+    def __init__(self, action, currency, game_id, label="Select", style=discord.ButtonStyle.primary):
+        self.action = action  # "price" or "isgood"
+        self.currency = currency
+        self.game_id = str(game_id)
+        super().__init__(discord.ui.Button(
+            label=label[:75], style=style,
+            custom_id=_custom_id("gc", "pick", action, currency, self.game_id)
+        ))
 
-class PriceView(discord.ui.View):
-    def __init__(self, cog, game_data, deals):
-        super().__init__(timeout=120)
-        self.add_item(CurrencySelect(cog, game_data))
-        
-        # Add a link button to the cheapest deal if available
-        if deals:
-            # Cheapest deal is usually the first one in the list? Or logic in embed.
-            # The API returns deals sorted by savings? Unsure. 
-            # We'll use the first one or the "cheapest" field from game lookup.
-            # Actually, let's use the first deal's ID.
-            cheapest_deal_id = deals[0].get("dealID")
-            if cheapest_deal_id:
-                link = f"https://www.cheapshark.com/redirect?dealID={cheapest_deal_id}"
-                self.add_item(discord.ui.Button(label="View Best Deal", style=discord.ButtonStyle.link, url=link))
-
-class TrackConfirmView(discord.ui.View):
-    def __init__(self, cog, game_id, game_name, user, channel_id, all_matches, query, track_type="sale"):
-        super().__init__(timeout=60)
-        self.cog = cog
-        self.game_id = game_id
-        self.game_name = game_name
-        self.user = user
-        self.channel_id = channel_id
-        self.all_matches = all_matches
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls(match["action"], match["currency"], match["game_id"])
+
+    async def callback(self, interaction: discord.Interaction):
+        with tracer.trace(f"{self.action}.pick", game_id=self.game_id):
+            with tracer.span("defer"):
+                await interaction.response.defer()
+            cog = _deals_cog(interaction)
+
+            if self.action == "isgood":
+                await cog._isgood_logic(interaction, self.game_id, interaction.user.color)
+                return
+
+            data, error = await cog.get_game_details(self.game_id)
+            if error:
+                await interaction.edit_original_response(content=error, embed=None, view=None)
+                return
+            await cog.send_price_embed(interaction, data, self.currency)
+
+class SelectionPageButton(
+    discord.ui.DynamicItem[discord.ui.Button],
+    template=r"gc:page:(?P<action>price|isgood):(?P<currency>[A-Z]{3}):(?P<page>[0-9]+):(?P<query>.*)"
+):
+    def __init__(self, action, currency, page, query, label="Next ▶"):
+        self.action = action
+        self.currency = currency
+        self.page = int(page)
         self.query = query
+        super().__init__(discord.ui.Button(
+            label=label, style=discord.ButtonStyle.secondary,
+            custom_id=_custom_id("gc", "page", action, currency, self.page, query)
+        ))
+
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls(match["action"], match["currency"], match["page"], match["query"])
+
+    async def callback(self, interaction: discord.Interaction):
+        with tracer.trace(f"{self.action}.page", page=self.page):
+            with tracer.span("defer"):
+                await interaction.response.defer()
+            cog = _deals_cog(interaction)
+            matches, error, query = await cog.search_matches(self.query)
+            if error:
+                await interaction.edit_original_response(content=error, embed=None, view=None)
+                return
+
+            page = min(self.page, (len(matches) - 1) // ITEMS_PER_PAGE)
+            cog.prefetch_matches(matches[page * ITEMS_PER_PAGE:(page + 1) * ITEMS_PER_PAGE])
+            with tracer.span("embed_build"):
+                embed = game_selection_embed(matches, query, interaction.user.color, action=self.action, page=page)
+                view = game_selection_view(matches, query, self.currency, action=self.action, page=page)
+            with tracer.span("discord_edit"):
+                await interaction.edit_original_response(content=None, embed=embed, view=view)
+
+def game_selection_view(matches, query, currency="USD", exact_match=False, action="price", page=0):
+    currency = _currency_code(currency)
+    view = discord.ui.View(timeout=None)
+
+    if exact_match:
+        game_name, score, hit = matches[0]
+        view.add_item(GamePickButton(action, currency, hit.game_id, game_name, discord.ButtonStyle.success))
+        view.add_item(SelectionPageButton(action, currency, 0, query, "🔍 Search for something else"))
+        return view
+
+    start_idx = page * ITEMS_PER_PAGE
+    end_idx = start_idx + ITEMS_PER_PAGE
+    for game_name, score, hit in matches[start_idx:end_idx]:
+        view.add_item(GamePickButton(action, currency, hit.game_id, game_name))
+
+    if page > 0:
+        view.add_item(SelectionPageButton(action, currency, page - 1, query, "◀ Previous"))
+    if end_idx < len(matches):
+        view.add_item(SelectionPageButton(action, currency, page + 1, query, "Next ▶"))
+    return view
+
+def game_selection_embed(matches, query, color, exact_match=False, action="price", page=0):
+    if exact_match:
+        title = f"✅ Found: {matches[0][0]}"
+        desc = "Is this the game you want to check?" if action == "isgood" else "Click the button below to view prices, or search for something else."
+        return discord.Embed(title=title, description=desc, color=color)
+
+    title = f"🔍 Multiple matches found for '{query}'"
+    desc = "Select a game to check if it's a good deal:" if action == "isgood" else "Select a game from the options below:"
+    embed = discord.Embed(title=title, description=desc, color=color)
+
+    start_idx = page * ITEMS_PER_PAGE
+    end_idx = start_idx + ITEMS_PER_PAGE
+    current_matches = matches[start_idx:end_idx]
+
+    game_list = "".join([f"{m[0]} *(Match: {m[1]:.0f}%)*\n" for m in current_matches])
+    embed.add_field(name="Games", value=game_list, inline=False)
+    embed.set_footer(text=f"Page {page + 1} • Showing {start_idx + 1}-{min(end_idx, len(matches))} of {len(matches)} results")
+    return embed
+
+def track_confirm_embed(game_title, color, track_type="sale", threshold=None):
+    embed = discord.Embed(
+        title=f"🔔 Confirm Tracking",
+        description=f"Track **{game_title}** for price drops?",
+        color=color
+    )
+    embed.set_footer(text=f"Preference: {describe_track(track_type, threshold)} • You can only track one game at a time.")
+    return embed
+
+def track_confirm_view(user_id, game_id, query, track_type="sale", threshold=None):
+    view = discord.ui.View(timeout=None)
+    view.add_item(TrackConfirmButton(user_id, track_type, threshold, game_id))
+    view.add_item(TrackCancelButton(user_id))
+    view.add_item(TrackPageButton(user_id, track_type, threshold, 0, query, "🔍 Search for something else"))
+    return view
+
+async def _track_game_title(cog, game_id):
+    """Title for a gameID from the catalog, falling back to a details fetch."""
+    entry = title_catalog.get(game_id)
+    if entry:
+        return entry.title
+    data, error = await cog.get_game_details(game_id)
+    if error:
+        return None
+    return data.title
+
+class TrackConfirmButton(
+    discord.ui.DynamicItem[discord.ui.Button],
+    template=r"gc:tok:(?P<user_id>[0-9]+):(?P<track_type>sale|atl|below):(?P<threshold>[0-9.]*):(?P<game_id>[0-9]+)"
+):
+    def __init__(self, user_id, track_type, threshold, game_id):
+        self.user_id = str(user_id)
         self.track_type = track_type
-        self.value = None
-    
-    @discord.ui.button(label="✅ Confirm", style=discord.ButtonStyle.success)
-    async def confirm(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if interaction.user != self.user:
-            await interaction.response.send_message("❌ This is not your tracking request.", ephemeral=True)
+        self.threshold = threshold
+        self.game_id = str(game_id)
+        super().__init__(discord.ui.Button(
+            label="✅ Confirm", style=discord.ButtonStyle.success,
+            custom_id=_custom_id("gc", "tok", self.user_id, track_type, _threshold_part(threshold), self.game_id)
+        ))
+
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls(match["user_id"], match["track_type"], _parse_threshold(match["threshold"]), match["game_id"])
+
+    @tracer.traced("track.confirm")
+    async def callback(self, interaction: discord.Interaction):
+        if await _not_owner_of(interaction, self.user_id):
             return
-            
-        await interaction.response.defer()
-        
+
+        with tracer.span("defer"):
+            await interaction.response.defer()
+        cog = _deals_cog(interaction)
+
         # Import here to avoid circular import
-        from utils.database import add_tracked_game, get_user_tracked_games, remove_tracked_game
-        
+        from utils.database import add_tracked_game, get_user_tracked_games, remove_tracked_game, threshold_tracking_supported
+
+        if self.threshold is not None and not await threshold_tracking_supported():
+            await interaction.edit_original_response(content=THRESHOLD_UNSUPPORTED_MESSAGE, embed=None, view=None)
+            return
+
+        game_name = await _track_game_title(cog, self.game_id)
+        if not game_name:
+            await interaction.edit_original_response(content="❌ Failed to save tracking. Please try again later.", embed=None, view=None)
+            return
+
         # Check if user is owner
-        is_owner = await self.cog.bot.is_owner(self.user)
-        
+        is_owner = await cog.bot.is_owner(interaction.user)
+
         # Check if user already has tracked games
-        existing_list = await get_user_tracked_games(str(self.user.id))
+        existing_list = await get_user_tracked_games(self.user_id)
         existing = existing_list[0] if existing_list else None
-        
+
         if not is_owner and existing:
             # Regular user: remove previous tracking first
-            await remove_tracked_game(str(self.user.id))
-        
+            await remove_tracked_game(self.user_id)
+
         # Add to database (will replace existing if any)
         result = await add_tracked_game(
-            str(self.user.id),
-            str(self.channel_id),
+            self.user_id,
+            str(interaction.channel_id),
             self.game_id,
-            self.game_name,
-            self.track_type
+            game_name,
+            self.track_type,
+            self.threshold
         )
-        
+
         if result:
+            cog._tracks_changed(self.game_id)
+            if self.track_type == "atl":
+                when = "hits its all-time low"
+            elif self.track_type == "below":
+                when = f"drops below ${self.threshold:.2f}"
+            else:
+                when = "goes on sale"
             embed = discord.Embed(
                 title="✅ Tracking Confirmed",
-                description=f"You'll be notified in this channel when **{self.game_name}** {'hits its all-time low' if self.track_type == 'atl' else 'goes on sale'}!",
+                description=f"You'll be notified in this channel when **{game_name}** {when}!",
                 color=discord.Color.green()
             )
-            
+
             if existing and not is_owner:
                 embed.add_field(
                     name="⚠️ Previous Tracking Replaced",
                     value=f"Your previous tracking for **{existing['game_name']}** has been replaced.",
                     inline=False
                 )
-            
+
             footer_text = "You can track multiple games!" if is_owner else "You can only track one game at a time. This is a one-time notification."
             embed.set_footer(text=footer_text)
-            await interaction.edit_original_response(embed=embed, view=None)
+            with tracer.span("discord_edit"):
+                await interaction.edit_original_response(embed=embed, view=None)
         else:
             await interaction.edit_original_response(
                 content="❌ Failed to save tracking. Please try again later.",
                 embed=None,
                 view=None
             )
-        
-        self.value = True
-        self.stop()
-    
-    @discord.ui.button(label="❌ Cancel", style=discord.ButtonStyle.danger)
-    async def cancel(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if interaction.user != self.user:
-            await interaction.response.send_message("❌ This is not your tracking request.", ephemeral=True)
+
+class TrackCancelButton(discord.ui.DynamicItem[discord.ui.Button], template=r"gc:tno:(?P<user_id>[0-9]+)"):
+    def __init__(self, user_id):
+        self.user_id = str(user_id)
+        super().__init__(discord.ui.Button(
+            label="❌ Cancel", style=discord.ButtonStyle.danger,
+            custom_id=_custom_id("gc", "tno", self.user_id)
+        ))
+
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls(match["user_id"])
+
+    async def callback(self, interaction: discord.Interaction):
+        if await _not_owner_of(interaction, self.user_id):
             return
-            
+
         await interaction.response.defer()
         await interaction.edit_original_response(
             content="❌ Tracking cancelled.",
             embed=None,
             view=None
         )
-        self.value = False
-        self.stop()
-    
-    @discord.ui.button(label="🔍 Search for something else", style=discord.ButtonStyle.secondary)
-    async def search_other(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if interaction.user != self.user:
-            await interaction.response.send_message("❌ This is not your tracking request.", ephemeral=True)
-            return
-            
-        await interaction.response.defer()
-        
-        # Show all matches using TrackSelectionView
-        view = TrackSelectionView(self.cog, self.all_matches, self.query, self.user, self.channel_id, self.track_type)
-        embed = view.create_selection_embed()
-        await interaction.edit_original_response(embed=embed, view=view)
-        self.stop()
 
-class TrackSelectionView(discord.ui.View):
-    """View for selecting a game to track from multiple matches."""
-    def __init__(self, cog, matches, query, user, channel_id, track_type="sale"):
-        super().__init__(timeout=120)
-        self.cog = cog
-        self.matches = matches
-        self.query = query
-        self.user = user
-        self.channel_id = channel_id
+class TrackPickButton(
+    discord.ui.DynamicItem[discord.ui.Button],
+    template=r"gc:tpick:(?P<user_id>[0-9]+):(?P<track_type>sale|atl|below):(?P<threshold>[0-9.]*):(?P<game_id>[0-9]+):(?P<query>.*)"
+):
+    """Pick a game from the track selection list; the query rides along for "search for something else"."""
+    def __init__(self, user_id, track_type, threshold, game_id, query, label="Select"):
+        self.user_id = str(user_id)
         self.track_type = track_type
-        self.current_page = 0
-        self.items_per_page = 5
-        
-        self.update_buttons()
-    
-    def update_buttons(self):
-        self.clear_items()
-        
-        start_idx = self.current_page * self.items_per_page
-        end_idx = start_idx + self.items_per_page
-        current_matches = self.matches[start_idx:end_idx]
-        
-        # Add game selection buttons
-        for i, (game_name, score, game_dict) in enumerate(current_matches):
-            button = discord.ui.Button(
-                label=f"{game_name[:75]}",
-                style=discord.ButtonStyle.primary,
-                custom_id=f"track_select_{start_idx + i}"
-            )
-            button.callback = self.create_callback(start_idx + i)
-            self.add_item(button)
-        
-        # Add pagination buttons
-        if self.current_page > 0:
-            prev_button = discord.ui.Button(label="◀ Previous", style=discord.ButtonStyle.secondary)
-            prev_button.callback = self.previous_page
-            self.add_item(prev_button)
-        
-        if end_idx < len(self.matches):
-            next_button = discord.ui.Button(label="Next ▶", style=discord.ButtonStyle.secondary)
-            next_button.callback = self.next_page
-            self.add_item(next_button)
-    
-    def create_callback(self, index):
-        async def callback(interaction: discord.Interaction):
-            if interaction.user != self.user:
-                await interaction.response.send_message("❌ This is not your tracking request.", ephemeral=True)
-                return
-                
-            await interaction.response.defer()
-            
-            game_title, score, game_dict = self.matches[index]
-            game_id = game_dict.get("gameID")
-            
-            # Show confirmation for this game
-            embed = discord.Embed(
-                title=f"🔔 Confirm Tracking",
-                description=f"Track **{game_title}** for price drops?",
-                color=self.user.color
-            )
-            embed.set_footer(text=f"Preference: {'All-time low' if self.track_type == 'atl' else 'Any sale'} • You can only track one game at a time.")
-            
-            view = TrackConfirmView(self.cog, game_id, game_title, self.user, self.channel_id, self.matches, self.query, self.track_type)
-            await interaction.edit_original_response(embed=embed, view=view)
-        
-        return callback
-    
-    async def previous_page(self, interaction: discord.Interaction):
-        if interaction.user != self.user:
-            await interaction.response.send_message("❌ This is not your tracking request.", ephemeral=True)
-            return
-            
-        await interaction.response.defer()
-        self.current_page -= 1
-        self.update_buttons()
-        
-        embed = self.create_selection_embed()
-        await interaction.edit_original_response(embed=embed, view=self)
-    
-    async def next_page(self, interaction: discord.Interaction):
-        if interaction.user != self.user:
-            await interaction.response.send_message("❌ This is not your tracking request.", ephemeral=True)
+        self.threshold = threshold
+        self.game_id = str(game_id)
+        self.query = query
+        super().__init__(discord.ui.Button(
+            label=label[:75], style=discord.ButtonStyle.primary,
+            custom_id=_custom_id("gc", "tpick", self.user_id, track_type, _threshold_part(threshold), self.game_id, query)
+        ))
+
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls(match["user_id"], match["track_type"], _parse_threshold(match["threshold"]), match["game_id"], match["query"])
+
+    @tracer.traced("track.pick")
+    async def callback(self, interaction: discord.Interaction):
+        if await _not_owner_of(interaction, self.user_id):
             return
-            
-        await interaction.response.defer()
-        self.current_page += 1
-        self.update_buttons()
-        
-        embed = self.create_selection_embed()
-        await interaction.edit_original_response(embed=embed, view=self)
-    
-    def create_selection_embed(self):
-        start_idx = self.current_page * self.items_per_page
-        end_idx = start_idx + self.items_per_page
-        current_matches = self.matches[start_idx:end_idx]
-        
-        embed = discord.Embed(
-            title=f"🔍 Select a game to track",
-            description="Choose a game from the options below:",
-            color=self.user.color
-        )
-        
-        game_list = ""
-        for i, (game_name, score, game_dict) in enumerate(current_matches):
-            game_list += f"{game_name} *(Match: {score:.0f}%)*\n"
-        
-        embed.add_field(name="Games", value=game_list, inline=False)
-        embed.set_footer(text=f"Page {self.current_page + 1} • Preference: {self.track_type.upper()}")
-        
-        return embed
 
-class OwnerTrackManageView(discord.ui.View):
-    """Management view for people with multiple tracks (Owner)."""
-    def __init__(self, cog, tracks, user):
-        super().__init__(timeout=120)
-        self.cog = cog
-        self.tracks = tracks
-        self.user = user
-        self.current_page = 0
-        self.items_per_page = 5
-        self.update_content()
-
-    def update_content(self):
-        self.clear_items()
-        start = self.current_page * self.items_per_page
-        end = start + self.items_per_page
-        current = self.tracks[start:end]
-
-        for track in current:
-            track_id = track['id']
-            name = track['game_name']
-            type_str = "ATL" if track.get('track_type') == 'atl' else "Sale"
-            
-            btn = discord.ui.Button(label=f"🗑️ Stop: {name[:50]} ({type_str})", style=discord.ButtonStyle.danger)
-            btn.callback = self.create_stop_callback(track_id, name)
-            self.add_item(btn)
-
-        if self.current_page > 0:
-            btn = discord.ui.Button(label="◀ Prev", style=discord.ButtonStyle.secondary)
-            btn.callback = self.prev_page
-            self.add_item(btn)
-        if end < len(self.tracks):
-            btn = discord.ui.Button(label="Next ▶", style=discord.ButtonStyle.secondary)
-            btn.callback = self.next_page
-            self.add_item(btn)
-
-    def create_stop_callback(self, track_id, name):
-        async def callback(interaction: discord.Interaction):
-            from utils.database import remove_tracked_game_by_id
+        with tracer.span("defer"):
             await interaction.response.defer()
-            await remove_tracked_game_by_id(track_id)
-            
-            # Update list
-            self.tracks = [t for t in self.tracks if t['id'] != track_id]
-            if not self.tracks:
-                await interaction.edit_original_response(content="✅ All tracking stopped.", embed=None, view=None)
-                return
-            
-            if self.current_page * self.items_per_page >= len(self.tracks) and self.current_page > 0:
-                self.current_page -= 1
-            
-            self.update_content()
-            embed = self.create_embed()
-            await interaction.edit_original_response(embed=embed, view=self)
-        return callback
-
-    def create_embed(self):
-        embed = discord.Embed(
-            title="📋 Your Active Tracking (Owner Mode)",
-            description=f"You are tracking **{len(self.tracks)}** games.\nUse the buttons below to stop tracking individual games.",
-            color=self.user.color
-        )
-        embed.set_footer(text=f"Page {self.current_page + 1}")
-        return embed
+        game_title = await _track_game_title(_deals_cog(interaction), self.game_id)
+        if not game_title:
+            await interaction.edit_original_response(content="❌ Error fetching game data. Please try again later.", embed=None, view=None)
+            return
 
-    async def prev_page(self, interaction: discord.Interaction):
-        await interaction.response.defer()
-        self.current_page -= 1
-        self.update_content()
-        await interaction.edit_original_response(embed=self.create_embed(), view=self)
+        # Show confirmation for this game
+        with tracer.span("embed_build"):
+            embed = track_confirm_embed(game_title, interaction.user.color, self.track_type, self.threshold)
+            view = track_confirm_view(self.user_id, self.game_id, self.query, self.track_type, self.threshold)
+        with tracer.span("discord_edit"):
+            await interaction.edit_original_response(embed=embed, view=view)
 
-    async def next_page(self, interaction: discord.Interaction):
-        await interaction.response.defer()
-        self.current_page += 1
-        self.update_content()
-        await interaction.edit_original_response(embed=self.create_embed(), view=self)
-
-class GameSelectionView(discord.ui.View):
-    def __init__(self, cog, matches, query, user_color, currency="USD", exact_match=False, action="price"):
-        super().__init__(timeout=120)
-        self.cog = cog
-        self.matches = matches
+class TrackPageButton(
+    discord.ui.DynamicItem[discord.ui.Button],
+    template=r"gc:tpage:(?P<user_id>[0-9]+):(?P<track_type>sale|atl|below):(?P<threshold>[0-9.]*):(?P<page>[0-9]+):(?P<query>.*)"
+):
+    def __init__(self, user_id, track_type, threshold, page, query, label="Next ▶"):
+        self.user_id = str(user_id)
+        self.track_type = track_type
+        self.threshold = threshold
+        self.page = int(page)
         self.query = query
-        self.user_color = user_color
-        self.currency = currency
-        self.current_page = 0
-        self.items_per_page = 5
-        self.exact_match = exact_match
-        self.action = action # "price" or "isgood"
-        self.update_buttons()
-
-    def update_buttons(self):
-        self.clear_items()
-        
-        if self.exact_match:
-            game_name, score, game_dict = self.matches[0]
-            button = discord.ui.Button(label=f"{game_name[:75]}", style=discord.ButtonStyle.success)
-            button.callback = self.create_callback(0)
-            self.add_item(button)
-            
-            other_button = discord.ui.Button(label="🔍 Search for something else", style=discord.ButtonStyle.secondary)
-            other_button.callback = self.show_all_matches
-            self.add_item(other_button)
+        super().__init__(discord.ui.Button(
+            label=label, style=discord.ButtonStyle.secondary,
+            custom_id=_custom_id("gc", "tpage", self.user_id, track_type, _threshold_part(threshold), self.page, query)
+        ))
+
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls(match["user_id"], match["track_type"], _parse_threshold(match["threshold"]), match["page"], match["query"])
+
+    @tracer.traced("track.page")
+    async def callback(self, interaction: discord.Interaction):
+        if await _not_owner_of(interaction, self.user_id):
             return
 
-        start_idx = self.current_page * self.items_per_page
-        end_idx = start_idx + self.items_per_page
-        current_matches = self.matches[start_idx:end_idx]
-
-        for i, (game_name, score, game_dict) in enumerate(current_matches):
-            button = discord.ui.Button(label=f"{game_name[:75]}", style=discord.ButtonStyle.primary)
-            button.callback = self.create_callback(start_idx + i)
-            self.add_item(button)
-
-        if self.current_page > 0:
-            prev = discord.ui.Button(label="◀ Previous", style=discord.ButtonStyle.secondary)
-            prev.callback = self.previous_page
-            self.add_item(prev)
-        if end_idx < len(self.matches):
-            nxt = discord.ui.Button(label="Next ▶", style=discord.ButtonStyle.secondary)
-            nxt.callback = self.next_page
-            self.add_item(nxt)
-
-    def create_callback(self, index):
-        async def callback(interaction: discord.Interaction):
+        with tracer.span("defer"):
             await interaction.response.defer()
-            game_name, score, game_dict = self.matches[index]
-            game_id = game_dict.get("gameID")
+        matches, error, query = await _deals_cog(interaction).search_matches(self.query)
+        if error:
+            await interaction.edit_original_response(content=error, embed=None, view=None)
+            return
 
-            if self.action == "isgood":
-                await self.cog._isgood_logic(interaction, game_id, self.user_color)
-            else: # price
-                data, error = await self.cog.fetch_game_data_by_id(game_id)
-                if error:
-                    await interaction.edit_original_response(content=error, embed=None, view=None)
-                    return
-                
-                embed = await self.cog.create_price_embed(data, self.user_color, self.currency)
-                view = PriceView(self.cog, data, data.get("deals", []))
-                await interaction.edit_original_response(content=None, embed=embed, view=view)
-        return callback
+        page = min(self.page, (len(matches) - 1) // ITEMS_PER_PAGE)
+        with tracer.span("embed_build"):
+            embed = track_selection_embed(matches, interaction.user.color, self.track_type, self.threshold, page)
+            view = track_selection_view(matches, query, self.user_id, self.track_type, self.threshold, page)
+        with tracer.span("discord_edit"):
+            await interaction.edit_original_response(content=None, embed=embed, view=view)
 
-    async def previous_page(self, interaction: discord.Interaction):
-        await interaction.response.defer()
-        self.current_page -= 1
-        self.update_buttons()
-        await interaction.edit_original_response(embed=self.create_selection_embed(), view=self)
+def track_selection_view(matches, query, user_id, track_type="sale", threshold=None, page=0):
+    """View for selecting a game to track from multiple matches."""
+    view = discord.ui.View(timeout=None)
+    start_idx = page * ITEMS_PER_PAGE
+    end_idx = start_idx + ITEMS_PER_PAGE
+
+    # Add game selection buttons
+    for game_name, score, hit in matches[start_idx:end_idx]:
+        view.add_item(TrackPickButton(user_id, track_type, threshold, hit.game_id, query, game_name))
+
+    # Add pagination buttons
+    if page > 0:
+        view.add_item(TrackPageButton(user_id, track_type, threshold, page - 1, query, "◀ Previous"))
+    if end_idx < len(matches):
+        view.add_item(TrackPageButton(user_id, track_type, threshold, page + 1, query, "Next ▶"))
+    return view
+
+def track_selection_embed(matches, color, track_type="sale", threshold=None, page=0):
+    start_idx = page * ITEMS_PER_PAGE
+    end_idx = start_idx + ITEMS_PER_PAGE
+    current_matches = matches[start_idx:end_idx]
+
+    embed = discord.Embed(
+        title=f"🔍 Select a game to track",
+        description="Choose a game from the options below:",
+        color=color
+    )
+
+    game_list = ""
+    for game_name, score, hit in current_matches:
+        game_list += f"{game_name} *(Match: {score:.0f}%)*\n"
+
+    embed.add_field(name="Games", value=game_list, inline=False)
+    embed.set_footer(text=f"Page {page + 1} • Preference: {describe_track(track_type, threshold, short=True).upper()}")
+
+    return embed
+
+def owner_track_view(tracks, user_id, page=0):
+    """Management view for people with multiple tracks (Owner)."""
+    view = discord.ui.View(timeout=None)
+    start = page * ITEMS_PER_PAGE
+    end = start + ITEMS_PER_PAGE
+
+    for track in tracks[start:end]:
+        type_str = describe_track(track.get('track_type'), track.get('threshold'), short=True)
+        view.add_item(TrackStopButton(user_id, track['id'], page, f"🗑️ Stop: {track['game_name'][:50]} ({type_str})"))
+
+    if page > 0:
+        view.add_item(TrackManagePageButton(user_id, page - 1, "◀ Prev"))
+    if end < len(tracks):
+        view.add_item(TrackManagePageButton(user_id, page + 1, "Next ▶"))
+    return view
+
+def owner_track_embed(tracks, color, page=0):
+    embed = discord.Embed(
+        title="📋 Your Active Tracking (Owner Mode)",
+        description=f"You are tracking **{len(tracks)}** games.\nUse the buttons below to stop tracking individual games.",
+        color=color
+    )
+    embed.set_footer(text=f"Page {page + 1}")
+    return embed
+
+async def _show_owner_tracks(interaction, user_id, page):
+    from utils.database import get_user_tracked_games
+    tracks = await get_user_tracked_games(user_id)
+    if not tracks:
+        await interaction.edit_original_response(content="✅ All tracking stopped.", embed=None, view=None)
+        return
+    page = min(page, (len(tracks) - 1) // ITEMS_PER_PAGE)
+    await interaction.edit_original_response(
+        embed=owner_track_embed(tracks, interaction.user.color, page),
+        view=owner_track_view(tracks, user_id, page)
+    )
+
+class TrackStopButton(
+    discord.ui.DynamicItem[discord.ui.Button],
+    template=r"gc:tstop:(?P<user_id>[0-9]+):(?P<track_id>[0-9]+):(?P<page>[0-9]+)"
+):
+    def __init__(self, user_id, track_id, page, label="🗑️ Stop"):
+        self.user_id = str(user_id)
+        self.track_id = int(track_id)
+        self.page = int(page)
+        super().__init__(discord.ui.Button(
+            label=label, style=discord.ButtonStyle.danger,
+            custom_id=_custom_id("gc", "tstop", self.user_id, self.track_id, self.page)
+        ))
+
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls(match["user_id"], match["track_id"], match["page"])
+
+    async def callback(self, interaction: discord.Interaction):
+        if await _not_owner_of(interaction, self.user_id, "❌ This is not your tracking."):
+            return
 
-    async def next_page(self, interaction: discord.Interaction):
+        from utils.database import remove_tracked_game_by_id
         await interaction.response.defer()
-        self.current_page += 1
-        self.update_buttons()
-        await interaction.edit_original_response(embed=self.create_selection_embed(), view=self)
+        await remove_tracked_game_by_id(self.track_id)
+        _deals_cog(interaction)._tracks_changed()
+        await _show_owner_tracks(interaction, self.user_id, self.page)
+
+class TrackManagePageButton(
+    discord.ui.DynamicItem[discord.ui.Button],
+    template=r"gc:tmpage:(?P<user_id>[0-9]+):(?P<page>[0-9]+)"
+):
+    def __init__(self, user_id, page, label="Next ▶"):
+        self.user_id = str(user_id)
+        self.page = int(page)
+        super().__init__(discord.ui.Button(
+            label=label, style=discord.ButtonStyle.secondary,
+            custom_id=_custom_id("gc", "tmpage", self.user_id, self.page)
+        ))
+
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls(match["user_id"], match["page"])
+
+    async def callback(self, interaction: discord.Interaction):
+        if await _not_owner_of(interaction, self.user_id, "❌ This is not your tracking."):
+            return
 
-    async def show_all_matches(self, interaction: discord.Interaction):
         await interaction.response.defer()
-        self.exact_match = False
-        self.current_page = 0
-        self.update_buttons()
-        await interaction.edit_original_response(embed=self.create_selection_embed(), view=self)
-
-    def create_selection_embed(self):
-        if self.exact_match:
-            title = f"✅ Found: {self.matches[0][0]}"
-            desc = "Is this the game you want to check?" if self.action == "isgood" else "Click the button below to view prices, or search for something else."
-            return discord.Embed(title=title, description=desc, color=self.user_color)
-        
-        title = f"🔍 Multiple matches found for '{self.query}'"
-        desc = "Select a game to check if it's a good deal:" if self.action == "isgood" else "Select a game from the options below:"
-        embed = discord.Embed(title=title, description=desc, color=self.user_color)
-        
-        start_idx = self.current_page * self.items_per_page
-        end_idx = start_idx + self.items_per_page
-        current_matches = self.matches[start_idx:end_idx]
-        
-        game_list = "".join([f"{m[0]} *(Match: {m[1]:.0f}%)*\n" for m in current_matches])
-        embed.add_field(name="Games", value=game_list, inline=False)
-        embed.set_footer(text=f"Page {self.current_page + 1} • Showing {start_idx + 1}-{min(end_idx, len(self.matches))} of {len(self.matches)} results")
-        return embed
+        await _show_owner_tracks(interaction, self.user_id, self.page)
+
+PERSISTENT_ITEMS = (
+    CurrencySelect, GamePickButton, SelectionPageButton,
+    TrackConfirmButton, TrackCancelButton, TrackPickButton, TrackPageButton,
+    TrackStopButton, TrackManagePageButton,
+)
 
 class Deals(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.api_base = "https://www.cheapshark.com/api/1.0"
         self.exchange_api = "https://api.exchangerate-api.com/v4/latest/USD"
-        self.session = aiohttp.ClientSession()
-        
-        self.stores = {
-            "1": "Steam", "2": "GamersGate", "3": "GreenManGaming", "4": "Amazon",
-            "5": "GameStop", "6": "Direct2Drive", "7": "GOG", "8": "Origin",
-            "11": "Humble Store", "13": "Uplay", "15": "Fanatical", "25": "Epic Games",
-        }
+        # Shared bot-wide HTTP client (created and closed in main.py)
+        self.http = bot.http_client
+
+        # Supported stores; names and active flags are refreshed from CheapShark
+        self.stores = dict(STORES)
         
+        # Per-game check schedule and watcher index for the tracker, keyed by CheapShark game ID
+        self.scheduler = TrackerScheduler(tick_seconds=60)
+        self.track_index = TrackIndex()
+        self._tracks_synced_at = 0.0
+        self._tracks_dirty = True
+
+        # Speculative detail fetches started by selection views: gameID -> (task, started_at)
+        self._prefetched = {}
+        # Startup refresh of the store list (cog_load), kept so cog_unload can cancel it
+        self._stores_task = None
+        # Recent search results by normalized query, CheapShark game details by gameID, and
+        # USD exchange rates, in the bot-wide cache
+        self._searches = cache.namespace("deals:search", SEARCH_CACHE_TTL, SEARCH_CACHE_SIZE)
+        self._details = cache.namespace("deals:detail", DETAIL_CACHE_TTL, DETAIL_CACHE_SIZE)
+        self._rates_cache = cache.namespace("rates", RATES_TTL, 4)
+        # Last rates seen, kept past the TTL as a fallback: currency -> rate, and when they were fetched
+        self._rates = {}
+        self._rates_fetched_at = 0.0
+
+        # Rates and store names survive restarts through the warm-start snapshot
+        warm_snapshot.register("deals", self._export_warm_state, self._restore_warm_state)
+
         # Start background checker safely
         if not self.check_tracked_games_task.is_running():
             self.check_tracked_games_task.start()
+        if not self.save_local_data_task.is_running():
+            self.save_local_data_task.start()
 
-    def cog_unload(self):
-        if self.session:
-            self.bot.loop.create_task(self.session.close())
-        if self.check_tracked_games_task.is_running():
-            self.check_tracked_games_task.cancel()
-
-    async def _get_exchange_rate(self, currency: str):
-        """Fetch exchange rate from USD to the specified currency"""
+    async def cog_load(self):
+        self.bot.add_dynamic_items(*PERSISTENT_ITEMS)
+        try:
+            await asyncio.to_thread(price_history.load)
+            print(f"✅ Loaded price history for {len(price_history)} games.")
+        except Exception as e:
+            print(f"❌ Failed to load price history: {e}")
         try:
-            async with self.session.get(self.exchange_api, timeout=10) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    rates = data.get("rates", {})
-                    currency_upper = currency.upper()
-                    if currency_upper in rates:
-                        return rates[currency_upper], currency_upper
-            return None, None
+            await asyncio.to_thread(title_catalog.load)
+            print(f"✅ Loaded title catalog with {len(title_catalog)} games.")
         except Exception as e:
-            print(f"Exchange rate error: {e}")
-            return None, None
+            print(f"❌ Failed to load title catalog: {e}")
+
+        self._stores_task = asyncio.create_task(self.refresh_stores())
+        self._stores_task.add_done_callback(self._stores_refreshed)
+
+    @staticmethod
+    def _stores_refreshed(task):
+        if not task.cancelled() and task.exception() is not None:
+            print(f"❌ Store list refresh failed: {task.exception()}")
 
-    def _convert_price(self, price_str: str, rate: float):
-        """Convert a price string from USD to another currency"""
+    def _export_warm_state(self):
+        return {"rates": self._rates, "rates_fetched_at": self._rates_fetched_at, "stores": self.stores}
+
+    def _restore_warm_state(self, data):
+        if data.get("rates"):
+            self._rates = data["rates"]
+            self._rates_fetched_at = data.get("rates_fetched_at", 0.0)
+        if data.get("stores"):
+            self.stores = data["stores"]
+
+    async def refresh_stores(self):
+        """Update store names from CheapShark and drop stores it marks inactive."""
         try:
-            if not price_str or price_str == "N/A":
-                return "0.00"
-            price = float(price_str)
-            return f"{price * rate:.2f}"
-        except:
-            return price_str
-
-    async def fetch_game_data_by_id(self, game_id: str):
-        """Fetches game data by game ID."""
+            status, data = await self.http.get_json(f"{self.api_base}/stores", priority=PRIORITY_BACKGROUND)
+        except Exception as e:
+            print(f"Store list error: {e}")
+            return
+        if status != 200 or not isinstance(data, list):
+            return
+        known = {str(store.get("storeID")): store for store in data}
+        stores = {}
+        for store_id, name in STORES.items():
+            store = known.get(store_id)
+            if store is None:
+                stores[store_id] = name
+            elif store.get("isActive", 1):
+                stores[store_id] = store.get("storeName") or name
+        if stores:
+            self.stores = stores
+
+    async def cog_unload(self):
+        self.bot.remove_dynamic_items(*PERSISTENT_ITEMS)
+        if self.check_tracked_games_task.is_running():
+            self.check_tracked_games_task.cancel()
+        if self.save_local_data_task.is_running():
+            self.save_local_data_task.cancel()
+        if self._stores_task is not None and not self._stores_task.done():
+            self._stores_task.cancel()
+        self.cancel_prefetch(list(self._prefetched))
+        await self._save_local_data()
+
+    async def _save_local_data(self):
+        """Persist the price history and title catalog if they changed."""
+        # Copy out on the loop (cheap copies); encode and write off it
+        for name, store in (("price history", price_history), ("title catalog", title_catalog)):
+            if not store.dirty:
+                continue
+            try:
+                exported = store.export()
+                store.dirty = False
+                await asyncio.to_thread(store.save, exported)
+            except Exception as e:
+                store.dirty = True
+                print(f"❌ Failed to save {name}: {e}")
+
+    @tasks.loop(minutes=10)
+    async def save_local_data_task(self):
+        await self._save_local_data()
+
+    async def _get_exchange_rate(self, currency: str):
+        """Exchange rate from USD to the specified currency, from cached rates while they are fresh"""
+        with tracer.span("rate_lookup", source="memory") as span:
+            if time.time() - self._rates_fetched_at > RATES_TTL:
+                cached = await self._rates_cache.get("USD")
+                if cached:
+                    span.set("source", "cache")
+                    self._rates, self._rates_fetched_at = cached["rates"], cached["fetched_at"]
+                else:
+                    span.set("source", "upstream")
+                    try:
+                        status, data, stale_at = await self.http.get_json_dated(self.exchange_api, priority=PRIORITY_INTERACTIVE)
+                        if status == 200 and data and data.get("rates"):
+                            self._rates = data["rates"]
+                            self._rates_fetched_at = stale_at or time.time()
+                            if stale_at is None:
+                                await self._rates_cache.set("USD", {"rates": self._rates, "fetched_at": self._rates_fetched_at})
+                    except Exception as e:
+                        # Older rates, if any, are better than none
+                        print(f"Exchange rate error: {e}")
+        currency_upper = currency.upper()
+        if currency_upper in self._rates:
+            return self._rates[currency_upper], currency_upper
+        return None, None
+
+    def _convert_price(self, price: float, rate: float):
+        """Convert a USD price to another currency"""
+        return f"{price * rate:.2f}"
+
+    async def fetch_game_data_by_id(self, game_id: str, priority=PRIORITY_INTERACTIVE):
+        """Fetches game data by game ID, as a GameDetail."""
         deals_url = f"{self.api_base}/games"
         deal_params = {"id": game_id}
-        
+
+        if priority == PRIORITY_INTERACTIVE:
+            cached = await self._details.get(game_id)
+            if cached:
+                return GameDetail.from_json(game_id, cached["data"], cached["fetched_at"]), None
+
         try:
-            async with self.session.get(deals_url, params=deal_params, timeout=10) as deal_response:
-                if deal_response.status != 200:
-                    return None, "❌ Failed to fetch deal details."
-                
-                deal_data = await deal_response.json()
-                return deal_data, None
+            status, deal_data, stale_at = await self.http.get_json_dated(
+                deals_url, params=deal_params, priority=priority, allow_stale=priority == PRIORITY_INTERACTIVE
+            )
+            if status != 200:
+                return None, "❌ Failed to fetch deal details."
+            # A stale copy keeps its original fetch time and is never recorded as a new observation
+            detail = GameDetail.from_json(game_id, deal_data, stale_at)
+            if stale_at is None:
+                await self._details.set(game_id, {"data": deal_data, "fetched_at": detail.fetched_at})
+                price_history.record(detail)
+            title_catalog.add(game_id, detail.title, detail.thumb)
+            return detail, None
+        except CircuitOpenError:
+            return None, UNAVAILABLE_MESSAGE
         except Exception as e:
-            return None, f"❌ Error fetching game data: {e}"
+            print(f"❌ Error fetching game data for {game_id}: {e!r}")
+            return None, "❌ Error fetching game data. Please try again later."
+
+    def prefetch_details(self, game_id):
+        """Start fetching game details in the background so a later click renders right away.
+
+        Selection views have no timeout any more, so unclicked prefetches are dropped here
+        once they are older than PREFETCH_TTL.
+        """
+        now = time.monotonic()
+        for stale_id in [gid for gid, (_, started) in self._prefetched.items() if now - started > PREFETCH_TTL]:
+            self._prefetched.pop(stale_id)[0].cancel()
+        entry = self._prefetched.get(game_id)
+        if entry and not entry[0].cancelled():
+            return
+        self._prefetched[game_id] = (asyncio.create_task(self.fetch_game_data_by_id(game_id)), now)
+
+    def prefetch_matches(self, matches):
+        for _, _, hit in matches:
+            if hit.game_id:
+                self.prefetch_details(hit.game_id)
+
+    def cancel_prefetch(self, game_ids):
+        """Drop prefetches nobody clicked."""
+        for game_id in game_ids:
+            entry = self._prefetched.pop(game_id, None)
+            if entry and not entry[0].done():
+                entry[0].cancel()
+
+    async def get_game_details(self, game_id: str):
+        """Game details for a click: the prefetched result if there is one, otherwise a live fetch."""
+        with tracer.span("detail_fetch", game_id=game_id, prefetched=False) as span:
+            entry = self._prefetched.get(game_id)
+            if entry and time.monotonic() - entry[1] <= PREFETCH_TTL:
+                try:
+                    data, error = await asyncio.shield(entry[0])
+                    if not error:
+                        span.set("prefetched", True)
+                        return data, None
+                except asyncio.CancelledError:
+                    if not entry[0].cancelled():
+                        raise
+            return await self.fetch_game_data_by_id(game_id)
 
-    async def fetch_game_data(self, game_name: str, return_matches=False):
-        """Fetches raw game data and deals. If return_matches=True, returns list of matches."""
+    async def fetch_game_data(self, game_name: str, return_matches=False, priority=PRIORITY_INTERACTIVE):
+        """Fetches game details for the best match. If return_matches=True, returns list of matches."""
         # Search
         search_url = f"{self.api_base}/games"
         # Increase limit to allow fuzzy matching on client side
         params = {"title": game_name, "limit": 25}
         
-        async with self.session.get(search_url, params=params, timeout=10) as response:
-            if response.status != 200:
-                return None, "❌ Failed to fetch game data."
-            
-            games = await response.json()
-            if not games:
-                return None, f"🔍 No results found for **{game_name}**."
-            
+        try:
+            with tracer.span("upstream_search"):
+                status, games = await self.http.get_json(search_url, params=params, priority=priority)
+        except CircuitOpenError:
+            return None, UNAVAILABLE_MESSAGE
+        except Exception as e:
+            print(f"❌ Error searching for {game_name!r}: {e!r}")
+            return None, "❌ Failed to fetch game data."
+        if status != 200:
+            return None, "❌ Failed to fetch game data."
+        
+        if not games:
+            return None, f"🔍 No results found for **{game_name}**."
+        
+        with tracer.span("fuzzy_match", results=len(games)):
+            hits = [SearchHit.from_json(game) for game in games]
+            title_catalog.add_search_results(hits)
+
             # Fuzzy Matching Logic
-            # Extract names for fuzzy matching
-            choices = {game['external']: game for game in games}
-            
-            # Use extract to get multiple matches
-            matches = process.extract(game_name, choices.keys(), limit=25)
-            
-            # If we want to return matches for selection
-            if return_matches:
-                # Return list of (game_name, score, game_dict)
-                match_list = [(match[0], match[1], choices[match[0]]) for match in matches if match[1] >= 50]
-                if not match_list:
-                    match_list = [(match[0], match[1], choices[match[0]]) for match in matches[:5]]
-                return match_list, None
-            
-            # Auto-select if single very good match
-            if matches and matches[0][1] >= 90 and (len(matches) == 1 or matches[0][1] - matches[1][1] > 10):
-                # High confidence single match
-                game_summary = choices[matches[0][0]]
-            else:
-                # Default to first result
-                game_summary = games[0]
+            # Keyed by gameID so games sharing a title are not collapsed
+            choices = {hit.game_id: hit for hit in hits}
+            titles = {game_id: hit.title for game_id, hit in choices.items()}
 
-            game_id = game_summary.get("gameID")
-            
-            # Fetch details
-            return await self.fetch_game_data_by_id(game_id)
+            # Use extract to get multiple matches: (title, score, gameID)
+            matches = process.extract(game_name, titles, limit=25)
+        
+        # If we want to return matches for selection
+        if return_matches:
+            # Return list of (game_name, score, SearchHit)
+            match_list = [(match[0], match[1], choices[match[2]]) for match in matches if match[1] >= 50]
+            if not match_list:
+                match_list = [(match[0], match[1], choices[match[2]]) for match in matches[:5]]
+            return match_list, None
+        
+        # Auto-select if single very good match
+        if matches and matches[0][1] >= 90 and (len(matches) == 1 or matches[0][1] - matches[1][1] > 10):
+            # High confidence single match
+            game_summary = choices[matches[0][2]]
+        else:
+            # Default to first result
+            game_summary = hits[0]
+
+        game_id = game_summary.game_id
+        
+        # Fetch details
+        return await self.fetch_game_data_by_id(game_id, priority)
+
+    async def search_matches(self, game_name: str, priority=PRIORITY_INTERACTIVE):
+        """Resolve a query to selection matches, from the local title catalog when possible.
+
+        Returns (matches, error, query) where query is the text to show the user.
+        Results are cached briefly, so paging buttons re-read them instead of searching again.
+        """
+        with tracer.span("search", cached=False) as span:
+            key = normalize_title(game_name) if not game_name.startswith(CATALOG_PREFIX) else game_name
+            cached = await self._searches.get(key)
+            # Entries written before the query was cached are plain lists; treat them as misses
+            if isinstance(cached, dict):
+                span.set("cached", True)
+                matches = [(title, score, SearchHit.from_json(hit)) for title, score, hit in cached["matches"]]
+                return matches, None, cached["query"]
+
+            matches, error, query = await self._search_matches(game_name, priority)
+            if not error:
+                await self._searches.set(key, {
+                    "query": query,
+                    "matches": [[title, score, hit.to_json()] for title, score, hit in matches],
+                })
+            return matches, error, query
+
+    async def _search_matches(self, game_name, priority):
+        if game_name.startswith(CATALOG_PREFIX):
+            # Picked from autocomplete: the value is a catalog gameID
+            entry = title_catalog.get(game_name[len(CATALOG_PREFIX):])
+            if entry:
+                return [(entry.title, 100.0, entry)], None, entry.title
+            return None, "🔍 That game is no longer in the catalog. Please search again.", game_name
+
+        if title_catalog.exact(game_name):
+            # Known title: answer offline, exact hits first
+            matches = title_catalog.search(game_name)
+            matches.sort(key=lambda m: m[1] != 100)
+            return matches, None, game_name
+
+        matches, error = await self.fetch_game_data(game_name, return_matches=True, priority=priority)
+        return matches, error, game_name
+
+    async def game_name_autocomplete(self, interaction: discord.Interaction, current: str):
+        return [
+            app_commands.Choice(name=entry.title[:100], value=f"{CATALOG_PREFIX}{entry.game_id}")
+            for entry in title_catalog.complete(current, limit=25)
+        ]
 
     async def create_price_embed(self, game_data, color, currency="USD"):
         """Generates the embed based on game data and currency."""
-        info = game_data.get("info", {})
-        cheapest_price_ever = game_data.get("cheapestPriceEver", {})
-        deals = game_data.get("deals", [])
+        deals = game_data.deals
         
-        title = info.get("title", "Unknown Game")
-        thumb = info.get("thumb")
+        title = game_data.title or "Unknown Game"
+        thumb = game_data.thumb
         
         exchange_rate = 1.0
         currency_symbol = "$"
@@ -579,9 +1025,7 @@ class Deals(commands.Cog):
             embed.set_image(url=thumb)
 
         # Lowest Price Logic
-        # cheapestPriceEver object: { "price": "X", "date": 123 }
-        lowest_price = cheapest_price_ever.get("price", "N/A")
-        converted_lowest = self._convert_price(lowest_price, exchange_rate)
+        converted_lowest = self._convert_price(game_data.cheapest_ever, exchange_rate)
         
         embed.add_field(
             name="🏷️ Lowest Price Ever",
@@ -594,16 +1038,13 @@ class Deals(commands.Cog):
             deal_text = ""
             # Only top 5
             for deal in deals[:5]:
-                store_id = deal.get("storeID")
-                store_name = self.stores.get(store_id, f"Store {store_id}")
-                price = deal.get("price", "N/A")
-                retail_price = deal.get("retailPrice", "N/A")
-                savings = float(deal.get("savings", 0))
+                store_name = self.stores.get(deal.store_id, f"Store {deal.store_id}")
+                savings = deal.savings
                 
-                converted_price = self._convert_price(price, exchange_rate)
+                converted_price = self._convert_price(deal.price, exchange_rate)
                 
                 if savings > 0:
-                    converted_retail = self._convert_price(retail_price, exchange_rate)
+                    converted_retail = self._convert_price(deal.retail_price, exchange_rate)
                     deal_text += f"**{store_name}**: ~~{currency_symbol}{converted_retail}~~ ➜ **{currency_symbol}{converted_price}** ({savings:.0f}% off)\n"
                 else:
                     deal_text += f"**{store_name}**: {currency_symbol}{converted_price}\n"
@@ -617,7 +1058,16 @@ class Deals(commands.Cog):
         
         return embed
 
+    async def send_price_embed(self, interaction, data, currency):
+        """Build the price embed for a click and edit it into the original response."""
+        with tracer.span("embed_build"):
+            embed = await self.create_price_embed(data, interaction.user.color, currency)
+            view = price_view(data)
+        with tracer.span("discord_edit"):
+            await interaction.edit_original_response(content=None, embed=embed, view=view)
+
     @commands.command(name="price")
+    @tracer.traced("price.prefix")
     async def check_price(self, ctx, *args):
         if not args:
             await ctx.reply("❌ Please provide a game name!")
@@ -635,46 +1085,55 @@ class Deals(commands.Cog):
 
         async with ctx.typing():
             # First, try to get matches
-            matches, error = await self.fetch_game_data(game_name, return_matches=True)
+            matches, error, game_name = await self.search_matches(game_name)
             if error:
                 await ctx.reply(error)
                 return
             
             # Always show top match with "Search for something else" option
-            view = GameSelectionView(self, matches, game_name, ctx.author.color, currency, exact_match=True)
-            embed = view.create_selection_embed()
-            await ctx.reply(embed=embed, view=view)
+            # Fetch the top match's details while the user is still reading the embed
+            self.prefetch_matches(matches[:1])
+            with tracer.span("embed_build"):
+                embed = game_selection_embed(matches, game_name, ctx.author.color, exact_match=True)
+                view = game_selection_view(matches, game_name, currency, exact_match=True)
+            with tracer.span("discord_send"):
+                await ctx.reply(embed=embed, view=view)
 
     @app_commands.command(name="price", description="Check game prices")
+    @app_commands.autocomplete(game_name=game_name_autocomplete)
+    @tracer.traced("price.slash")
     async def price_slash(self, interaction: discord.Interaction, game_name: str, currency: str = "USD"):
-        await interaction.response.defer()
+        with tracer.span("defer"):
+            await interaction.response.defer()
         
         # First, try to get matches
-        matches, error = await self.fetch_game_data(game_name, return_matches=True)
+        matches, error, game_name = await self.search_matches(game_name)
         if error:
             await interaction.followup.send(error)
             return
         
         # Always show top match with "Search for something else" option
-        view = GameSelectionView(self, matches, game_name, interaction.user.color, currency, exact_match=True)
-        embed = view.create_selection_embed()
-        await interaction.followup.send(embed=embed, view=view)
+        self.prefetch_matches(matches[:1])
+        with tracer.span("embed_build"):
+            embed = game_selection_embed(matches, game_name, interaction.user.color, exact_match=True)
+            view = game_selection_view(matches, game_name, currency, exact_match=True)
+        with tracer.span("discord_send"):
+            await interaction.followup.send(embed=embed, view=view)
 
     @commands.command(name="track")
+    @tracer.traced("track.prefix")
     async def track_game(self, ctx, *, args: str = None):
-        """Track a game for price notifications. Usage: g!track <game name> [-atl|-sale]"""
-        from utils.database import get_user_tracked_games, remove_tracked_game
+        """Track a game for price notifications. Usage: g!track <game name> [-atl|-sale|-below <price>]"""
+        from utils.database import get_user_tracked_games, remove_tracked_game, threshold_tracking_supported
         
         # 1. Parse flags
-        track_type = "sale"
-        game_name = args
-        if args:
-            if "-atl" in args.lower():
-                track_type = "atl"
-                game_name = args.lower().replace("-atl", "").strip()
-            elif "-sale" in args.lower():
-                track_type = "sale"
-                game_name = args.lower().replace("-sale", "").strip()
+        track_type, threshold, game_name, error = parse_track_flags(args)
+        if error:
+            await ctx.reply(error)
+            return
+        if threshold is not None and not await threshold_tracking_supported():
+            await ctx.reply(THRESHOLD_UNSUPPORTED_MESSAGE)
+            return
 
         # Check if user is owner
         is_owner = await self.bot.is_owner(ctx.author)
@@ -689,20 +1148,20 @@ class Deals(commands.Cog):
             
             if len(existing_tracks) > 1 or is_owner:
                 # Show management UI for multi-track (Owner)
-                view = OwnerTrackManageView(self, existing_tracks, ctx.author)
-                embed = view.create_embed()
+                view = owner_track_view(existing_tracks, ctx.author.id)
+                embed = owner_track_embed(existing_tracks, ctx.author.color)
                 await ctx.reply(embed=embed, view=view)
                 return
             else:
                 # Regular user with one track
                 existing = existing_tracks[0]
-                track_type_display = "All-Time Low" if existing.get('track_type') == 'atl' else "Any Sale"
+                track_type_display = describe_track(existing.get('track_type'), existing.get('threshold')).title()
                 embed = discord.Embed(
                     title="📋 Your Current Tracking",
                     description=f"You're currently tracking: **{existing['game_name']}**\nPreference: **{track_type_display}**",
                     color=ctx.author.color
                 )
-                embed.set_footer(text="Use 'g!track <game name> [-atl|-sale]' to replace it.")
+                embed.set_footer(text="Use 'g!track <game name> [-atl|-sale|-below <price>]' to replace it.")
                 
                 # Add remove button
                 view = discord.ui.View(timeout=60)
@@ -716,6 +1175,7 @@ class Deals(commands.Cog):
                     await interaction.response.defer()
                     from utils.database import remove_tracked_game_by_id
                     await remove_tracked_game_by_id(existing['id'])
+                    self._tracks_changed()
                     
                     embed = discord.Embed(
                         title="✅ Tracking Removed",
@@ -751,7 +1211,7 @@ class Deals(commands.Cog):
                     return
                 await interaction.response.defer()
                 # Proceed with normal tracking flow
-                await self._do_track_search(ctx, game_name, track_type, interaction)
+                await self._do_track_search(ctx, game_name, track_type, interaction, threshold)
             continue_btn.callback = continue_callback
             view.add_item(continue_btn)
             
@@ -775,6 +1235,7 @@ class Deals(commands.Cog):
                 await interaction.response.defer()
                 from utils.database import remove_tracked_game_by_id
                 await remove_tracked_game_by_id(existing['id'])
+                self._tracks_changed()
                 embed = discord.Embed(
                     title="✅ Tracking Removed",
                     description=f"Stopped tracking **{existing['game_name']}**. You can now track a new game!",
@@ -789,12 +1250,12 @@ class Deals(commands.Cog):
 
         # No existing tracking or is owner - proceed normally
         async with ctx.typing():
-            await self._do_track_search(ctx, game_name, track_type)
+            await self._do_track_search(ctx, game_name, track_type, threshold=threshold)
     
-    async def _do_track_search(self, ctx, game_name, track_type="sale", interaction=None):
+    async def _do_track_search(self, ctx, game_name, track_type="sale", interaction=None, threshold=None):
         """Helper method to handle the game search and confirmation."""
         # Get matches using existing logic
-        matches, error = await self.fetch_game_data(game_name, return_matches=True)
+        matches, error, game_name = await self.search_matches(game_name)
         if error:
             if interaction:
                 await interaction.edit_original_response(content=error, embed=None, view=None)
@@ -803,136 +1264,362 @@ class Deals(commands.Cog):
             return
         
         # Get the top match
-        game_title, score, game_dict = matches[0]
-        game_id = game_dict.get("gameID")
+        game_title, score, hit = matches[0]
+        game_id = hit.game_id
         
-        # Create confirmation embed
+        # Create confirmation embed and view
+        with tracer.span("embed_build"):
+            embed = track_confirm_embed(game_title, ctx.author.color, track_type, threshold)
+            view = track_confirm_view(ctx.author.id, game_id, game_name, track_type, threshold)
+
+        if interaction:
+            with tracer.span("discord_edit"):
+                await interaction.edit_original_response(embed=embed, view=view)
+        else:
+            with tracer.span("discord_send"):
+                await ctx.reply(embed=embed, view=view)
+
+
+    async def resolve_titles(self, titles):
+        """Resolve many titles to (SearchHit, score) or None.
+
+        One batch fuzzy pass over the local catalog, then CheapShark searches for the misses,
+        run concurrently at background priority so interactive commands keep their place
+        in the rate limiter.
+        """
+        # Exact lookups and the cdist pass over the whole catalog run off the event loop
+        resolved = await asyncio.to_thread(title_catalog.resolver(), titles)
+        semaphore = asyncio.Semaphore(IMPORT_SEARCH_CONCURRENCY)
+
+        async def search(index):
+            async with semaphore:
+                matches, error = await self.fetch_game_data(titles[index], return_matches=True, priority=PRIORITY_BACKGROUND)
+            if not error and matches and matches[0][1] >= IMPORT_SEARCH_CUTOFF:
+                resolved[index] = (matches[0][2], matches[0][1])
+
+        await asyncio.gather(*(search(index) for index, hit in enumerate(resolved) if hit is None))
+        return resolved
+
+    @commands.command(name="trackimport", aliases=["importwishlist"])
+    async def track_import(self, ctx, *, args: str = None):
+        """Track many games at once. Usage: g!trackimport [-atl|-sale|-below <price>] with one title per line or an attached list / Steam wishlist JSON"""
+        from utils.database import get_user_tracked_games, add_tracked_games, threshold_tracking_supported
+
+        # Bulk tracking only makes sense for accounts allowed more than one track
+        if not await self.bot.is_owner(ctx.author):
+            await ctx.reply("❌ You can only track one game at a time. Use `g!track <game name>` instead.")
+            return
+
+        track_type, threshold, text, error = parse_track_flags(args or "")
+        if error:
+            await ctx.reply(error)
+            return
+        if threshold is not None and not await threshold_tracking_supported():
+            await ctx.reply(THRESHOLD_UNSUPPORTED_MESSAGE)
+            return
+
+        if ctx.message.attachments:
+            attachment = ctx.message.attachments[0]
+            if attachment.size > IMPORT_MAX_BYTES:
+                await ctx.reply("❌ That file is too large. Please attach a list under 1 MB.")
+                return
+            text = (await attachment.read()).decode("utf-8-sig", errors="replace")
+
+        titles = parse_title_list(text or "")
+        if not titles:
+            await ctx.reply("❌ Please paste one game title per line, or attach a text file or Steam wishlist export.")
+            return
+        truncated = len(titles) > IMPORT_MAX_TITLES
+        titles = titles[:IMPORT_MAX_TITLES]
+
+        async with ctx.typing():
+            resolved = await self.resolve_titles(titles)
+            tracked_ids = {str(track.get("cheapshark_game_id")) for track in await get_user_tracked_games(str(ctx.author.id))}
+
+        to_add, already, unresolved = {}, 0, []
+        for title, result in zip(titles, resolved):
+            if result is None:
+                unresolved.append(title)
+            elif result[0].game_id in tracked_ids:
+                already += 1
+            else:
+                to_add.setdefault(result[0].game_id, (title, result[0], result[1]))
+
+        if not to_add:
+            await ctx.reply(f"🔍 Nothing new to track: {already} already tracked, {len(unresolved)} not found.")
+            return
+
+        preview = "\n".join(
+            f"• {title} → **{hit.title}**" + (f" *({score:.0f}%)*" if score < 100 else "")
+            for title, hit, score in list(to_add.values())[:15]
+        )
+        if len(to_add) > 15:
+            preview += f"\n… and {len(to_add) - 15} more"
         embed = discord.Embed(
-            title=f"🔔 Confirm Tracking",
-            description=f"Track **{game_title}** for price drops?",
+            title=f"📥 Import {len(to_add)} games?",
+            description=preview,
             color=ctx.author.color
         )
-        embed.set_footer(text=f"Preference: {'All-time low' if track_type == 'atl' else 'Any sale'} • You can only track one game at a time.")
-        
-        # Show confirmation view
-        view = TrackConfirmView(self, game_id, game_title, ctx.author, ctx.channel.id, matches, game_name, track_type)
-        
-        if interaction:
-            await interaction.edit_original_response(embed=embed, view=view)
-        else:
-            await ctx.reply(embed=embed, view=view)
+        if unresolved:
+            missing = ", ".join(unresolved[:10]) + (f" and {len(unresolved) - 10} more" if len(unresolved) > 10 else "")
+            embed.add_field(name=f"❓ Not found ({len(unresolved)})", value=missing[:1024], inline=False)
+        footer = f"Preference: {describe_track(track_type, threshold)}"
+        if already:
+            footer += f" • {already} already tracked"
+        if truncated:
+            footer += f" • Only the first {IMPORT_MAX_TITLES} titles were read"
+        embed.set_footer(text=footer)
 
+        view = discord.ui.View(timeout=120)
 
-    @tasks.loop(hours=6)
+        confirm_btn = discord.ui.Button(label="✅ Track All", style=discord.ButtonStyle.success)
+        async def confirm_callback(interaction: discord.Interaction):
+            if interaction.user != ctx.author:
+                await interaction.response.send_message("❌ This is not your request.", ephemeral=True)
+                return
+            await interaction.response.defer()
+            view.stop()
+            games = [(game_id, hit.title) for game_id, (_, hit, _) in to_add.items()]
+            result = await add_tracked_games(str(ctx.author.id), str(ctx.channel.id), games, track_type, threshold)
+            if not result:
+                await interaction.edit_original_response(content="❌ Failed to save tracking. Please try again later.", embed=None, view=None)
+                return
+            for game_id, _ in games:
+                self._tracks_changed(game_id)
+            embed = discord.Embed(
+                title="✅ Import Complete",
+                description=f"Now tracking **{len(games)}** more games in this channel.",
+                color=discord.Color.green()
+            )
+            await interaction.edit_original_response(embed=embed, view=None)
+        confirm_btn.callback = confirm_callback
+        view.add_item(confirm_btn)
+
+        cancel_btn = discord.ui.Button(label="❌ Cancel", style=discord.ButtonStyle.secondary)
+        async def cancel_callback(interaction: discord.Interaction):
+            if interaction.user != ctx.author:
+                await interaction.response.send_message("❌ This is not your request.", ephemeral=True)
+                return
+            await interaction.response.defer()
+            view.stop()
+            await interaction.edit_original_response(content="❌ Import cancelled.", embed=None, view=None)
+        cancel_btn.callback = cancel_callback
+        view.add_item(cancel_btn)
+
+        await ctx.reply(embed=embed, view=view)
+
+    def _tracks_changed(self, game_id=None):
+        """Mark the tracked-games view stale; a newly tracked game gets an early first check."""
+        self._tracks_dirty = True
+        if game_id:
+            self.scheduler.add(game_id, soon=True)
+
+    async def _sync_tracked_games(self):
+        """Reload tracked rows into the per-game index and align the scheduler with it."""
+        from utils.database import get_all_tracked_games, iter_tracked_games, DatabaseError
+
+        # Track changes made through this bot are already in the per-user cache; the
+        # periodic resync goes back to the database to pick up anything else
+        periodic = time.time() - self._tracks_synced_at > TRACKS_RESYNC_SECONDS
+        if periodic:
+            # Index page by page into a fresh index; a failed read keeps the old one
+            index = TrackIndex(self.track_index.fired)
+            try:
+                async for rows in iter_tracked_games():
+                    for row in rows:
+                        index.add(row)
+            except DatabaseError as e:
+                print(f"❌ Tracked games resync failed, keeping previous index: {e}")
+                self._tracks_synced_at = time.time()
+                return
+            self.track_index = index
+        else:
+            try:
+                tracks = await get_all_tracked_games(use_cache=True)
+            except DatabaseError as e:
+                # Keep the index and schedule; still dirty, so the next tick retries
+                print(f"❌ Tracked games reload failed, keeping previous index: {e}")
+                return
+            self.track_index.rebuild(tracks)
+        self.scheduler.sync(self.track_index.game_ids())
+        self._tracks_synced_at = time.time()
+        self._tracks_dirty = False
+
+    @tasks.loop(minutes=1)
     async def check_tracked_games_task(self):
-        """Background task to check tracked games and send notifications."""
-        from utils.database import get_all_tracked_games, remove_tracked_game
-        
-        tracked_games = await get_all_tracked_games()
-        if not tracked_games:
+        """Background task to check the tracked games that are due and send notifications."""
+        if self.http.is_open("cheapshark"):
+            # Upstream is down: pause the sweep, due games stay due until it recovers
             return
-        
-        print(f"🔍 Checking {len(tracked_games)} tracked games...")
-        
-        for track in tracked_games:
+
+        if self._tracks_dirty or time.time() - self._tracks_synced_at > TRACKS_RESYNC_SECONDS:
+            await self._sync_tracked_games()
+        if self.track_index.fired:
+            # Deletes that failed last time
+            await self._delete_fired()
+
+        tracker_tracked.set(len(self.scheduler))
+        due_games = self.scheduler.due()
+        tracker_due.set(len(due_games))
+        if not due_games:
+            return
+
+        print(f"🔍 Checking {len(due_games)}/{len(self.scheduler)} tracked games...")
+        started = time.monotonic()
+
+        # channel_id -> [(track, deal, kind, cheapest_ever)], sent as combined messages after the sweep
+        pending = {}
+
+        for game_id in due_games:
+            tracker_games.labels(await self._check_tracked_game(game_id, pending)).inc()
+
+        if pending:
+            await self._deliver_alerts(pending)
+        tracker_sweep_seconds.observe(time.monotonic() - started)
+
+    async def _check_tracked_game(self, game_id, pending):
+        """Check one due game and queue the alerts it triggers. Returns the outcome for metrics."""
+        if self.http.is_open("cheapshark"):
+            # Breaker opened mid-sweep: push the rest back instead of failing them one by one
+            self.scheduler.record_failure(game_id)
+            return "deferred"
+
+        if game_id not in self.track_index:
+            self.scheduler.remove(game_id)
+            return "untracked"
+
+        try:
+            # Fetch current game data once for every tracker of this game
+            data, error = await self.fetch_game_data_by_id(game_id, PRIORITY_BACKGROUND)
+            if error or not data:
+                self.scheduler.record_failure(game_id)
+                return "failed"
+
+            cheapest_ever = data.cheapest_ever
+            self.scheduler.record(game_id, data.best_price, cheapest_ever)
+
+            # One lookup in the game's index finds every watcher this observation satisfies
+            for track, deal, kind in self.track_index.hits(game_id, data.deals, cheapest_ever):
+                pending.setdefault(str(track.get("channel_id")), []).append((track, deal, kind, cheapest_ever))
+            return "checked"
+        except Exception as e:
+            print(f"❌ Error checking tracked game {game_id}: {e}")
+            self.scheduler.record_failure(game_id)
+            return "failed"
+
+    async def _deliver_alerts(self, pending):
+        """Send grouped alerts per channel, then drop every fired track with one bulk delete."""
+        fired = []
+        for channel_id, hits in pending.items():
             try:
-                user_id = track.get("user_id")
-                channel_id = track.get("channel_id")
-                game_id = track.get("cheapshark_game_id")
-                game_name = track.get("game_name")
-                track_type = track.get("track_type", "sale")
-                
-                # Fetch current game data
-                data, error = await self.fetch_game_data_by_id(game_id)
-                if error or not data:
-                    continue
-                
-                deals = data.get("deals", [])
-                if not deals:
-                    continue
-                
-                # Check if there's a deal that meets the user's criteria
-                best_deal = None
-                is_atl_hit = False
-                
-                # Get cheapest price ever for ATL check
-                cheapest_ever = float(data.get("cheapestPriceEver", {}).get("price", 0))
-                
-                for deal in deals:
-                    current_price = float(deal.get("price", 0))
-                    savings = float(deal.get("savings", 0))
-                    
-                    if track_type == "atl":
-                        if current_price <= cheapest_ever and savings > 0:
-                            best_deal = deal
-                            is_atl_hit = True
-                            break
-                    else: # type == "sale"
-                        if savings > 0:
-                            best_deal = deal
-                            break
-                
-                if best_deal:
-                    # Try to get channel from cache first
-                    channel = self.bot.get_channel(int(channel_id))
-                    
-                    # If not in cache, try fetching it
-                    if not channel:
-                        try:
-                            channel = await self.bot.fetch_channel(int(channel_id))
-                        except (discord.NotFound, discord.Forbidden):
-                            print(f"⚠️ Channel {channel_id} no longer exists or is inaccessible. Removing tracking.")
-                            from utils.database import remove_tracked_game_by_id
-                            await remove_tracked_game_by_id(track['id'])
-                            continue
-                        except Exception as e:
-                            print(f"❌ Error fetching channel {channel_id}: {e}")
-                            continue
-
-                    if channel:
-                        try:
-                            current_price = float(best_deal.get("price", 0))
-                            retail_price = float(best_deal.get("retailPrice", 0))
-                            savings = float(best_deal.get("savings", 0))
-                            
-                            # Get user for mention
-                            user = await self.bot.fetch_user(int(user_id))
-                            mention = user.mention if user else "User"
-                            
-                            title = f"🔔 All-Time Low Alert: {game_name}" if is_atl_hit else f"🔔 Price Alert: {game_name}"
-                            desc = f"💰 **ALL-TIME LOW!**\nPrice dropped to **${current_price:.2f}** (Matches or beats ${cheapest_ever:.2f})!" if is_atl_hit else f"💰 **Sale Alert!**\nPrice dropped to **${current_price:.2f}** (was ${retail_price:.2f}) - **{savings:.0f}% off!**"
-                            
-                            embed = discord.Embed(
-                                title=title,
-                                description=f"{mention} {desc}",
-                                color=discord.Color.gold() if is_atl_hit else discord.Color.green()
-                            )
-                            
-                            # Add deal link
-                            if best_deal.get("dealID"):
-                                deal_link = f"https://www.cheapshark.com/redirect?dealID={best_deal['dealID']}"
-                                embed.add_field(name="🛒 Get Deal", value=f"[Click here to claim]({deal_link})", inline=False)
-                            
-                            embed.set_footer(text=f"This was a one-time {track_type.upper()} notification.")
-                            
-                            await channel.send(content=mention, embed=embed)
-                            print(f"✅ Sent {track_type} notification to user {user_id} for {game_name}")
-                            
-                            # Remove from tracking
-                            from utils.database import remove_tracked_game_by_id
-                            await remove_tracked_game_by_id(track['id'])
-                        except discord.Forbidden:
-                            print(f"❌ Cannot send to channel {channel_id} (Forbidden). Removing tracking.")
-                            from utils.database import remove_tracked_game_by_id
-                            await remove_tracked_game_by_id(track['id'])
-                        except Exception as e:
-                            print(f"❌ Error sending notification to channel {channel_id}: {e}")
-            
+                fired.extend(await self._send_channel_alerts(channel_id, hits))
             except Exception as e:
-                print(f"❌ Error checking tracked game: {e}")
-                continue
+                print(f"❌ Error sending notifications to channel {channel_id}: {e}")
+
+        if not fired:
+            return
+
+        # Marked before the delete, so they never fire again even if it fails
+        for track in fired:
+            self.track_index.fired[track["id"]] = track.get("cheapshark_game_id")
+        print(f"✅ Delivered {len(fired)} tracking notifications to {len(pending)} channels.")
+        await self._delete_fired()
+
+    async def _delete_fired(self):
+        """Delete fired tracks; only those whose delete succeeded leave the index, the rest are retried next sweep."""
+        from utils.database import remove_tracked_games_by_ids
+
+        fired = dict(self.track_index.fired)
+        if await remove_tracked_games_by_ids(list(fired)) is None:
+            print(f"⚠️ Could not delete {len(fired)} fired tracks; retrying next sweep.")
+            return
+
+        for track_id, game_id in fired.items():
+            self.track_index.fired.pop(track_id, None)
+            self.track_index.remove(game_id, track_id)
+            if game_id not in self.track_index:
+                self.scheduler.remove(game_id)
+
+    async def _send_channel_alerts(self, channel_id, hits):
+        """Send one channel's alerts in as few messages as possible. Returns the tracks consumed."""
+        tracks = [hit[0] for hit in hits]
+
+        # Try to get channel from cache first
+        channel = self.bot.get_channel(int(channel_id))
+
+        # If not in cache, try fetching it
+        if not channel:
+            try:
+                channel = await self.bot.fetch_channel(int(channel_id))
+            except (discord.NotFound, discord.Forbidden):
+                print(f"⚠️ Channel {channel_id} no longer exists or is inaccessible. Removing tracking.")
+                tracker_alerts.labels("dropped").inc(len(tracks))
+                return tracks
+            except Exception as e:
+                print(f"❌ Error fetching channel {channel_id}: {e}")
+                return []
+
+        sent = []
+        for start in range(0, len(hits), ALERTS_PER_MESSAGE):
+            batch = hits[start:start + ALERTS_PER_MESSAGE]
+            # Mentions come straight from the stored user IDs; no user fetch needed
+            mentions = " ".join(dict.fromkeys(f"<@{track.get('user_id')}>" for track, *_ in batch))
+            embeds = [self._build_alert_embed(*hit) for hit in batch]
+            try:
+                await channel.send(
+                    content=mentions,
+                    embeds=embeds,
+                    allowed_mentions=discord.AllowedMentions(users=True, roles=False, everyone=False)
+                )
+                sent.extend(track for track, *_ in batch)
+                tracker_alerts.labels("sent").inc(len(batch))
+            except discord.Forbidden:
+                print(f"❌ Cannot send to channel {channel_id} (Forbidden). Removing tracking.")
+                tracker_alerts.labels("dropped").inc(len(tracks) - len(sent))
+                return tracks
+            except Exception as e:
+                print(f"❌ Error sending notification to channel {channel_id}: {e}")
+                tracker_alerts.labels("failed").inc(len(batch))
+        return sent
+
+    def _build_alert_embed(self, track, best_deal, kind, cheapest_ever):
+        """Embed for one satisfied track."""
+        game_name = track.get("game_name")
+        track_type = track.get("track_type", "sale")
+        is_atl_hit = kind == "atl"
+
+        current_price = best_deal.price
+        retail_price = best_deal.retail_price
+        savings = best_deal.savings
+        mention = f"<@{track.get('user_id')}>"
+
+        if kind == "below":
+            threshold = float(track.get("threshold", 0))
+            title = f"🔔 Target Price Alert: {game_name}"
+            desc = f"💰 **Target Reached!**\nPrice dropped to **${current_price:.2f}** (your target: ${threshold:.2f})!"
+        elif is_atl_hit:
+            title = f"🔔 All-Time Low Alert: {game_name}"
+            desc = f"💰 **ALL-TIME LOW!**\nPrice dropped to **${current_price:.2f}** (Matches or beats ${cheapest_ever:.2f})!"
+        else:
+            title = f"🔔 Price Alert: {game_name}"
+            desc = f"💰 **Sale Alert!**\nPrice dropped to **${current_price:.2f}** (was ${retail_price:.2f}) - **{savings:.0f}% off!**"
+
+        embed = discord.Embed(
+            title=title,
+            description=f"{mention} {desc}",
+            color=discord.Color.gold() if is_atl_hit else discord.Color.green()
+        )
+
+        # Add deal link
+        if best_deal.url:
+            deal_link = best_deal.url
+            embed.add_field(name="🛒 Get Deal", value=f"[Click here to claim]({deal_link})", inline=False)
+
+        embed.set_footer(text=f"This was a one-time {track_type.upper()} notification.")
+        return embed
     
     @commands.command(name="isgood")
+    @tracer.traced("isgood.prefix")
     async def isgood_command(self, ctx, *, game_name: str = None):
         """Check if a game is worth buying right now."""
         if not game_name:
@@ -940,44 +1627,64 @@ class Deals(commands.Cog):
             return
 
         async with ctx.typing():
-            matches, error = await self.fetch_game_data(game_name, return_matches=True)
+            matches, error, game_name = await self.search_matches(game_name)
             if error:
                 await ctx.reply(error)
                 return
             
-            view = GameSelectionView(self, matches, game_name, ctx.author.color, exact_match=True, action="isgood")
-            await ctx.reply(embed=view.create_selection_embed(), view=view)
+            self.prefetch_matches(matches[:1])
+            with tracer.span("embed_build"):
+                embed = game_selection_embed(matches, game_name, ctx.author.color, exact_match=True, action="isgood")
+                view = game_selection_view(matches, game_name, exact_match=True, action="isgood")
+            with tracer.span("discord_send"):
+                await ctx.reply(embed=embed, view=view)
 
     @app_commands.command(name="isgood", description="Check if a game is worth buying right now")
+    @app_commands.autocomplete(game_name=game_name_autocomplete)
+    @tracer.traced("isgood.slash")
     async def isgood_slash(self, interaction: discord.Interaction, game_name: str):
-        await interaction.response.defer()
-        matches, error = await self.fetch_game_data(game_name, return_matches=True)
+        with tracer.span("defer"):
+            await interaction.response.defer()
+        matches, error, game_name = await self.search_matches(game_name)
         if error:
             await interaction.followup.send(error)
             return
         
-        view = GameSelectionView(self, matches, game_name, interaction.user.color, exact_match=True, action="isgood")
-        await interaction.followup.send(embed=view.create_selection_embed(), view=view)
+        self.prefetch_matches(matches[:1])
+        with tracer.span("embed_build"):
+            embed = game_selection_embed(matches, game_name, interaction.user.color, exact_match=True, action="isgood")
+            view = game_selection_view(matches, game_name, exact_match=True, action="isgood")
+        with tracer.span("discord_send"):
+            await interaction.followup.send(embed=embed, view=view)
 
     async def _isgood_logic(self, interaction, game_id, color):
-        data, error = await self.fetch_game_data_by_id(game_id)
-        if error:
-            await interaction.edit_original_response(content=error, embed=None, view=None)
-            return
+        # Answer from local price history when it is fresh enough, otherwise fetch live
+        data = price_history.snapshot(game_id, ISGOOD_LOCAL_MAX_AGE)
+        if data is None:
+            data, error = await self.get_game_details(game_id)
+            if error:
+                await interaction.edit_original_response(content=error, embed=None, view=None)
+                return
 
-        deals = data.get("deals", [])
-        if not deals:
+        # Cheapest deal across all stores
+        best_deal = data.best_deal
+        if best_deal is None:
             await interaction.edit_original_response(content="❌ No deals found for this game.", embed=None, view=None)
             return
 
-        # Cheapest deal across all stores
-        best_deal = min(deals, key=lambda x: float(x.get("price", 99999)))
-        curr = float(best_deal.get("price", 0))
-        retail = float(best_deal.get("retailPrice", 0))
-        atl = float(data.get("cheapestPriceEver", {}).get("price", 0))
-        savings = float(best_deal.get("savings", 0))
-        title = data.get("info", {}).get("title")
-        store_name = self.stores.get(best_deal.get("storeID"), "Unknown Store")
+        with tracer.span("embed_build"):
+            embed = self._isgood_embed(game_id, data, best_deal)
+        with tracer.span("discord_edit"):
+            await interaction.edit_original_response(embed=embed, view=None)
+
+    def _isgood_embed(self, game_id, data, best_deal):
+        """Verdict embed for a game's best current deal."""
+        curr = best_deal.price
+        retail = best_deal.retail_price
+        atl = data.cheapest_ever
+        savings = best_deal.savings
+        title = data.title
+        store_name = self.stores.get(best_deal.store_id, "Unknown Store")
 
         # Logic
         verdict_name = "WAIT FOR BETTER SALE"
@@ -985,17 +1692,18 @@ class Deals(commands.Cog):
         explanation = "The current price is significantly higher than the all-time low. Only buy if you must play it right now."
         color_v = discord.Color.red()
 
-        if curr <= atl:
+        tier = verdict_tier(curr, atl, savings)
+        if tier == BUY_NOW:
             verdict_name = "BUY NOW (ATL)"
             verdict_emoji = "💎"
             explanation = "This price matches or beats the all-time low! It's the best time to buy."
             color_v = discord.Color.gold()
-        elif curr <= atl * 1.1 or savings >= 75:
+        elif tier == VERY_GOOD:
             verdict_name = "VERY GOOD DEAL"
             verdict_emoji = "🟢"
             explanation = "Extremely close to the all-time low or has a massive discount. Great value!"
             color_v = discord.Color.green()
-        elif curr <= atl * 1.25 or savings >= 50:
+        elif tier == GOOD:
             verdict_name = "GOOD DEAL"
             verdict_emoji = "🟡"
             explanation = "Worth buying, but it has dropped lower before."
@@ -1007,23 +1715,146 @@ class Deals(commands.Cog):
             diff_percent = ((curr - atl) / atl) * 100
             above_atl_text = f"{diff_percent:.0f}% above ATL"
 
+        # Trend from locally observed prices (no extra API calls)
+        trend_text = ""
+        first_seen = price_history.first_seen(game_id)
+        year_low = price_history.low(game_id, days=365)
+        if first_seen is not None and year_low is not None:
+            days_seen = min(365, max(1, int((time.time() - first_seen) // 86400)))
+            window = "52-week" if days_seen >= 365 else f"{days_seen}-day"
+            if curr <= year_low + 0.005:
+                trend_text = f"\n• At its {window} low"
+            else:
+                trend_text = f"\n• {window.capitalize()} low: ${year_low:.2f}"
+
         embed = discord.Embed(title=f"🎮 {title}", color=color_v)
         
         embed.add_field(name="💰 Current Price", value=f"${curr:.2f} on **{store_name}**", inline=True)
         embed.add_field(name="🏆 All-Time Low", value=f"${atl:.2f}", inline=True)
         embed.add_field(name="📉 Discount", value=f"{savings:.0f}% off", inline=True)
         
-        embed.add_field(name="📊 Price Analysis", value=f"• {above_atl_text}", inline=False)
+        embed.add_field(name="📊 Price Analysis", value=f"• {above_atl_text}{trend_text}", inline=False)
         embed.add_field(name="✅ Verdict", value=f"{verdict_emoji} **{verdict_name}**\n{explanation}", inline=False)
         
-        if best_deal.get("dealID"):
-            link = f"https://www.cheapshark.com/redirect?dealID={best_deal['dealID']}"
+        if best_deal.url:
+            link = best_deal.url
             embed.description = f"🔗 [Click to buy on {store_name}]({link})"
 
-        embed.set_thumbnail(url=data.get("info", {}).get("thumb"))
+        embed.set_thumbnail(url=data.thumb)
         embed.set_footer(text="Powered by CheapShark • All stores compared")
-        
-        await interaction.edit_original_response(embed=embed, view=None)
+        return embed
+
+    async def fetch_deal_listings(self, store_id=None, priority=PRIORITY_INTERACTIVE):
+        """One page of the CheapShark deals feed as DealListing models, from supported stores only."""
+        params = {
+            "storeID": store_id or ",".join(self.stores),
+            "onSale": 1,
+            "sortBy": "Deal Rating",
+            "pageSize": DIGEST_PAGE_SIZE,
+        }
+        try:
+            status, rows = await self.http.get_json(f"{self.api_base}/deals", params=params, priority=priority)
+        except CircuitOpenError:
+            return None, UNAVAILABLE_MESSAGE
+        except Exception as e:
+            print(f"❌ Error fetching deals feed: {e!r}")
+            return None, "❌ Failed to fetch deals."
+        if status != 200:
+            return None, "❌ Failed to fetch deals."
+
+        listings = [DealListing.from_json(row) for row in rows or []]
+        for listing in listings:
+            title_catalog.add(listing.game_id, listing.title, listing.thumb)
+        return listings, None
+
+    def _resolve_store(self, name):
+        """Store ID for a store name or ID from self.stores, or None."""
+        if not name:
+            return None
+        name = name.strip().lower()
+        for store_id, store_name in self.stores.items():
+            if name in (store_id, store_name.lower()):
+                return store_id
+        return None
+
+    @commands.command(name="deals")
+    async def deals_command(self, ctx, *, store: str = None):
+        """Show the best-value deals right now. Usage: g!deals [store]"""
+        async with ctx.typing():
+            await self._deals_logic(ctx, store)
+
+    @app_commands.command(name="deals", description="Show the best-value deals right now")
+    @app_commands.describe(store="Only show deals from this store")
+    async def deals_slash(self, interaction: discord.Interaction, store: str = None):
+        await interaction.response.defer()
+        await self._deals_logic(interaction, store)
+
+    @deals_slash.autocomplete("store")
+    async def store_autocomplete(self, interaction: discord.Interaction, current: str):
+        current = current.lower()
+        return [
+            app_commands.Choice(name=name, value=name)
+            for name in sorted(self.stores.values())
+            if current in name.lower()
+        ][:25]
+
+    async def _deals_logic(self, target, store=None):
+        """Rank one page of the deals feed with the /isgood verdict, all games at once."""
+        is_interaction = isinstance(target, discord.Interaction)
+        user = target.user if is_interaction else target.author
+        send = target.followup.send if is_interaction else target.reply
+
+        store_id = self._resolve_store(store)
+        if store and not store_id:
+            await send("❌ Unknown store. Use `g!store` to see the supported stores.")
+            return
+
+        listings, error = await self.fetch_deal_listings(store_id)
+        if error:
+            await send(error)
+            return
+        if not listings:
+            await send("❌ No deals found right now.")
+            return
+
+        # All-time lows the bot has already seen; unknown lows are NaN and fall back to the savings tests
+        atls = [price_history.cheapest_ever(listing.game_id) for listing in listings]
+        order, tiers = rank_deals(
+            [listing.price for listing in listings],
+            [float("nan") if atl is None else atl for atl in atls],
+            [listing.savings for listing in listings],
+            limit=DIGEST_SHOWN,
+        )
+
+        lines = []
+        for index in order:
+            tier = int(tiers[index])
+            if tier not in VERDICT_EMOJI:
+                continue
+            listing, atl = listings[index], atls[index]
+            store_name = self.stores.get(listing.store_id, f"Store {listing.store_id}")
+            if atl is None:
+                atl_text = ""
+            elif listing.price <= atl:
+                atl_text = " • ATL"
+            else:
+                atl_text = f" • {(listing.price - atl) / atl * 100:.0f}% above ATL"
+            lines.append(
+                f"{VERDICT_EMOJI[tier]} [{listing.title}]({listing.url}) — **${listing.price:.2f}** "
+                f"~~${listing.retail_price:.2f}~~ ({listing.savings:.0f}% off) on {store_name}{atl_text}"
+            )
+
+        if not lines:
+            await send("🔍 Nothing worth buying in the current deals. Check back later!")
+            return
+
+        embed = discord.Embed(
+            title="🔥 Best Deals Right Now" + (f" on {self.stores[store_id]}" if store_id else ""),
+            description="\n".join(lines),
+            color=user.color
+        )
+        embed.set_footer(text=f"Ranked from {len(listings)} current deals • 💎 ATL • 🟢 Very good • 🟡 Good • Powered by CheapShark")
+        await send(embed=embed)
 
     @commands.command(name="store", aliases=["stores"])
     async def store_command(self, ctx):
@@ -1062,6 +1893,10 @@ class Deals(commands.Cog):
     async def before_check_tracked_games(self):
         await self.bot.wait_until_ready()
 
+    @save_local_data_task.before_loop
+    async def before_save_local_data(self):
+        await self.bot.wait_until_ready()
+
 
 
 async def setup(bot):
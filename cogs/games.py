@@ -1,13 +1,28 @@
 import discord
 from discord.ext import commands, tasks
 from discord import app_commands
-import aiohttp
 import asyncio
+import time
 from datetime import datetime, timezone, timedelta
 import traceback
 
-from utils.database import get_all_guild_settings, is_game_sent, mark_game_sent, cleanup_sent_games_db
+from utils.database import DatabaseError, iter_guild_settings, is_game_sent, mark_game_sent, cleanup_sent_games_db
 from utils.helpers import format_duration
+from utils.ratelimit import PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND
+from utils.models import FreeGameOffer
+from utils.cache import cache
+from utils.metrics import registry
+
+# Feed payloads are shared by g!free and the announcement loops for this long
+FEED_CACHE_TTL = 10 * 60
+
+# Fan-out waves take seconds to many minutes depending on guild count
+FANOUT_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1200, 1800, 3600)
+
+# Per-guild outcomes of an announcement; everything except "sent" and "already_sent" is a failure reason
+fanout_seconds = registry.histogram("gameclaim_fanout_seconds", "Duration of one announcement wave", ("platform",), FANOUT_BUCKETS)
+fanout_guilds = registry.counter("gameclaim_fanout_guilds_total", "Guilds visited by announcement waves, by outcome", ("platform", "result"))
+fanout_rate = registry.gauge("gameclaim_fanout_sends_per_second", "Messages sent per second in the last announcement wave", ("platform",))
 
 class GameView(discord.ui.View):
     def __init__(self, claim_url, vote_url):
@@ -18,203 +33,203 @@ class GameView(discord.ui.View):
 class Games(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.session = aiohttp.ClientSession()
+        # Shared bot-wide HTTP client (created and closed in main.py)
+        self.http = bot.http_client
+        self._feeds = cache.namespace("feeds", FEED_CACHE_TTL, 8)
         # Start loops safely
         if not self.check_free_games.is_running():
             self.check_free_games.start()
         if not self.steam_games.is_running():
             self.steam_games.start()
 
-    async def cog_unload(self):
-        if self.session:
-            await self.session.close()
-
     async def cog_load(self):
         # Initial cleanup scheduled here to be async compatible
         asyncio.create_task(cleanup_sent_games_db())
 
     async def send_to_all_guilds(self, embed, platform, game_key, title=None, url=None, start_iso=None):
-        settings = await get_all_guild_settings()
-        if not settings:
-            print("ℹ️ No guild settings in DB; nothing to send.")
-            return
-
         # Prepare View
         vote_url = f"https://top.gg/bot/{self.bot.user.id}/vote"
         view = GameView(url, vote_url)
 
         success_count = 0
-        total = len(settings)
+        total = 0
+        started = time.monotonic()
 
-        for row in settings:
-            guild_id = row.get("guild_id")
-            raw_channel = row.get("channel_id")
-            try:
-                channel_id = int(raw_channel)
-            except Exception:
-                continue
-
-            # skip if already sent
-            if await is_game_sent(guild_id, game_key):
-                continue
-
-            channel = self.bot.get_channel(channel_id)
-            if channel is None:
-                continue
+        # Settings are streamed page by page, so memory stays flat however many guilds there are
+        try:
+            async for rows in iter_guild_settings():
+                total += len(rows)
+                for row in rows:
+                    result = await self._send_to_guild(row, embed, view, game_key, title, url, start_iso)
+                    fanout_guilds.labels(platform, result).inc()
+                    if result == "sent":
+                        success_count += 1
+        except Exception as e:
+            fanout_guilds.labels(platform, "settings_read_error").inc()
+            print(f"❌ Guild settings read stopped after {total} guilds: {e}")
 
-            guild = self.bot.get_guild(int(guild_id))
-            if guild is None:
-                continue
+        elapsed = time.monotonic() - started
+        fanout_seconds.labels(platform).observe(elapsed)
+        if not total:
+            print("ℹ️ No guild settings in DB; nothing to send.")
+            return
+        fanout_rate.labels(platform).set(success_count / elapsed if elapsed > 0 else 0)
+        print(f"✅ Send summary: {success_count}/{total} succeeded.")
 
-            if not channel.permissions_for(guild.me).send_messages:
-                continue
+    async def _send_to_guild(self, row, embed, view, game_key, title, url, start_iso):
+        """Announce one game in one guild. Returns "sent", "already_sent" or why it was not sent."""
+        guild_id = row.get("guild_id")
+        raw_channel = row.get("channel_id")
+        try:
+            channel_id = int(raw_channel)
+        except Exception:
+            return "invalid_channel"
 
-            # build ping mention
-            ping_roles = row.get("ping_roles") or []
-            ping_mention = ""
-            if ping_roles:
-                mentions = []
-                if isinstance(ping_roles, list):
-                    for rid in ping_roles:
-                        try:
-                            rid_int = int(rid)
-                        except:
-                            continue
-                        role = guild.get_role(rid_int)
-                        if role:
-                            mentions.append(f"<@&{rid_int}>")
-                else:
-                    # fallback
+        # skip if already sent; if that can't be checked, skip this round rather than risk a duplicate
+        try:
+            if await is_game_sent(guild_id, game_key):
+                return "already_sent"
+        except DatabaseError as e:
+            print(f"⚠️ Could not check sent state for guild {guild_id}, retrying next round: {e}")
+            return "db_error"
+
+        channel = self.bot.get_channel(channel_id)
+        if channel is None:
+            return "channel_missing"
+
+        guild = self.bot.get_guild(int(guild_id))
+        if guild is None:
+            return "guild_missing"
+
+        if not channel.permissions_for(guild.me).send_messages:
+            return "no_permission"
+
+        # build ping mention
+        ping_roles = row.get("ping_roles") or []
+        ping_mention = ""
+        if ping_roles:
+            mentions = []
+            if isinstance(ping_roles, list):
+                for rid in ping_roles:
                     try:
-                        rid_int = int(ping_roles)
-                        if rid_int == guild.id:
-                            mentions = ["@everyone"]
-                        else:
-                            mentions = [f"<@&{rid_int}>"]
+                        rid_int = int(rid)
                     except:
-                        mentions = []
-                ping_mention = " ".join(mentions) + (" " if mentions else "")
-
-            try:
-                await channel.send(ping_mention, embed=embed, view=view)
-                await mark_game_sent(guild_id, game_key, title=title, url=url, announced_at=(start_iso or None))
-                success_count += 1
-            except Exception as e:
-                print(f"❌ Failed to send to channel {channel_id} in guild {guild_id}: {e}")
-
-        print(f"✅ Send summary: {success_count}/{total} succeeded.")
+                        continue
+                    role = guild.get_role(rid_int)
+                    if role:
+                        mentions.append(f"<@&{rid_int}>")
+            else:
+                # fallback
+                try:
+                    rid_int = int(ping_roles)
+                    if rid_int == guild.id:
+                        mentions = ["@everyone"]
+                    else:
+                        mentions = [f"<@&{rid_int}>"]
+                except:
+                    mentions = []
+            ping_mention = " ".join(mentions) + (" " if mentions else "")
 
-    async def fetch_epic_games(self):
-        """Fetches free games from Epic Games Store"""
-        games_found = []
         try:
-            url = "https://store-site-backend-static.ak.epicgames.com/freeGamesPromotions?locale=en-US&country=US&allowCountries=US"
-            async with self.session.get(url, timeout=10) as response:
-                if response.status != 200:
-                    return []
-                res = await response.json()
+            await channel.send(ping_mention, embed=embed, view=view)
+        except discord.Forbidden as e:
+            print(f"❌ Failed to send to channel {channel_id} in guild {guild_id}: {e}")
+            return "forbidden"
         except Exception as e:
-            print(f"❌ Failed to fetch Epic games: {e}")
-            return []
-
-        if not res or "data" not in res:
-            return []
-
-        for game in res["data"]["Catalog"]["searchStore"]["elements"]:
-            title = game.get("title", "Unknown")
-            promotions = game.get("promotions")
-            if not promotions:
-                continue
-
-            offers = promotions.get("promotionalOffers", [])
-            if not offers or not offers[0]["promotionalOffers"]:
-                continue
-
-            offer = offers[0]["promotionalOffers"][0]
-            start = datetime.fromisoformat(offer["startDate"].replace("Z", "+00:00"))
-            end = datetime.fromisoformat(offer["endDate"].replace("Z", "+00:00"))
-            now = datetime.now(timezone.utc)
-
-            if not (start <= now <= end):
-                continue
-
-            slug = game.get("productSlug") or game.get("catalogNs", {}).get("mappings", [{}])[0].get("pageSlug", "")
-            game_key = slug or title
-            link = f"https://store.epicgames.com/en-US/p/{slug}" if slug else "https://store.epicgames.com/"
-            
-            price_data = game.get("price", {}).get("totalPrice", {})
-            price = price_data.get("originalPrice", 0) / 100
-            
-            images = game.get("keyImages", [])
-            thumb = next((img["url"] for img in images if img.get("type") == "Thumbnail"), images[0]["url"] if images else None)
-
+            print(f"❌ Failed to send to channel {channel_id} in guild {guild_id}: {e}")
+            return "send_failed"
+        await mark_game_sent(guild_id, game_key, title=title, url=url, announced_at=(start_iso or None))
+        return "sent"
+
+    def build_offer_embed(self, offer):
+        """Announcement embed for a FreeGameOffer."""
+        if offer.platform == "epic":
             embed = discord.Embed(
-                title=f"🎮 **{title}**",
+                title=f"🎮 **{offer.title}**",
                 description="Grab it before it's gone!",
                 color=discord.Color.from_str("#00FFFF")
             )
-            embed.add_field(name="💲 Original Price", value=f"${price:.2f}", inline=True)
-            embed.add_field(name="🕒 Offer Period", value=format_duration(end - now), inline=False)
-            if thumb:
-                embed.set_image(url=thumb)
+            embed.add_field(name="💲 Original Price", value=f"${offer.worth or 0:.2f}", inline=True)
+            embed.add_field(name="🕒 Offer Period", value=format_duration(offer.ends_at - datetime.now(timezone.utc)), inline=False)
+            if offer.thumb:
+                embed.set_image(url=offer.thumb)
             embed.set_footer(text="GameClaim • Epic Freebie")
-
-            games_found.append({
-                "key": game_key,
-                "title": title,
-                "url": link,
-                "embed": embed,
-                "start_iso": start.isoformat()
-            })
+            return embed
+
+        embed = discord.Embed(
+            title=f"🎮 **{offer.title}**",
+            description=offer.description,
+            color=discord.Color.from_str("#00FFFF")
+        )
+        embed.add_field(name="💲 Original Price", value=f"${offer.worth:.2f}" if offer.worth is not None else "N/A", inline=True)
+        embed.add_field(name="⏳ Free Till", value=offer.ends_at.strftime("%Y-%m-%d %H:%M:%S") if offer.ends_at else "N/A", inline=True)
+        embed.set_image(url=offer.thumb)
+        embed.set_footer(text="GameClaim • Steam Freebie")
+        return embed
+
+    async def fetch_epic_games(self, priority=PRIORITY_INTERACTIVE):
+        """Fetches free games from Epic Games Store, as FreeGameOffer models"""
+        games_found = []
+        elements = await self._feeds.get("epic")
+        if elements is None:
+            try:
+                url = "https://store-site-backend-static.ak.epicgames.com/freeGamesPromotions?locale=en-US&country=US&allowCountries=US"
+                status, res = await self.http.get_json(url, priority=priority)
+                if status != 200:
+                    return []
+            except Exception as e:
+                print(f"❌ Failed to fetch Epic games: {e}")
+                return []
+
+            if not res or "data" not in res:
+                return []
+            elements = res["data"]["Catalog"]["searchStore"]["elements"]
+            await self._feeds.set("epic", elements)
+
+        # Offer windows are checked on every call, so a cached feed never announces an expired offer
+        now = datetime.now(timezone.utc)
+        for game in elements:
+            offer = FreeGameOffer.from_epic(game)
+            if offer is None or not (offer.starts_at <= now <= offer.ends_at):
+                continue
+            games_found.append(offer)
         
         return games_found
 
-    async def fetch_steam_games(self):
-        """Fetches free games from GamerPower (Steam)"""
+    async def fetch_steam_games(self, priority=PRIORITY_INTERACTIVE):
+        """Fetches free games from GamerPower (Steam), as FreeGameOffer models"""
         games_found = []
-        try:
-            url = "https://www.gamerpower.com/api/giveaways?platform=steam"
-            async with self.session.get(url, timeout=10) as response:
-                if response.status != 200:
+        res = await self._feeds.get("steam")
+        if res is None:
+            try:
+                url = "https://www.gamerpower.com/api/giveaways?platform=steam"
+                status, res = await self.http.get_json(url, priority=priority)
+                if status != 200:
                     return []
-                res = await response.json()
-        except Exception as e:
-            print(f"❌ Failed to fetch Steam games: {e}")
-            return []
+            except Exception as e:
+                print(f"❌ Failed to fetch Steam games: {e}")
+                return []
+            res = res[:5]
+            await self._feeds.set("steam", res)
 
-        for game in res[:5]:
-            game_id = str(game.get("id"))
-            embed = discord.Embed(
-                title=f"🎮 **{game.get('title')}**",
-                description=game.get("description", "Free on Steam!"),
-                color=discord.Color.from_str("#00FFFF")
-            )
-            embed.add_field(name="💲 Original Price", value=game.get("worth", "N/A"), inline=True)
-            embed.add_field(name="⏳ Free Till", value=game.get("end_date", "N/A"), inline=True)
-            embed.set_image(url=game.get("thumbnail", ""))
-            embed.set_footer(text="GameClaim • Steam Freebie")
-
-            games_found.append({
-                "key": game_id,
-                "title": game.get("title"),
-                "url": game.get("open_giveaway_url", ""),
-                "embed": embed,
-                "start_iso": None
-            })
+        games_found = [FreeGameOffer.from_gamerpower(game) for game in res]
         
         return games_found
 
     @tasks.loop(hours=1)
     async def check_free_games(self):
-        games = await self.fetch_epic_games()
+        if self.http.is_open("epic"):
+            print("⏸️ Epic is unavailable (circuit open); skipping this check.")
+            return
+        games = await self.fetch_epic_games(PRIORITY_BACKGROUND)
         for game in games:
             await self.send_to_all_guilds(
-                game['embed'], 
+                self.build_offer_embed(game), 
                 "epic", 
-                game['key'], 
-                title=game['title'], 
-                url=game['url'], 
-                start_iso=game['start_iso']
+                game.key, 
+                title=game.title, 
+                url=game.url, 
+                start_iso=game.start_iso
             )
 
     @check_free_games.before_loop
@@ -223,15 +238,18 @@ class Games(commands.Cog):
 
     @tasks.loop(hours=1)
     async def steam_games(self):
-        games = await self.fetch_steam_games()
+        if self.http.is_open("gamerpower"):
+            print("⏸️ GamerPower is unavailable (circuit open); skipping this check.")
+            return
+        games = await self.fetch_steam_games(PRIORITY_BACKGROUND)
         for game in games:
             await self.send_to_all_guilds(
-                game['embed'], 
+                self.build_offer_embed(game), 
                 "steam", 
-                game['key'], 
-                title=game['title'], 
-                url=game['url'], 
-                start_iso=game['start_iso']
+                game.key, 
+                title=game.title, 
+                url=game.url, 
+                start_iso=game.start_iso
             )
 
     @steam_games.before_loop
@@ -256,8 +274,8 @@ class Games(commands.Cog):
             
         vote_url = f"https://top.gg/bot/{self.bot.user.id}/vote"
         for game in games_to_show:
-            view = GameView(game['url'], vote_url)
-            await ctx.reply(embed=game['embed'], view=view, mention_author=False)
+            view = GameView(game.url, vote_url)
+            await ctx.reply(embed=self.build_offer_embed(game), view=view, mention_author=False)
 
     @app_commands.command(name="free", description="Get current free games")
     @app_commands.choices(platform=[
@@ -281,8 +299,8 @@ class Games(commands.Cog):
 
         vote_url = f"https://top.gg/bot/{self.bot.user.id}/vote"
         for game in games_to_show:
-             view = GameView(game['url'], vote_url)
-             await interaction.followup.send(embed=game['embed'], view=view)
+             view = GameView(game.url, vote_url)
+             await interaction.followup.send(embed=self.build_offer_embed(game), view=view)
 
 async def setup(bot):
     await bot.add_cog(Games(bot))
@@ -176,8 +176,10 @@ class General(commands.Cog):
         embed_gaming.add_field(name="`g!free <source>` or `/free`", value="Get current free games from Epic or Steam.", inline=False)
         embed_gaming.add_field(name="`g!price <game> [currency]` or `/price`", value="Check game prices across multiple stores. Supports 25+ currencies.", inline=False)
         embed_gaming.add_field(name="`g!isgood <game>` or `/isgood`", value="Check if a game is worth buying based on its price history.", inline=False)
+        embed_gaming.add_field(name="`g!trackimport [-atl|-sale|-below <price>]`", value="(Owner) Track many games at once from a pasted list, a text file or a Steam wishlist export.", inline=False)
+        embed_gaming.add_field(name="`g!deals [store]` or `/deals`", value="Show the best-value deals right now, optionally from one store.", inline=False)
         embed_gaming.add_field(name="`g!store` or `/stores`", value="Show all supported stores for price comparison.", inline=False)
-        embed_gaming.add_field(name="`g!track <game> [-atl|-sale]`", value="Get notified when a game goes on sale. Use `-atl` for All-Time Low alerts.", inline=False)
+        embed_gaming.add_field(name="`g!track <game> [-atl|-sale|-below <price>]`", value="Get notified when a game goes on sale. Use `-atl` for All-Time Low alerts or `-below 9.99` for a target price.", inline=False)
         embed_gaming.add_field(name="`g!track` (no arguments)", value="View or manage your current tracked game.", inline=False)
         embed_gaming.set_footer(text="Category: Gaming & Deals • GameClaim")
 
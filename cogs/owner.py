@@ -3,7 +3,11 @@ from discord.ext import commands
 from discord import app_commands
 import asyncio
 
-from utils.database import get_all_guild_settings
+from utils.database import iter_guild_settings, db_executor, db_backend, db_stats, mirror_stats, query_seconds, query_total, slow_queries, DB_SLOW_QUERY_MS
+from utils.ratelimit import limiter, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND
+from utils.breaker import breakers
+from utils.cache import cache
+from utils.tracing import tracer, span_seconds
 
 class AnnounceModal(discord.ui.Modal, title='Broadcast Announcement'):
     def __init__(self, cog):
@@ -105,15 +109,10 @@ class Owner(commands.Cog):
 
     async def _send_to_guilds_parallel(self, embed):
         """Helper to send announcement to all guilds in parallel"""
-        settings = await get_all_guild_settings()
-        if not settings:
-            return 0, 0
-
         success_count = 0
-        total = len(settings)
-        
+        total = 0
+
         async def send_to_one(row):
-            nonlocal success_count
             async with self.semaphore:
                 try:
                     ch_id = int(row.get("channel_id"))
@@ -125,8 +124,14 @@ class Owner(commands.Cog):
                     pass
                 return False
 
-        results = await asyncio.gather(*(send_to_one(row) for row in settings))
-        success_count = sum(results)
+        # One page of settings in flight at a time instead of the whole table
+        try:
+            async for rows in iter_guild_settings():
+                total += len(rows)
+                results = await asyncio.gather(*(send_to_one(row) for row in rows))
+                success_count += sum(results)
+        except Exception as e:
+            print(f"❌ Guild settings read stopped after {total} guilds: {e}")
         return success_count, total
 
     @commands.command(name="promote")
@@ -183,6 +188,167 @@ class Owner(commands.Cog):
         embed.set_footer(text="Thank you for using GameClaim! 🎮")
         await ctx.reply(embed=embed)
 
+    @commands.command(name="ratelimits")
+    @commands.is_owner()
+    async def rate_limits(self, ctx):
+        """Shows queue depth and wait times of the outbound rate limiter."""
+        embed = discord.Embed(title="🚦 Upstream Rate Limits", color=ctx.author.color)
+        for host in limiter.stats():
+            depth = host["queue_depth"]
+            avg = host["avg_wait"]
+            embed.add_field(
+                name=host["host"],
+                value=(
+                    f"Rate: {host['rate']}/s (burst {host['burst']}) • Tokens: {host['tokens']}\n"
+                    f"Queued: {depth[PRIORITY_INTERACTIVE]} interactive / {depth[PRIORITY_BACKGROUND]} background\n"
+                    f"Avg wait: {avg[PRIORITY_INTERACTIVE]:.2f}s / {avg[PRIORITY_BACKGROUND]:.2f}s"
+                ),
+                inline=False
+            )
+        if not embed.fields:
+            embed.description = "No upstream requests made yet."
+        await ctx.reply(embed=embed)
+
+    @commands.command(name="breakers")
+    @commands.is_owner()
+    async def circuit_breakers(self, ctx):
+        """Shows the circuit breaker state of each upstream API."""
+        icons = {"closed": "🟢", "half_open": "🟡", "open": "🔴"}
+        embed = discord.Embed(title="🔌 Upstream Circuit Breakers", color=ctx.author.color)
+        for breaker in breakers.values():
+            info = breaker.stats()
+            value = f"{icons.get(info['state'], '⚪')} **{info['state'].replace('_', '-')}** • consecutive failures: {info['failures']}"
+            if info["retry_in"]:
+                value += f" • probe in {info['retry_in']:.0f}s"
+            value += f"\nOpened {info['times_opened']}x • rejected {info['total_rejected']} calls"
+            embed.add_field(name=info["name"], value=value, inline=False)
+        if not embed.fields:
+            embed.description = "No upstream requests made yet."
+        await ctx.reply(embed=embed)
+
+    @commands.command(name="dbstats")
+    @commands.is_owner()
+    async def db_stats(self, ctx):
+        """Shows the database backend, its call outcomes and its thread pool."""
+        info = db_executor.stats()
+        embed = discord.Embed(title="🗄️ Database", description=f"Backend: **{db_backend()}**", color=ctx.author.color)
+        embed.add_field(
+            name="Calls",
+            value=(
+                f"Calls: {db_stats['calls']} • Retries: {db_stats['retries']}\n"
+                f"Hedged reads: {db_stats['hedges']} (won {db_stats['hedge_wins']})\n"
+                f"Timeouts: {db_stats['timeouts']} • Transient: {db_stats['transient_errors']} • Permanent: {db_stats['permanent_errors']}"
+            ),
+            inline=False
+        )
+        mirrors = mirror_stats()
+        embed.add_field(
+            name="Local mirrors",
+            value=(
+                f"Guild settings: {mirrors['guild_settings']} ({mirrors['guild_source'] or 'not loaded'})\n"
+                f"Sent keys: {mirrors['sent_keys']} ({mirrors['sent_source'] or 'not loaded'})"
+                + (f"\nUnrecorded sends: {mirrors['sent_unrecorded']}" if mirrors["sent_unrecorded"] else "")
+            ),
+            inline=False
+        )
+        embed.add_field(
+            name=f"Thread pool ({info['max_workers']} workers)",
+            value=(
+                f"Active: {info['active']} • Queued: {info['queued']}\n"
+                f"Calls: {info['submitted']} • Failed: {info['failed']} • Timed out: {info['timed_out']}\n"
+                f"Wait: avg {info['avg_wait']:.3f}s / max {info['max_wait']:.2f}s\n"
+                f"Run: avg {info['avg_run']:.3f}s / max {info['max_run']:.2f}s"
+            ),
+            inline=False
+        )
+        await ctx.reply(embed=embed)
+
+    @commands.command(name="dbqueries")
+    @commands.is_owner()
+    async def db_queries(self, ctx):
+        """Shows DB operations by total time spent, and the latest slow queries."""
+        failures = {}
+        for (op, outcome), child in query_total.children():
+            if outcome != "ok":
+                failures[op] = failures.get(op, 0) + int(child.value)
+
+        ops = sorted(query_seconds.children(), key=lambda item: item[1].sum, reverse=True)
+        lines = []
+        for (op,), hist in ops[:10]:
+            lines.append(
+                f"`{op}` {hist.count} calls • {hist.sum:.1f}s total • "
+                f"p50 {hist.quantile(0.5) * 1000:.0f}ms / p95 {hist.quantile(0.95) * 1000:.0f}ms"
+                + (f" • ❌ {failures[op]}" if failures.get(op) else "")
+            )
+        embed = discord.Embed(title="🗄️ DB queries", description="\n".join(lines) or "No queries yet.", color=ctx.author.color)
+
+        recent = list(slow_queries)[-5:]
+        if recent:
+            embed.add_field(
+                name=f"Slow queries (≥ {DB_SLOW_QUERY_MS}ms)",
+                value="\n".join(
+                    f"<t:{int(at)}:R> `{op}` {seconds * 1000:.0f}ms, {rows} rows, {outcome}"
+                    for at, op, seconds, rows, outcome in reversed(recent)
+                ),
+                inline=False
+            )
+        await ctx.reply(embed=embed)
+
+    @commands.command(name="traces")
+    @commands.is_owner()
+    async def traces(self, ctx, command: str = None):
+        """Shows where traced commands spend their time: per step, average time per run and p95."""
+        by_command = {}
+        for (root, span), hist in span_seconds.children():
+            by_command.setdefault(root, {})[span] = hist
+
+        if command is None:
+            lines = [
+                f"`{root}` {spans[root].count} runs • p50 {spans[root].quantile(0.5) * 1000:.0f}ms / "
+                f"p95 {spans[root].quantile(0.95) * 1000:.0f}ms"
+                for root, spans in sorted(by_command.items(), key=lambda item: item[1][item[0]].sum, reverse=True)
+                if root in spans
+            ]
+            description = "\n".join(lines) or "No traces yet."
+            description += "\n\nUse `g!traces <command>` for a per-step breakdown."
+        elif command not in by_command or command not in by_command[command]:
+            description = f"No traces for `{command}`. Known: {', '.join(f'`{name}`' for name in sorted(by_command)) or 'none'}"
+        else:
+            spans = by_command[command]
+            runs = spans[command].count
+            total = spans[command].sum / runs
+            lines = [f"**Total** {total * 1000:.0f}ms avg • p95 {spans[command].quantile(0.95) * 1000:.0f}ms over {runs} runs"]
+            steps = sorted(((name, hist) for name, hist in spans.items() if name != command), key=lambda item: item[1].sum, reverse=True)
+            for name, hist in steps:
+                # Average per run, so steps that run several times per interaction add up
+                per_run = hist.sum / runs
+                lines.append(
+                    f"`{name}` {per_run * 1000:.0f}ms/run ({per_run / total:.0%}) • "
+                    f"p95 {hist.quantile(0.95) * 1000:.0f}ms • {hist.count} spans"
+                )
+            description = "\n".join(lines)
+
+        embed = discord.Embed(title="⏱️ Interaction traces", description=description[:4096], color=ctx.author.color)
+        if tracer.endpoint:
+            embed.set_footer(text=f"Exported {tracer.exported} traces to {tracer.endpoint}" + (f" • {tracer.export_failures} failed batches" if tracer.export_failures else ""))
+        await ctx.reply(embed=embed)
+
+    @commands.command(name="cachestats")
+    @commands.is_owner()
+    async def cache_stats(self, ctx):
+        """Shows hit rates and evictions per cache namespace."""
+        lines = [
+            f"`{info['namespace']}` {info['hit_rate']:.0%} hits ({info['hits']}/{info['hits'] + info['misses']}) • "
+            f"{info['sets']} sets • {info['evictions']} evicted" + (f" • ❌ {info['errors']}" if info["errors"] else "")
+            for info in cache.stats()
+        ]
+        embed = discord.Embed(
+            title="📦 Cache",
+            description=f"Backend: **{cache.backend.name}**\n" + ("\n".join(lines) or "No namespaces yet."),
+            color=ctx.author.color
+        )
+        await ctx.reply(embed=embed)
+
     @commands.command(name="reload")
     @commands.is_owner()
     async def reload_cog(self, ctx, extension: str):
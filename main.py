@@ -5,9 +5,15 @@ from discord.ext import commands
 from dotenv import load_dotenv
 import traceback
 import asyncio
+import time
 
-from keepAlive import keep_alive
-keep_alive()
+from utils.http import HttpClient
+from utils.database import close_db, refresh_mirrors, record_unrecorded_sent
+from utils.snapshot import warm_snapshot
+from utils.cache import cache
+from utils.health import HealthServer
+from utils.metrics import registry
+from utils.tracing import tracer
 
 # Logs config
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
@@ -26,6 +32,21 @@ from datetime import datetime, timezone
 bot = commands.Bot(command_prefix=commands.when_mentioned_or("g!"), intents=intents, help_command=None)
 bot.launch_time = datetime.now(timezone.utc)
 
+# Interaction metrics; kind is "prefix" or "slash"
+commands_total = registry.counter("gameclaim_commands_total", "Commands run, by name, kind and result", ("command", "kind", "result"))
+command_seconds = registry.histogram("gameclaim_command_seconds", "Time from invocation to completion", ("command", "kind"))
+interactions_total = registry.counter("gameclaim_interactions_total", "Interactions received, by type", ("type",))
+
+def record_command(name, kind, result, started):
+    commands_total.labels(name, kind, result).inc()
+    if started is not None:
+        command_seconds.labels(name, kind).observe(max(0.0, time.monotonic() - started))
+
+def interaction_started(interaction):
+    """Monotonic start time of an interaction, from Discord's creation timestamp."""
+    age = (datetime.now(timezone.utc) - interaction.created_at).total_seconds()
+    return time.monotonic() - max(0.0, age)
+
 # -----------------------
 # Events
 # -----------------------
@@ -45,8 +66,33 @@ async def on_ready():
     except Exception as e:
         logging.error(f"❌ Sync failed: {e}")
 
+@bot.listen()
+async def on_interaction(interaction):
+    interactions_total.labels(interaction.type.name).inc()
+
+@bot.listen()
+async def on_command(ctx):
+    ctx.metrics_started = time.monotonic()
+
+@bot.listen()
+async def on_command_completion(ctx):
+    record_command(ctx.command.qualified_name, "prefix", "ok", getattr(ctx, "metrics_started", None))
+
+@bot.listen()
+async def on_app_command_completion(interaction, command):
+    record_command(command.qualified_name, "slash", "ok", interaction_started(interaction))
+
+@bot.tree.error
+async def on_app_command_error(interaction, error):
+    name = interaction.command.qualified_name if interaction.command else "unknown"
+    record_command(name, "slash", type(error).__name__, interaction_started(interaction))
+    logging.error(f"❌ Error in slash command {name}: {error}", exc_info=error)
+
 @bot.event
 async def on_command_error(ctx, error):
+    if ctx.command is not None:
+        record_command(ctx.command.qualified_name, "prefix", type(error).__name__, getattr(ctx, "metrics_started", None))
+
     if isinstance(error, commands.CommandNotFound):
         # User made a typo or used an invalid command - show help
         # Check if the message starts with the prefix to avoid random replies
@@ -70,17 +116,90 @@ async def on_command_error(ctx, error):
         except:
             pass
 
+# -----------------------
+# Warm start
+# -----------------------
+# The snapshot is rewritten this often; the DB mirrors are re-read this often once a
+# read has succeeded (a failed read is retried at the next snapshot)
+SNAPSHOT_INTERVAL = 5 * 60
+MIRROR_REFRESH_INTERVAL = 60 * 60
+
+async def save_snapshot():
+    try:
+        # Only the section exports run on the loop; encoding the mirrors and the write do not
+        sections = warm_snapshot.export()
+        await asyncio.to_thread(warm_snapshot.save, sections)
+    except Exception as e:
+        logging.error(f"❌ Failed to save warm-start snapshot: {e}")
+
+async def keep_warm_state():
+    """Refresh the DB mirrors behind the snapshot-loaded state, retry failed sent-game
+    inserts, and keep the snapshot current."""
+    refreshed_at = None
+    while True:
+        if refreshed_at is None or time.monotonic() - refreshed_at > MIRROR_REFRESH_INTERVAL:
+            if await refresh_mirrors():
+                refreshed_at = time.monotonic()
+        await record_unrecorded_sent()
+        await asyncio.sleep(SNAPSHOT_INTERVAL)
+        await save_snapshot()
+
+# Finished interaction traces are pushed to the OTLP collector this often (when one is configured)
+TRACE_EXPORT_INTERVAL = 10
+
+async def export_traces():
+    while True:
+        await asyncio.sleep(TRACE_EXPORT_INTERVAL)
+        await tracer.flush(bot.http_client.session)
+
 async def main():
-    # Load cogs
-    for filename in os.listdir("./cogs"):
-        if filename.endswith(".py") and not filename.startswith("_"):
-            try:
-                await bot.load_extension(f"cogs.{filename[:-3]}")
-                logging.info(f"✅ Loaded cog: {filename}")
-            except Exception as e:
-                logging.error(f"❌ Failed to load cog {filename}: {e}", exc_info=True)
-
-    await bot.start(TOKEN)
+    # Shared outbound HTTP client; cogs borrow it, it is closed only on shutdown
+    bot.http_client = HttpClient()
+    await bot.http_client.start()
+
+    # Health, readiness and metrics endpoints, on this event loop
+    health = HealthServer(bot)
+    try:
+        await health.start()
+    except OSError as e:
+        logging.error(f"❌ Health server could not start: {e}")
+
+    # Restore hot state before any cog or loop starts
+    try:
+        if await asyncio.to_thread(warm_snapshot.load):
+            logging.info("✅ Loaded warm-start snapshot.")
+    except Exception as e:
+        logging.error(f"❌ Failed to load warm-start snapshot: {e}")
+    warm_task = None
+    trace_task = None
+
+    try:
+        # Load cogs
+        for filename in os.listdir("./cogs"):
+            if filename.endswith(".py") and not filename.startswith("_"):
+                try:
+                    await bot.load_extension(f"cogs.{filename[:-3]}")
+                    logging.info(f"✅ Loaded cog: {filename}")
+                except Exception as e:
+                    logging.error(f"❌ Failed to load cog {filename}: {e}", exc_info=True)
+
+        warm_task = asyncio.create_task(keep_warm_state())
+        if tracer.endpoint:
+            trace_task = asyncio.create_task(export_traces())
+        await bot.start(TOKEN)
+    finally:
+        if warm_task is not None:
+            warm_task.cancel()
+        await save_snapshot()
+        if not bot.is_closed():
+            await bot.close()
+        if trace_task is not None:
+            trace_task.cancel()
+            await tracer.flush(bot.http_client.session)
+        await health.close()
+        await bot.http_client.close()
+        await close_db()
+        await cache.close()
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,435 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit, unquote
+
+from utils.executor import BoundedExecutor
+from utils.metrics import registry
+
+# "memory" (default), "sqlite" for a cache that survives restarts, or "redis" to share it
+# between processes (any server speaking the Redis protocol)
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").lower()
+CACHE_PATH = os.getenv("CACHE_PATH", "data/cache.db")
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# Redis keys are "<prefix>:<namespace>:<key>"
+KEY_PREFIX = "gameclaim"
+# After a failed Redis connect, calls miss immediately for this long instead of reconnecting
+REDIS_RETRY_SECONDS = 5
+REDIS_TIMEOUT = 2
+
+cache_requests = registry.counter("gameclaim_cache_requests_total", "Cache lookups by result (hit, miss, error)", ("namespace", "result"))
+cache_evictions = registry.counter("gameclaim_cache_evictions_total", "Entries evicted to stay within a namespace's size limit", ("namespace",))
+
+
+class CacheError(Exception):
+    """The cache backend could not serve a call."""
+
+
+# -----------------------
+# Backends
+# -----------------------
+# A backend stores JSON-able values under (namespace, key) with an absolute expiry
+# (unix time, or None) and implements get/set/delete/clear/close as coroutines.
+# set() returns how many entries it evicted to respect `max_entries`.
+
+
+class MemoryCacheBackend:
+    """Per-process dicts in LRU order. Values are stored as given, not copied."""
+
+    name = "memory"
+
+    def __init__(self):
+        self._data = {}  # namespace -> OrderedDict key -> (value, expires_at)
+
+    async def get(self, namespace, key):
+        entries = self._data.get(namespace)
+        if not entries or key not in entries:
+            return None, False
+        value, expires_at = entries[key]
+        if expires_at is not None and expires_at <= time.time():
+            del entries[key]
+            return None, False
+        entries.move_to_end(key)
+        return value, True
+
+    async def set(self, namespace, key, value, expires_at, max_entries):
+        entries = self._data.setdefault(namespace, OrderedDict())
+        entries[key] = (value, expires_at)
+        entries.move_to_end(key)
+        evicted = 0
+        if max_entries:
+            while len(entries) > max_entries:
+                entries.popitem(last=False)
+                evicted += 1
+        return evicted
+
+    async def delete(self, namespace, key):
+        entries = self._data.get(namespace)
+        if entries:
+            entries.pop(key, None)
+
+    async def clear(self, namespace):
+        self._data.pop(namespace, None)
+
+    def size(self, namespace):
+        return len(self._data.get(namespace) or ())
+
+    async def close(self):
+        self._data.clear()
+
+
+class SQLiteCacheBackend:
+    """One SQLite table in WAL mode; survives restarts. LRU order is the last access time."""
+
+    name = "sqlite"
+
+    # Size limits are enforced every this many sets per namespace, not on every write
+    TRIM_EVERY = 32
+
+    def __init__(self, path, max_workers=4):
+        self.path = path
+        self.executor = BoundedExecutor("cache", max_workers=max_workers)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+        self._sets = {}
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS cache (namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,"
+                    " expires_at REAL, accessed_at REAL NOT NULL, PRIMARY KEY (namespace, key))"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS cache_lru ON cache (namespace, accessed_at)")
+            with self._lock:
+                self._connections.append(conn)
+            self._local.conn = conn
+        return conn
+
+    def _get(self, namespace, key):
+        conn = self._connection()
+        now = time.time()
+        row = conn.execute(
+            "SELECT value, expires_at FROM cache WHERE namespace = ? AND key = ?", (namespace, key)
+        ).fetchone()
+        if row is None:
+            return None, False
+        if row[1] is not None and row[1] <= now:
+            with conn:
+                conn.execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (namespace, key))
+            return None, False
+        with conn:
+            conn.execute("UPDATE cache SET accessed_at = ? WHERE namespace = ? AND key = ?", (now, namespace, key))
+        return json.loads(row[0]), True
+
+    def _set(self, namespace, key, payload, expires_at, max_entries, trim):
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "INSERT INTO cache (namespace, key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value,"
+                " expires_at = excluded.expires_at, accessed_at = excluded.accessed_at",
+                (namespace, key, payload, expires_at, time.time()),
+            )
+            if not trim:
+                return 0
+            conn.execute("DELETE FROM cache WHERE namespace = ? AND expires_at <= ?", (namespace, time.time()))
+            if not max_entries:
+                return 0
+            return conn.execute(
+                "DELETE FROM cache WHERE namespace = ? AND key IN (SELECT key FROM cache WHERE namespace = ?"
+                " ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (namespace, namespace, max_entries),
+            ).rowcount
+
+    def _delete(self, namespace, key=None):
+        conn = self._connection()
+        with conn:
+            if key is None:
+                conn.execute("DELETE FROM cache WHERE namespace = ?", (namespace,))
+            else:
+                conn.execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (namespace, key))
+
+    async def get(self, namespace, key):
+        return await self.executor.run(self._get, namespace, key)
+
+    async def set(self, namespace, key, value, expires_at, max_entries):
+        count = self._sets[namespace] = self._sets.get(namespace, 0) + 1
+        payload = json.dumps(value, separators=(",", ":"))
+        return await self.executor.run(self._set, namespace, key, payload, expires_at, max_entries, count % self.TRIM_EVERY == 0)
+
+    async def delete(self, namespace, key):
+        await self.executor.run(self._delete, namespace, key)
+
+    async def clear(self, namespace):
+        await self.executor.run(self._delete, namespace)
+
+    async def close(self):
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
+        self._local = threading.local()
+        self.executor.shutdown()
+
+
+class RedisCacheBackend:
+    """Minimal Redis protocol (RESP2) client over one connection: GET, SET PX, DEL, SCAN.
+
+    Size limits are left to the server's maxmemory policy (e.g. allkeys-lru); entries
+    expire through Redis TTLs.
+    """
+
+    name = "redis"
+
+    def __init__(self, url):
+        parts = urlsplit(url)
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 6379
+        self.password = unquote(parts.password) if parts.password else None
+        self.username = unquote(parts.username) if parts.username else None
+        self.db = int(parts.path.lstrip("/") or 0)
+        self._reader = None
+        self._writer = None
+        self._lock = asyncio.Lock()
+        self._retry_at = 0.0
+
+    async def _connect(self):
+        if time.monotonic() < self._retry_at:
+            raise CacheError("redis unavailable")
+        try:
+            self._reader, self._writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port), REDIS_TIMEOUT)
+            if self.password:
+                auth = ("AUTH", self.username, self.password) if self.username else ("AUTH", self.password)
+                await self._roundtrip(*auth)
+            if self.db:
+                await self._roundtrip("SELECT", self.db)
+        except (OSError, asyncio.TimeoutError, CacheError) as e:
+            self._drop()
+            self._retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+            print(f"⚠️ Redis cache unavailable at {self.host}:{self.port}: {e!r}")
+            raise CacheError(str(e)) from e
+
+    def _drop(self):
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    @staticmethod
+    def _encode(args):
+        out = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+            out.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(out)
+
+    async def _read_reply(self):
+        line = await self._reader.readline()
+        if not line:
+            raise ConnectionError("connection closed")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body.decode()
+        if kind == b"-":
+            raise CacheError(body.decode())
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            length = int(body)
+            if length < 0:
+                return None
+            data = await self._reader.readexactly(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(body)
+            return None if length < 0 else [await self._read_reply() for _ in range(length)]
+        raise CacheError(f"unexpected reply {line!r}")
+
+    async def _roundtrip(self, *args):
+        self._writer.write(self._encode(args))
+        await self._writer.drain()
+        return await asyncio.wait_for(self._read_reply(), REDIS_TIMEOUT)
+
+    async def command(self, *args):
+        async with self._lock:
+            if self._writer is None:
+                await self._connect()
+            try:
+                return await self._roundtrip(*args)
+            except CacheError:
+                raise
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+                # The reply stream is out of step now; start over on a new connection
+                self._drop()
+                raise CacheError(repr(e)) from e
+
+    @staticmethod
+    def _key(namespace, key):
+        return f"{KEY_PREFIX}:{namespace}:{key}"
+
+    async def get(self, namespace, key):
+        raw = await self.command("GET", self._key(namespace, key))
+        if raw is None:
+            return None, False
+        return json.loads(raw), True
+
+    async def set(self, namespace, key, value, expires_at, max_entries):
+        payload = json.dumps(value, separators=(",", ":"))
+        if expires_at is None:
+            await self.command("SET", self._key(namespace, key), payload)
+        else:
+            ttl_ms = max(1, int((expires_at - time.time()) * 1000))
+            await self.command("SET", self._key(namespace, key), payload, "PX", ttl_ms)
+        return 0
+
+    async def delete(self, namespace, key):
+        await self.command("DEL", self._key(namespace, key))
+
+    async def clear(self, namespace):
+        cursor = b"0"
+        while True:
+            cursor, keys = await self.command("SCAN", cursor, "MATCH", self._key(namespace, "*"), "COUNT", 500)
+            if keys:
+                await self.command("DEL", *keys)
+            if cursor in (b"0", 0):
+                return
+
+    async def close(self):
+        async with self._lock:
+            if self._writer is not None:
+                try:
+                    self._writer.close()
+                    await self._writer.wait_closed()
+                except OSError:
+                    pass
+            self._reader = self._writer = None
+
+
+# -----------------------
+# Cache API
+# -----------------------
+
+
+class CacheNamespace:
+    """One kind of cached data, with its own TTL, size limit and stats.
+
+    Values must be JSON-able so every backend can store them. A backend failure is
+    counted and treated as a miss: the cache never breaks the caller.
+    """
+
+    def __init__(self, cache, name, ttl, max_entries=None):
+        self.cache = cache
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.errors = 0
+        self.evictions = 0
+
+    def _result(self, result):
+        cache_requests.labels(self.name, result).inc()
+
+    async def get(self, key, default=None):
+        try:
+            value, found = await self.cache.backend.get(self.name, str(key))
+        except Exception as e:
+            self.errors += 1
+            self._result("error")
+            if not isinstance(e, CacheError):
+                print(f"❌ Cache get failed ({self.name}): {e!r}")
+            return default
+        if found:
+            self.hits += 1
+            self._result("hit")
+            return value
+        self.misses += 1
+        self._result("miss")
+        return default
+
+    async def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl else None
+        try:
+            evicted = await self.cache.backend.set(self.name, str(key), value, expires_at, self.max_entries)
+        except Exception as e:
+            self.errors += 1
+            if not isinstance(e, CacheError):
+                print(f"❌ Cache set failed ({self.name}): {e!r}")
+            return
+        self.sets += 1
+        if evicted:
+            self.evictions += evicted
+            cache_evictions.labels(self.name).inc(evicted)
+
+    async def delete(self, key):
+        try:
+            await self.cache.backend.delete(self.name, str(key))
+        except Exception:
+            self.errors += 1
+
+    async def clear(self):
+        try:
+            await self.cache.backend.clear(self.name)
+        except Exception:
+            self.errors += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "namespace": self.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "sets": self.sets,
+            "evictions": self.evictions,
+            "errors": self.errors,
+        }
+
+
+class Cache:
+    """Bot-wide cache; modules take a namespace from it instead of keeping their own dicts."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._namespaces = {}
+
+    def namespace(self, name, ttl, max_entries=None):
+        # Reused across cog reloads, so stats carry on and the latest limits apply
+        ns = self._namespaces.get(name)
+        if ns is None:
+            ns = self._namespaces[name] = CacheNamespace(self, name, ttl, max_entries)
+        else:
+            ns.ttl, ns.max_entries = ttl, max_entries
+        return ns
+
+    def stats(self):
+        return [ns.stats() for ns in self._namespaces.values()]
+
+    async def close(self):
+        await self.backend.close()
+
+
+def _create_backend():
+    if CACHE_BACKEND == "sqlite":
+        return SQLiteCacheBackend(CACHE_PATH)
+    if CACHE_BACKEND == "redis":
+        return RedisCacheBackend(REDIS_URL)
+    return MemoryCacheBackend()
+
+
+cache = Cache(_create_backend())
@@ -0,0 +1,263 @@
+import bisect
+import functools
+import json
+import os
+import re
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+from utils.models import SearchHit
+
+DEFAULT_PATH = os.getenv("TITLE_CATALOG_PATH", "data/catalog.json")
+
+# Autocomplete values that refer to a catalog entry instead of free text
+CATALOG_PREFIX = "id:"
+
+# Autocomplete tuning: bound the word-index scan, and only run the fuzzy pass on few literal hits
+WORD_SCAN_LIMIT = 2000
+FUZZY_FILL_BELOW = 5
+
+# Bulk resolution: minimum QRatio for a catalog hit, and query rows scored per cdist call
+RESOLVE_CUTOFF = 90
+RESOLVE_CHUNK = 64
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_title(title):
+    """Lowercase and collapse punctuation, so 'DOOM™: Eternal' and 'doom eternal' compare equal."""
+    return _NON_ALNUM.sub(" ", (title or "").lower()).strip()
+
+
+class TitleCatalog:
+    """Local catalog of CheapShark games keyed by gameID, with a prefix and a fuzzy index.
+
+    Entries are SearchHit models, so they can stand in for a search response. Titles
+    are never merged: two games with the same name stay two entries.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self._entries = {}  # gameID -> entry
+        self._norm = {}     # gameID -> normalized title (fuzzy index choices)
+        self._keys = []     # sorted (normalized title, gameID) for prefix search
+        self._words = []    # sorted (title word, gameID) for word-prefix search
+        self._fuzzy = None  # (gameIDs, normalized titles) as flat lists, rebuilt after changes
+        self._exact = None  # normalized title -> gameID (first one wins), rebuilt after changes
+        self.dirty = False
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, game_id):
+        return self._entries.get(str(game_id))
+
+    def add(self, game_id, title, thumb=None, cheapest=None):
+        if not game_id or not title:
+            return
+        game_id = str(game_id)
+        entry = self._entries.get(game_id)
+        if entry is None:
+            entry = self._entries[game_id] = SearchHit(game_id, title)
+        elif entry.title != title:
+            self._unindex(game_id)
+            entry.title = title
+        else:
+            title = None  # unchanged, index already current
+        if thumb:
+            entry.thumb = thumb
+        if cheapest is not None:
+            entry.cheapest = cheapest
+        if title is not None:
+            norm = self._norm[game_id] = normalize_title(title)
+            bisect.insort(self._keys, (norm, game_id))
+            for word in set(norm.split()):
+                bisect.insort(self._words, (word, game_id))
+            self._fuzzy = self._exact = None
+        self.dirty = True
+
+    def _unindex(self, game_id):
+        norm = self._norm[game_id]
+        self._keys.remove((norm, game_id))
+        for word in set(norm.split()):
+            self._words.remove((word, game_id))
+
+    def add_search_results(self, hits):
+        """Feed parsed CheapShark /games?title= results."""
+        for hit in hits or []:
+            self.add(hit.game_id, hit.title, hit.thumb, hit.cheapest)
+
+    def prefix(self, query, limit=25):
+        norm = normalize_title(query)
+        if not norm:
+            return []
+        start = bisect.bisect_left(self._keys, (norm,))
+        found = []
+        for key, game_id in self._keys[start:]:
+            if not key.startswith(norm) or len(found) >= limit:
+                break
+            found.append(self._entries[game_id])
+        return found
+
+    def word_prefix(self, query, limit=25):
+        """Titles with a word starting with the query's last word and containing its other words."""
+        tokens = normalize_title(query).split()
+        if not tokens:
+            return []
+        last, others = tokens[-1], tokens[:-1]
+        start = bisect.bisect_left(self._words, (last,))
+        found, seen = [], set()
+        for word, game_id in self._words[start:start + WORD_SCAN_LIMIT]:
+            if not word.startswith(last) or len(found) >= limit:
+                break
+            if game_id in seen:
+                continue
+            seen.add(game_id)
+            norm = self._norm[game_id]
+            if all(token in norm for token in others):
+                found.append(self._entries[game_id])
+        return found
+
+    def exact(self, query):
+        norm = normalize_title(query)
+        return [entry for entry in self.prefix(query, limit=50) if self._norm[entry.game_id] == norm]
+
+    def search(self, query, limit=25, score_cutoff=50):
+        """Fuzzy matches as (title, score, entry), best first."""
+        norm = normalize_title(query)
+        if not norm or not self._norm:
+            return []
+        hits = process.extract(norm, self._norm, scorer=fuzz.WRatio, processor=None, limit=limit, score_cutoff=score_cutoff)
+        return [(self._entries[game_id].title, score, self._entries[game_id]) for _, score, game_id in hits]
+
+    def complete(self, query, limit=25):
+        """Autocomplete candidates: title prefix, then word prefix, then typo-tolerant fuzzy hits.
+
+        Built to stay within a few milliseconds for tens of thousands of titles, so the
+        fuzzy fill uses the cheap QRatio scorer rather than WRatio.
+        """
+        if not query:
+            return []
+        results = self.prefix(query, limit)
+        seen = {entry.game_id for entry in results}
+
+        def fill(entries):
+            for entry in entries:
+                if len(results) >= limit:
+                    return
+                if entry.game_id not in seen:
+                    seen.add(entry.game_id)
+                    results.append(entry)
+
+        if len(results) < limit:
+            fill(self.word_prefix(query, limit))
+        if len(results) < FUZZY_FILL_BELOW and self._norm:
+            # Few literal hits, probably a typo
+            ids, titles = self._fuzzy_index()
+            hits = process.extract(normalize_title(query), titles, scorer=fuzz.QRatio, processor=None, limit=limit, score_cutoff=60)
+            fill(self._entries[ids[index]] for _, _, index in hits)
+        return results
+
+    def _fuzzy_index(self):
+        if self._fuzzy is None:
+            self._fuzzy = (list(self._norm.keys()), list(self._norm.values()))
+        return self._fuzzy
+
+    def _exact_index(self):
+        if self._exact is None:
+            exact = {}
+            for game_id, norm in self._norm.items():
+                exact.setdefault(norm, game_id)
+            self._exact = exact
+        return self._exact
+
+    def resolver(self, score_cutoff=RESOLVE_CUTOFF):
+        """resolve_many bound to the current indexes, to run in a worker thread.
+
+        The indexes are built (or reused) here, on the calling thread; later additions
+        replace them instead of changing them, so the worker never sees a catalog mid-update.
+        """
+        return functools.partial(self._resolve, self._entries, self._exact_index(), self._fuzzy_index(), score_cutoff=score_cutoff)
+
+    def resolve_many(self, titles, score_cutoff=RESOLVE_CUTOFF):
+        """Resolve many whole titles at once, e.g. a pasted wishlist.
+
+        Exact normalized titles are looked up directly; the rest are scored against the
+        whole catalog with one rapidfuzz cdist call per chunk. Returns a list parallel to
+        `titles` of (entry, score) or None for titles with no match above the cutoff.
+        """
+        return self.resolver(score_cutoff)(titles)
+
+    @staticmethod
+    def _resolve(entries, exact, fuzzy, titles, score_cutoff=RESOLVE_CUTOFF):
+        results = [None] * len(titles)
+        pending = []
+        for index, title in enumerate(titles):
+            norm = normalize_title(title)
+            if norm in exact:
+                results[index] = (entries[exact[norm]], 100.0)
+            elif norm:
+                pending.append((index, norm))
+
+        ids, choices = fuzzy
+        if pending and choices:
+            for start in range(0, len(pending), RESOLVE_CHUNK):
+                chunk = pending[start:start + RESOLVE_CHUNK]
+                # uint8 scores keep the (chunk x catalog) matrix small
+                scores = process.cdist(
+                    [norm for _, norm in chunk], choices, scorer=fuzz.QRatio, processor=None,
+                    score_cutoff=score_cutoff, dtype=np.uint8, workers=-1
+                )
+                best = scores.argmax(axis=1)
+                for (index, _), column, row in zip(chunk, best, scores):
+                    if row[column]:
+                        results[index] = (entries[ids[column]], float(row[column]))
+        return results
+
+    # -----------------------
+    # Persistence
+    # -----------------------
+
+    def export(self):
+        """Entries as plain dicts. Runs on the event loop, since entries are updated in place."""
+        return [entry.to_json() for entry in self._entries.values()]
+
+    @staticmethod
+    def encode(exported):
+        return json.dumps(exported, separators=(",", ":"))
+
+    def save(self, exported):
+        """Encode and write an export(). Blocking; call through asyncio.to_thread."""
+        self.write(self.encode(exported))
+
+    def load(self):
+        """Load from disk; a missing file leaves the catalog empty."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return
+        self._entries = {}
+        self._norm = {}
+        for data in entries:
+            entry = SearchHit.from_json(data)
+            self._entries[entry.game_id] = entry
+            self._norm[entry.game_id] = normalize_title(entry.title)
+        self._keys = sorted((norm, game_id) for game_id, norm in self._norm.items())
+        self._words = sorted((word, game_id) for game_id, norm in self._norm.items() for word in set(norm.split()))
+        self._fuzzy = self._exact = None
+        self.dirty = False
+
+    def write(self, payload):
+        """Write serialized JSON atomically. Blocking; call through asyncio.to_thread."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(tmp_path, self.path)
+
+
+title_catalog = TitleCatalog()
@@ -1,9 +1,18 @@
 import os
 import traceback
 import asyncio
+import random
+import time
+from collections import deque
 from datetime import datetime, timezone, timedelta
 from dotenv import load_dotenv
-from supabase import create_client
+
+from utils.executor import BoundedExecutor
+from utils.metrics import registry
+from utils.snapshot import warm_snapshot
+from utils.cache import cache
+from utils.tracing import tracer
+from utils.db_backends import SupabaseBackend, SQLiteBackend, NOT_APPLIED, UNKNOWN_OUTCOME
 
 # Load env but don't crash yet if missing (let main handle criticals, though here we need CLIENT)
 load_dotenv()
@@ -11,46 +20,418 @@ load_dotenv()
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
-# Initialize client lazily or immediately? 
-# If we do it here, it might block import, but typically create_client is fast (just config).
-# We will wrap the actual network calls.
-if SUPABASE_URL and SUPABASE_KEY:
-    supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+# "supabase" (default) or "sqlite" for a local database file at SQLITE_PATH
+DB_BACKEND = os.getenv("DB_BACKEND", "supabase").lower()
+SQLITE_PATH = os.getenv("SQLITE_PATH", "data/gameclaim.db")
+
+# Async PostgREST access is the default; DB_ASYNC=0 falls back to supabase-py on DB_THREADS threads
+DB_ASYNC = os.getenv("DB_ASYNC", "1") != "0"
+DB_TIMEOUT = 20
+
+# Per-operation deadlines (seconds), covering every retry and hedge of one call.
+# Interactive calls answer a user, so they give up early instead of stalling a command.
+DEADLINE_INTERACTIVE = 6
+DEADLINE_BACKGROUND = DB_TIMEOUT
+
+# Retries for transient failures, with full-jitter exponential backoff
+DB_RETRIES = 2
+DB_BACKOFF_BASE = 0.2
+DB_BACKOFF_CAP = 2.0
+
+# Hedged reads: a read still running after the recent p95 read latency (bounded below by
+# HEDGE_MIN_DELAY) gets a second request, and the first answer wins. Hedges are capped at
+# HEDGE_BUDGET of all reads so a slow database is not hit twice as hard.
+HEDGE_MIN_DELAY = 0.1
+HEDGE_DEFAULT_DELAY = 0.5
+HEDGE_BUDGET = 0.1
+HEDGE_SAMPLES = 256
+
+# Calls slower than this (whole call, retries included) go to the slow-query log
+DB_SLOW_QUERY_MS = int(os.getenv("DB_SLOW_QUERY_MS", "500"))
+SLOW_QUERY_LOG_SIZE = 50
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_THREADS = int(os.getenv("DB_THREADS", "8"))
+
+# Dedicated pool for blocking DB calls, so they don't queue behind other to_thread users
+db_executor = BoundedExecutor("db", max_workers=DB_THREADS)
+
+if DB_BACKEND == "sqlite":
+    backend = SQLiteBackend(SQLITE_PATH, db_executor)
+    print(f"✅ SQLite database at {SQLITE_PATH}.")
+elif SUPABASE_URL and SUPABASE_KEY:
+    backend = SupabaseBackend(SUPABASE_URL, SUPABASE_KEY, db_executor, use_async=DB_ASYNC, pool_size=DB_POOL_SIZE, timeout=DB_TIMEOUT)
     print("✅ Supabase client initialized.")
 else:
-    supabase = None
+    backend = None
     print("⚠️ Supabase credentials missing. DB features will fail.")
 
+
+async def close_db():
+    """Close the database connections and the DB thread pool (call on shutdown)."""
+    if backend is not None:
+        await backend.close()
+    db_executor.shutdown()
+
+
+def db_backend():
+    return backend.name if backend is not None else "none"
+
+# Keyset pagination for full-table reads: PostgREST truncates unpaged responses at its row limit
+PAGE_SIZE = 500
+GUILD_COLUMNS = "guild_id,channel_id,ping_roles"
+SENT_COLUMNS = "id,guild_id,game_identifier,announced_at"
+
+# Single guild settings rows (admin commands) in the bot-wide cache
+GUILD_CACHE_TTL = 10 * 60
+_guild_cache = cache.namespace("guild_settings", GUILD_CACHE_TTL, 10_000)
+TRACK_COLUMNS = "id,user_id,channel_id,game_name,cheapshark_game_id,track_type,threshold"
+# For schemas from before target-price tracking, which have no threshold column
+TRACK_COLUMNS_LEGACY = "id,user_id,channel_id,game_name,cheapshark_game_id,track_type"
+
+
+class DatabaseError(Exception):
+    """A database call failed after any retries."""
+
+
+class TransientDatabaseError(DatabaseError):
+    """The database was unreachable, busy or too slow; the same call may succeed later."""
+
+
+class PermanentDatabaseError(DatabaseError):
+    """The database rejected the call (constraint, unknown column, auth); retrying will not help."""
+
 # -----------------------
 # Database helper funcs
 # -----------------------
 
-async def run_db(func, *args, **kwargs):
-    """Run a blocking DB call in a separate thread with a timeout."""
-    if supabase is None:
-        return None
+db_stats = {
+    "calls": 0,
+    "retries": 0,
+    "hedges": 0,
+    "hedge_wins": 0,
+    "timeouts": 0,
+    "transient_errors": 0,
+    "permanent_errors": 0,
+}
+_read_latencies = deque(maxlen=HEDGE_SAMPLES)
+_reads = 0
+
+# Per-operation instrumentation, labelled by the helper that issued the call
+query_seconds = registry.histogram("gameclaim_db_query_seconds", "DB call latency including retries", ("op",))
+query_total = registry.counter("gameclaim_db_queries_total", "DB calls by outcome (ok, timeout, transient, permanent)", ("op", "outcome"))
+query_errors = registry.counter("gameclaim_db_errors_total", "Failed DB calls by underlying error class", ("op", "error"))
+query_rows = registry.counter("gameclaim_db_rows_total", "Rows returned by DB calls", ("op",))
+query_retries = registry.counter("gameclaim_db_retries_total", "Retried DB attempts", ("op",))
+query_hedges = registry.counter("gameclaim_db_hedges_total", "Hedged second requests for slow reads", ("op",))
+
+# Most recent slow calls as (unix time, op, seconds, rows, outcome), newest last
+slow_queries = deque(maxlen=SLOW_QUERY_LOG_SIZE)
+
+
+def _backoff(attempt):
+    return random.uniform(0, min(DB_BACKOFF_CAP, DB_BACKOFF_BASE * (2 ** attempt)))
+
+
+def _hedge_delay():
+    if len(_read_latencies) < 20:
+        return HEDGE_DEFAULT_DELAY
+    ordered = sorted(_read_latencies)
+    return max(HEDGE_MIN_DELAY, ordered[int(len(ordered) * 0.95) - 1])
+
+
+def _discard(task):
+    # Retrieve the loser's outcome so asyncio does not log it as never retrieved
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+    task.cancel()
+
+
+async def _hedged(func, args, timeout, op):
+    """Run a read, starting a second copy if the first is slower than usual. First success wins."""
+    started = time.monotonic()
+    first = asyncio.ensure_future(backend.run(func, *args, timeout=timeout))
+    pending = {first}
     try:
-        # Wrap the thread execution in a timeout
-        return await asyncio.wait_for(asyncio.to_thread(func, *args, **kwargs), timeout=20)
-    except asyncio.TimeoutError:
-        print("❌ DB call timed out.")
+        done, pending = await asyncio.wait(pending, timeout=min(_hedge_delay(), timeout))
+        if not done and db_stats["hedges"] < HEDGE_BUDGET * _reads + 1:
+            db_stats["hedges"] += 1
+            query_hedges.labels(op).inc()
+            remaining = max(0.0, timeout - (time.monotonic() - started))
+            second = asyncio.ensure_future(backend.run(func, *args, timeout=remaining))
+            pending.add(second)
+        else:
+            second = None
+
+        error = None
+        while True:
+            for task in done:
+                if task.exception() is None:
+                    if task is second:
+                        db_stats["hedge_wins"] += 1
+                    return task.result()
+                error = error or task.exception()
+            if not pending:
+                raise error
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in pending:
+            _discard(task)
+
+
+def _op_name(func):
+    # Helpers define their query as a nested `_op`, so "is_game_sent.<locals>._op" -> "is_game_sent"
+    return getattr(func, "__qualname__", repr(func)).split(".")[0]
+
+
+async def db_call(func, *args, read=False, idempotent=None, deadline=DEADLINE_BACKGROUND, op=None):
+    """Run a DB operation under a deadline, retrying transient failures.
+
+    `func` receives the backend's client as its first argument and builds the same
+    `table(...).select(...).execute()` chain whichever backend is configured (see
+    utils.db_backends). Failures are classified by the backend: those that never took
+    effect are retried for any call, those with an unknown outcome only for reads and
+    other `idempotent` calls. Reads are also hedged. Raises TransientDatabaseError or
+    PermanentDatabaseError; returns None only when no backend is configured.
+
+    Every call is timed and counted under `op` (by default the name of the helper that
+    defined `func`), and calls over DB_SLOW_QUERY_MS are logged.
+    """
+    if backend is None:
         return None
-    except Exception as e:
-        # Catch connection errors (e.g., bad URL, DNS failure)
+    op = op or _op_name(func)
+    with tracer.span(f"db.{op}"):
+        started = time.monotonic()
+        outcome, rows = "ok", 0
+        try:
+            result = await _call(func, args, read, idempotent, deadline, op)
+            data = getattr(result, "data", None)
+            rows = len(data) if isinstance(data, list) else 0
+            return result
+        except DatabaseError as e:
+            cause = e.__cause__
+            if isinstance(cause, asyncio.TimeoutError):
+                outcome = "timeout"
+            elif isinstance(e, TransientDatabaseError):
+                outcome = "transient"
+            else:
+                outcome = "permanent"
+            query_errors.labels(op, type(cause or e).__name__).inc()
+            raise
+        finally:
+            elapsed = time.monotonic() - started
+            query_seconds.labels(op).observe(elapsed)
+            query_total.labels(op, outcome).inc()
+            if rows:
+                query_rows.labels(op).inc(rows)
+            if elapsed * 1000 >= DB_SLOW_QUERY_MS:
+                slow_queries.append((time.time(), op, elapsed, rows, outcome))
+                print(f"🐢 Slow DB query {op}: {elapsed * 1000:.0f}ms ({rows} rows, {outcome})")
+
+
+async def _call(func, args, read, idempotent, deadline, op):
+    global _reads
+    if idempotent is None:
+        idempotent = read
+    db_stats["calls"] += 1
+    if read:
+        _reads += 1
+    expires = time.monotonic() + deadline
+
+    attempt = 0
+    while True:
+        remaining = expires - time.monotonic()
+        started = time.monotonic()
+        try:
+            if remaining <= 0:
+                raise asyncio.TimeoutError()
+            if read:
+                result = await _hedged(func, args, remaining, op)
+                _read_latencies.append(time.monotonic() - started)
+                return result
+            return await backend.run(func, *args, timeout=remaining)
+        except Exception as e:
+            kind = backend.classify(e)
+            retryable = kind == NOT_APPLIED or (kind == UNKNOWN_OUTCOME and idempotent)
+            delay = _backoff(attempt)
+            if retryable and attempt < DB_RETRIES and time.monotonic() + delay < expires:
+                db_stats["retries"] += 1
+                query_retries.labels(op).inc()
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+            if isinstance(e, asyncio.TimeoutError):
+                db_stats["timeouts"] += 1
+                raise TransientDatabaseError(f"timed out ({deadline}s deadline)") from e
+            if kind in (NOT_APPLIED, UNKNOWN_OUTCOME):
+                db_stats["transient_errors"] += 1
+                raise TransientDatabaseError(str(e) or type(e).__name__) from e
+            db_stats["permanent_errors"] += 1
+            raise PermanentDatabaseError(str(e) or type(e).__name__) from e
+
+
+async def run_db(func, *args, **options):
+    """Like db_call, but logs a failure and returns None instead of raising."""
+    try:
+        return await db_call(func, *args, **options)
+    except DatabaseError as e:
         print(f"❌ DB error: {e}")
         return None
 
+async def _iter_pages(table: str, columns: str, key: str, page_size: int = PAGE_SIZE):
+    """Yield a table in pages of `page_size` rows, ordered by `key` and resumed after the last
+    key seen (keyset pagination). Raises DatabaseError if a page cannot be read."""
+    if backend is None:
+        return
+    last = None
+    while True:
+        def _op(db, after=last):
+            query = db.table(table).select(columns).order(key)
+            if after is not None:
+                query = query.gt(key, after)
+            return query.limit(page_size).execute()
+
+        try:
+            res = await db_call(_op, read=True, op=f"iter_{table}")
+        except DatabaseError as e:
+            raise type(e)(f"reading {table} failed after {key}={last!r}: {e}") from e
+        rows = res.data or []
+        if rows:
+            yield rows
+        if len(rows) < page_size:
+            return
+        last = rows[-1][key]
+
+# -----------------------
+# Local mirrors
+# -----------------------
+
+# guild_settings and sent_games keys are mirrored in memory. The bot is their only
+# writer, so once a mirror has been read in full from the database ("db") it answers on
+# its own, and writes keep it current. A mirror restored from the warm-start snapshot
+# ("snapshot") serves the fan-out until refresh_mirrors() replaces it, but a sent key it
+# lacks still goes to the database, since announcements made after the snapshot was
+# written are missing from it.
+_guild_settings = {}   # guild_id -> row
+_guild_source = None   # None, "snapshot" or "db"
+_sent_keys = {}        # (guild_id, game_identifier) -> announced_at ISO string
+_sent_source = None
+# Announcements whose sent_games insert failed: the key is already in _sent_keys, the
+# row is retried by record_unrecorded_sent()
+_unrecorded_sent = {}  # (guild_id, game_identifier) -> sent_games row
+# Queued rows checked and retried per record_unrecorded_sent() call (bounds the in_ filters)
+SENT_RETRY_BATCH = 100
+
+
+def _export_mirrors():
+    if _guild_source is None and _sent_source is None and not _unrecorded_sent:
+        return None
+    return {
+        "guild_settings": list(_guild_settings.values()) if _guild_source else None,
+        "sent_games": [[guild_id, key, at] for (guild_id, key), at in _sent_keys.items()] if _sent_source else None,
+        "sent_unrecorded": list(_unrecorded_sent.values()),
+    }
+
+
+def _restore_mirrors(data):
+    global _guild_source, _sent_source
+    if data.get("guild_settings") is not None and _guild_source is None:
+        _guild_settings.clear()
+        for row in data["guild_settings"]:
+            _guild_settings[str(row.get("guild_id"))] = row
+        _guild_source = "snapshot"
+    if data.get("sent_games") is not None and _sent_source is None:
+        _sent_keys.clear()
+        for guild_id, key, at in data["sent_games"]:
+            _sent_keys[(guild_id, key)] = at
+        _sent_source = "snapshot"
+    for row in data.get("sent_unrecorded") or []:
+        key = (row["guild_id"], row["game_identifier"])
+        _unrecorded_sent.setdefault(key, row)
+        _sent_keys.setdefault(key, row.get("announced_at"))
+    print(f"✅ Warm start: {len(_guild_settings)} guild settings, {len(_sent_keys)} sent keys.")
+
+
+warm_snapshot.register("database", _export_mirrors, _restore_mirrors)
+
+
+async def refresh_mirrors():
+    """Read guild settings and sent keys in full and swap them in. Returns True on success;
+    on failure the current (possibly snapshot) mirrors stay in use."""
+    global _guild_source, _sent_source
+    if backend is None:
+        return False
+    try:
+        settings = {}
+        async for rows in _iter_pages("guild_settings", GUILD_COLUMNS, "guild_id"):
+            for row in rows:
+                settings[str(row.get("guild_id"))] = row
+        sent = {}
+        async for rows in _iter_pages("sent_games", SENT_COLUMNS, "id"):
+            for row in rows:
+                sent[(str(row.get("guild_id")), row.get("game_identifier"))] = row.get("announced_at")
+    except DatabaseError as e:
+        print(f"⚠️ Mirror refresh failed, keeping current data: {e}")
+        return False
+
+    _guild_settings.clear()
+    _guild_settings.update(settings)
+    _guild_source = "db"
+    # Keys already known locally are kept: they include announcements made while the
+    # refresh was reading, and old ones are dropped by the next cleanup anyway
+    sent.update(_sent_keys)
+    _sent_keys.clear()
+    _sent_keys.update(sent)
+    _sent_source = "db"
+    return True
+
+
+def mirror_stats():
+    return {
+        "guild_settings": len(_guild_settings),
+        "guild_source": _guild_source,
+        "sent_keys": len(_sent_keys),
+        "sent_source": _sent_source,
+        "sent_unrecorded": len(_unrecorded_sent),
+    }
+
+
+async def iter_guild_settings(page_size: int = PAGE_SIZE):
+    """Stream guild settings in pages (lists of rows) with only the columns the fan-out needs.
+
+    Served from the local mirror once it holds data; otherwise read from the database,
+    which also fills the mirror when the read completes.
+    """
+    global _guild_source
+    if _guild_source is not None:
+        rows = list(_guild_settings.values())
+        for start in range(0, len(rows), page_size):
+            yield rows[start:start + page_size]
+        return
+
+    settings = {}
+    async for rows in _iter_pages("guild_settings", GUILD_COLUMNS, "guild_id", page_size):
+        for row in rows:
+            settings[str(row.get("guild_id"))] = row
+        yield rows
+    if backend is not None and _guild_source is None:
+        _guild_settings.update(settings)
+        _guild_source = "db"
+
 async def upsert_guild_setting(guild_id: str, channel_id: str, ping_roles):
     payload = {
         "guild_id": guild_id,
         "channel_id": str(channel_id) if channel_id is not None else "0",
         "ping_roles": ping_roles or []
     }
-    def _op():
-        return supabase.table("guild_settings").upsert(payload).execute()
+    def _op(db):
+        return db.table("guild_settings").upsert(payload).execute()
         
     try:
-        res = await run_db(_op)
+        res = await run_db(_op, idempotent=True, deadline=DEADLINE_INTERACTIVE)
+        if res is not None:
+            row = {key: payload[key] for key in GUILD_COLUMNS.split(",")}
+            if _guild_source is not None:
+                _guild_settings[str(guild_id)] = row
+            await _guild_cache.set(str(guild_id), row)
         return res
     except Exception as e:
         print("❌ upsert_guild_setting error:", e)
@@ -58,22 +439,29 @@ async def upsert_guild_setting(guild_id: str, channel_id: str, ping_roles):
         return None
 
 async def get_all_guild_settings():
-    def _op():
-        return supabase.table("guild_settings").select("*").execute()
     try:
-        res = await run_db(_op)
-        return res.data if getattr(res, "data", None) is not None else []
+        return [row async for rows in iter_guild_settings() for row in rows]
     except Exception as e:
         print("❌ get_all_guild_settings error:", e)
         traceback.print_exc()
         return []
 
 async def get_guild_setting(guild_id: str):
-    def _op():
-        return supabase.table("guild_settings").select("*").eq("guild_id", str(guild_id)).limit(1).execute()
+    """The guild's settings row or None, from the mirror or the cache when they have it."""
+    gid = str(guild_id)
+    if _guild_source == "db":
+        return _guild_settings.get(gid)
+    cached = await _guild_cache.get(gid)
+    if cached is not None:
+        return cached
+
+    def _op(db):
+        return db.table("guild_settings").select("*").eq("guild_id", gid).limit(1).execute()
     try:
-        res = await run_db(_op)
+        res = await run_db(_op, read=True, deadline=DEADLINE_INTERACTIVE)
         rows = res.data if getattr(res, "data", None) is not None else []
+        if rows:
+            await _guild_cache.set(gid, rows[0])
         return rows[0] if rows else None
     except Exception as e:
         print("❌ get_guild_setting error:", e)
@@ -81,10 +469,13 @@ async def get_guild_setting(guild_id: str):
         return None
 
 async def delete_guild_setting(guild_id: str):
-    def _op():
-        return supabase.table("guild_settings").delete().eq("guild_id", str(guild_id)).execute()
+    def _op(db):
+        return db.table("guild_settings").delete().eq("guild_id", str(guild_id)).execute()
     try:
-        res = await run_db(_op)
+        res = await run_db(_op, idempotent=True, deadline=DEADLINE_INTERACTIVE)
+        if res is not None:
+            _guild_settings.pop(str(guild_id), None)
+            await _guild_cache.delete(str(guild_id))
         return res
     except Exception as e:
         print("❌ delete_guild_setting error:", e)
@@ -92,17 +483,26 @@ async def delete_guild_setting(guild_id: str):
         return None
 
 async def is_game_sent(guild_id: str, game_identifier: str):
-    def _op():
-        return supabase.table("sent_games").select("id").eq("guild_id", str(guild_id)).eq("game_identifier", game_identifier).limit(1).execute()
-    try:
-        res = await run_db(_op)
-        rows = res.data if getattr(res, "data", None) is not None else []
-        return len(rows) > 0
-    except Exception as e:
-        print("❌ is_game_sent error:", e)
-        traceback.print_exc()
+    """True if the game was already announced in the guild.
+
+    Raises DatabaseError when that cannot be determined, so a failed lookup is never
+    mistaken for "not sent" and announced twice. Answered locally when the sent-keys
+    mirror knows the key, or holds the whole table.
+    """
+    key = (str(guild_id), game_identifier)
+    if key in _sent_keys:
+        return True
+    if _sent_source == "db":
         return False
 
+    def _op(db):
+        return db.table("sent_games").select("announced_at").eq("guild_id", str(guild_id)).eq("game_identifier", game_identifier).limit(1).execute()
+    res = await db_call(_op, read=True)
+    rows = res.data if getattr(res, "data", None) is not None else []
+    if rows:
+        _sent_keys[key] = rows[0].get("announced_at")
+    return len(rows) > 0
+
 async def mark_game_sent(guild_id: str, game_identifier: str, title: str = None, url: str = None, announced_at=None):
     # normalize announced_at to an ISO8601 string
     announced_at_iso = None
@@ -128,23 +528,97 @@ async def mark_game_sent(guild_id: str, game_identifier: str, title: str = None,
         "announced_at": announced_at_iso
     }
     
-    def _op():
-        return supabase.table("sent_games").insert(payload).execute()
+    def _op(db):
+        return db.table("sent_games").insert(payload).execute()
 
+    # The message is already out: remember it locally first, so a failed insert can
+    # never make the mirror answer "not sent" and announce the game again
+    key = (str(guild_id), game_identifier)
+    _sent_keys[key] = announced_at_iso
+    res = None
     try:
         res = await run_db(_op)
-        return res
     except Exception as e:
         print("❌ mark_game_sent error (insert):", e)
-        return None
+    if res is None and backend is not None:
+        _unrecorded_sent[key] = payload
+    return res
+
+async def record_unrecorded_sent():
+    """Retry the sent_games inserts that failed. Returns how many are still pending.
+
+    A failed insert may still have landed (a timeout), so rows already in the table are
+    dropped from the queue instead of being inserted a second time.
+    """
+    if not _unrecorded_sent or backend is None:
+        return len(_unrecorded_sent)
+    keys = list(_unrecorded_sent)[:SENT_RETRY_BATCH]
+
+    def _op(db):
+        return (db.table("sent_games").select("guild_id,game_identifier")
+                .in_("guild_id", sorted({guild_id for guild_id, _ in keys}))
+                .in_("game_identifier", sorted({game for _, game in keys}))
+                .execute())
+
+    res = await run_db(_op, read=True, op="sent_recorded")
+    if res is None:
+        return len(_unrecorded_sent)
+    recorded = {(str(row["guild_id"]), row["game_identifier"]) for row in res.data or []}
+    for key in recorded.intersection(keys):
+        _unrecorded_sent.pop(key, None)
+    keys = [key for key in keys if key not in recorded]
+    rows = [_unrecorded_sent[key] for key in keys]
+
+    def _op(db, rows):
+        return db.table("sent_games").insert(rows).execute()
+
+    if not rows:
+        return len(_unrecorded_sent)
+    try:
+        await db_call(_op, rows, op="record_unrecorded_sent")
+    except TransientDatabaseError as e:
+        print(f"❌ DB error: {e}")
+        return len(_unrecorded_sent)
+    except PermanentDatabaseError:
+        # One bad row rejects the whole batch: insert them one by one and drop the ones
+        # that can never be written, rather than retrying (and snapshotting) them forever
+        recorded = 0
+        for key, row in zip(keys, rows):
+            try:
+                await db_call(_op, [row], op="record_unrecorded_sent")
+            except TransientDatabaseError:
+                continue
+            except PermanentDatabaseError as e:
+                print(f"❌ Dropped the sent_games row for guild {key[0]} / {key[1]}: {e}")
+            else:
+                recorded += 1
+            _unrecorded_sent.pop(key, None)
+        if recorded:
+            print(f"✅ Recorded {recorded} announcements whose first insert failed.")
+        return len(_unrecorded_sent)
+    for key in keys:
+        _unrecorded_sent.pop(key, None)
+    print(f"✅ Recorded {len(keys)} announcements whose first insert failed.")
+    return len(_unrecorded_sent)
+
+def _parse_time(value):
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return datetime.max.replace(tzinfo=timezone.utc)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
 
 async def cleanup_sent_games_db(cutoff_days=15):
     # Default changed to 15 days to match README
     cutoff = datetime.now(timezone.utc) - timedelta(days=cutoff_days)
-    def _op():
-        return supabase.table("sent_games").delete().lt("announced_at", cutoff.isoformat()).execute()
+    def _op(db):
+        return db.table("sent_games").delete().lt("announced_at", cutoff.isoformat()).execute()
     try:
-        res = await run_db(_op)
+        res = await run_db(_op, idempotent=True)
+        if res is not None:
+            for key, at in list(_sent_keys.items()):
+                if _parse_time(at) < cutoff:
+                    del _sent_keys[key]
         return res
     except Exception as e:
         print("❌ cleanup_sent_games_db error:", e)
@@ -155,8 +629,42 @@ async def cleanup_sent_games_db(cutoff_days=15):
 # Game Tracking Functions
 # -----------------------
 
-async def add_tracked_game(user_id: str, channel_id: str, game_id: str, game_name: str, track_type: str = "sale"):
-    """Add a game to track for a user. Only one game per user allowed."""
+# Per-user cache of tracked_games rows: user_id -> list of rows.
+# Kept coherent by the write helpers below. It is complete (holds every user) after
+# get_all_tracked_games() has loaded the whole table, until a write cannot be applied locally.
+_user_tracks = {}
+_track_users = {}  # track id -> user_id, for removals by id
+_tracks_cache_complete = False
+
+
+def _cache_user_tracks(user_id: str, rows):
+    for row in _user_tracks.get(user_id, []):
+        _track_users.pop(row.get("id"), None)
+    _user_tracks[user_id] = list(rows)
+    for row in rows:
+        _track_users[row.get("id")] = user_id
+
+
+def _uncache_track_ids(track_ids):
+    for track_id in track_ids:
+        user_id = _track_users.pop(track_id, None)
+        if user_id in _user_tracks:
+            _user_tracks[user_id] = [row for row in _user_tracks[user_id] if row.get("id") != track_id]
+
+
+def _invalidate_tracks_cache(user_id: str = None):
+    global _tracks_cache_complete
+    _tracks_cache_complete = False
+    if user_id is not None:
+        for row in _user_tracks.pop(user_id, []):
+            _track_users.pop(row.get("id"), None)
+
+
+async def add_tracked_game(user_id: str, channel_id: str, game_id: str, game_name: str, track_type: str = "sale", threshold: float = None):
+    """Add a game to track for a user. Only one game per user allowed.
+
+    track_type is "sale", "atl" or "below"; "below" needs a USD `threshold`.
+    """
     payload = {
         "user_id": str(user_id),
         "channel_id": str(channel_id),
@@ -165,40 +673,129 @@ async def add_tracked_game(user_id: str, channel_id: str, game_id: str, game_nam
         "track_type": track_type,
         "created_at": datetime.now(timezone.utc).isoformat()
     }
+    if threshold is not None:
+        # Only sent for "below" tracks so older schemas without the column keep working
+        payload["threshold"] = threshold
     
-    def _op():
+    def _op(db):
         # For regular users, the cog will handle the limit. 
         # For owners, multiple entries are allowed.
-        return supabase.table("tracked_games").insert(payload).execute()
+        return db.table("tracked_games").insert(payload).execute()
     
     try:
-        res = await run_db(_op)
+        res = await run_db(_op, deadline=DEADLINE_INTERACTIVE)
+        uid = str(user_id)
+        rows = getattr(res, "data", None) if res is not None else None
+        if rows and (uid in _user_tracks or _tracks_cache_complete):
+            _cache_user_tracks(uid, _user_tracks.get(uid, []) + rows)
+        elif res is not None:
+            _invalidate_tracks_cache(uid)
         return res
     except Exception as e:
         print(f"❌ add_tracked_game error: {e}")
         traceback.print_exc()
         return None
 
-async def get_all_tracked_games():
-    """Get all tracked games from database."""
-    def _op():
-        return supabase.table("tracked_games").select("*").execute()
-    
+async def add_tracked_games(user_id: str, channel_id: str, games, track_type: str = "sale", threshold: float = None):
+    """Add several games to track for a user in one insert. `games` is a list of (game_id, game_name)."""
+    created_at = datetime.now(timezone.utc).isoformat()
+    payload = []
+    for game_id, game_name in games:
+        row = {
+            "user_id": str(user_id),
+            "channel_id": str(channel_id),
+            "game_name": game_name,
+            "cheapshark_game_id": game_id,
+            "track_type": track_type,
+            "created_at": created_at
+        }
+        if threshold is not None:
+            row["threshold"] = threshold
+        payload.append(row)
+    if not payload:
+        return None
+
+    def _op(db):
+        return db.table("tracked_games").insert(payload).execute()
+
     try:
-        res = await run_db(_op)
-        return res.data if getattr(res, "data", None) is not None else []
+        res = await run_db(_op, deadline=DEADLINE_INTERACTIVE)
+        uid = str(user_id)
+        rows = getattr(res, "data", None) if res is not None else None
+        if rows and (uid in _user_tracks or _tracks_cache_complete):
+            _cache_user_tracks(uid, _user_tracks.get(uid, []) + rows)
+        elif res is not None:
+            _invalidate_tracks_cache(uid)
+        return res
     except Exception as e:
-        print(f"❌ get_all_tracked_games error: {e}")
+        print(f"❌ add_tracked_games error: {e}")
         traceback.print_exc()
-        return []
+        return None
+
+_track_columns = None
+
+async def _get_track_columns():
+    """Columns to read from tracked_games, probing once whether the threshold column exists."""
+    global _track_columns
+    if _track_columns is None:
+        def _probe(db, columns):
+            return db.table("tracked_games").select(columns).limit(1).execute()
+        try:
+            await db_call(_probe, "threshold", read=True)
+            _track_columns = TRACK_COLUMNS
+        except PermanentDatabaseError:
+            # The database answered and rejected the column: a schema from before target-price tracking
+            print("⚠️ tracked_games has no threshold column; reading without it.")
+            _track_columns = TRACK_COLUMNS_LEGACY
+        except DatabaseError:
+            # Database unreachable; decide on the next read
+            return TRACK_COLUMNS
+    return _track_columns
+
+async def threshold_tracking_supported():
+    """False when tracked_games predates target-price tracking and has no threshold column."""
+    return await _get_track_columns() != TRACK_COLUMNS_LEGACY
+
+async def iter_tracked_games(page_size: int = PAGE_SIZE):
+    """Stream tracked games in pages (lists of rows) with only the columns the tracker needs.
+
+    A read that reaches the end of the table also refreshes the per-user cache.
+    Raises DatabaseError if a page cannot be read.
+    """
+    global _tracks_cache_complete
+    by_user = {}
+    async for rows in _iter_pages("tracked_games", await _get_track_columns(), "id", page_size):
+        for row in rows:
+            by_user.setdefault(str(row.get("user_id")), []).append(row)
+        yield rows
+
+    if backend is not None:
+        _user_tracks.clear()
+        _track_users.clear()
+        for uid, user_rows in by_user.items():
+            _cache_user_tracks(uid, user_rows)
+        _tracks_cache_complete = True
+
+async def get_all_tracked_games(use_cache: bool = False):
+    """Get all tracked games from database.
+
+    With use_cache, answers from the per-user cache when it holds the whole table.
+    A successful full read refreshes that cache. Raises DatabaseError if the table
+    cannot be read, so a failed read is never mistaken for an empty one.
+    """
+    if use_cache and _tracks_cache_complete:
+        return [row for rows in _user_tracks.values() for row in rows]
+    return [row async for rows in iter_tracked_games() for row in rows]
 
 async def remove_tracked_game(user_id: str):
     """Remove tracked game for a user."""
-    def _op():
-        return supabase.table("tracked_games").delete().eq("user_id", str(user_id)).execute()
+    def _op(db):
+        return db.table("tracked_games").delete().eq("user_id", str(user_id)).execute()
     
     try:
-        res = await run_db(_op)
+        res = await run_db(_op, idempotent=True, deadline=DEADLINE_INTERACTIVE)
+        if res is not None:
+            _cache_user_tracks(str(user_id), [])
         return res
     except Exception as e:
         print(f"❌ remove_tracked_game error: {e}")
@@ -206,13 +803,22 @@ async def remove_tracked_game(user_id: str):
         return None
 
 async def get_user_tracked_games(user_id: str):
-    """Get all tracked games for a specific user."""
-    def _op():
-        return supabase.table("tracked_games").select("*").eq("user_id", str(user_id)).execute()
+    """Get all tracked games for a specific user (served from the per-user cache when present)."""
+    uid = str(user_id)
+    if uid in _user_tracks:
+        return list(_user_tracks[uid])
+    if _tracks_cache_complete:
+        return []
+
+    def _op(db):
+        return db.table("tracked_games").select("*").eq("user_id", uid).execute()
     
     try:
-        res = await run_db(_op)
-        return res.data if getattr(res, "data", None) is not None else []
+        res = await run_db(_op, read=True, deadline=DEADLINE_INTERACTIVE)
+        rows = res.data if getattr(res, "data", None) is not None else []
+        if res is not None:
+            _cache_user_tracks(uid, rows)
+        return rows
     except Exception as e:
         print(f"❌ get_user_tracked_games error: {e}")
         traceback.print_exc()
@@ -220,14 +826,34 @@ async def get_user_tracked_games(user_id: str):
 
 async def remove_tracked_game_by_id(track_id: int):
     """Remove a specific tracked game by its internal ID."""
-    def _op():
-        return supabase.table("tracked_games").delete().eq("id", track_id).execute()
+    def _op(db):
+        return db.table("tracked_games").delete().eq("id", track_id).execute()
     
     try:
-        res = await run_db(_op)
+        res = await run_db(_op, idempotent=True, deadline=DEADLINE_INTERACTIVE)
+        if res is not None:
+            _uncache_track_ids([track_id])
         return res
     except Exception as e:
         print(f"❌ remove_tracked_game_by_id error: {e}")
         traceback.print_exc()
         return None
 
+async def remove_tracked_games_by_ids(track_ids):
+    """Remove several tracked games in one request."""
+    ids = [int(track_id) for track_id in track_ids]
+    if not ids:
+        return None
+
+    def _op(db):
+        return db.table("tracked_games").delete().in_("id", ids).execute()
+
+    try:
+        res = await run_db(_op, idempotent=True)
+        if res is not None:
+            _uncache_track_ids(ids)
+        return res
+    except Exception as e:
+        print(f"❌ remove_tracked_games_by_ids error: {e}")
+        traceback.print_exc()
+        return None
@@ -0,0 +1,439 @@
+import asyncio
+import inspect
+import json
+import os
+import sqlite3
+import threading
+
+# -----------------------
+# Backend interface
+# -----------------------
+# A backend runs `func(client, *args)` where `func` builds a PostgREST-style chain:
+#   client.table(name).select(...).eq(...).order(...).limit(...).execute()
+# and returns an object with a `.data` list of row dicts. utils.database only talks to
+# backends through run(), classify() and close().
+
+# classify() sorts a failure into one of these, which decides whether it is retried
+NOT_APPLIED = "not_applied"          # failed before taking effect (connect error, lock, rollback): any op may retry
+UNKNOWN_OUTCOME = "unknown_outcome"  # may or may not have taken effect (timeout, 5xx): only idempotent ops retry
+PERMANENT = "permanent"              # the request itself is wrong (constraint, bad column, auth): never retried
+
+# Postgres SQLSTATEs that roll the statement back and are worth retrying
+_PG_RETRY_STATES = {"40001", "40P01", "55P03", "57014", "57P01", "57P02", "57P03"}
+_PG_RETRY_CLASSES = ("08", "53")
+
+
+class SupabaseBackend:
+    """Supabase over async PostgREST (pooled httpx), or supabase-py on a thread pool."""
+
+    def __init__(self, url, key, executor, use_async=True, pool_size=20, timeout=20):
+        from supabase import create_client
+
+        self.url = url
+        self.key = key
+        self.executor = executor
+        self.use_async = use_async
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.client = create_client(url, key)
+        self._async_client = None
+
+    @property
+    def name(self):
+        return "postgrest-async" if self.use_async else "supabase-threads"
+
+    def _get_async_client(self):
+        """Async PostgREST client over a pooled httpx connection, created on first use."""
+        if self._async_client is None and self.use_async:
+            try:
+                import httpx
+                from postgrest import AsyncPostgrestClient
+            except ImportError:
+                print("⚠️ Async PostgREST client unavailable; using the thread pool for DB calls.")
+                self.use_async = False
+                return None
+            base_url = f"{self.url.rstrip('/')}/rest/v1"
+            headers = {
+                "apikey": self.key,
+                "Authorization": f"Bearer {self.key}",
+                "Accept": "application/json",
+                "Content-Type": "application/json",
+            }
+            http = httpx.AsyncClient(
+                base_url=base_url,
+                headers=headers,
+                timeout=httpx.Timeout(self.timeout, connect=5),
+                limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size, keepalive_expiry=60),
+                follow_redirects=True,
+            )
+            self._async_client = AsyncPostgrestClient(base_url, headers=headers, http_client=http)
+        return self._async_client
+
+    async def run(self, func, *args, timeout=None, **kwargs):
+        client = self._get_async_client()
+        if client is not None:
+            result = func(client, *args, **kwargs)
+            if inspect.isawaitable(result):
+                result = await asyncio.wait_for(result, timeout=timeout)
+            return result
+        return await self.executor.run(func, self.client, *args, timeout=timeout, **kwargs)
+
+    def classify(self, exc):
+        if isinstance(exc, asyncio.TimeoutError):
+            return UNKNOWN_OUTCOME
+        try:
+            import httpx
+            from postgrest.exceptions import APIError
+        except ImportError:
+            httpx = APIError = None
+
+        if APIError is not None and isinstance(exc, APIError):
+            code = str(exc.code or "")
+            if code.isdigit():
+                # No PostgREST body, just an HTTP status (usually a gateway error page)
+                status = int(code)
+                if status == 429:
+                    return NOT_APPLIED
+                return UNKNOWN_OUTCOME if status >= 500 else PERMANENT
+            if code.startswith("PGRST00"):
+                # PostgREST could not reach Postgres or get a pooled connection
+                return NOT_APPLIED
+            if code in _PG_RETRY_STATES or code.startswith(_PG_RETRY_CLASSES):
+                return NOT_APPLIED
+            return PERMANENT if code else UNKNOWN_OUTCOME
+
+        if httpx is not None and isinstance(exc, httpx.TransportError):
+            if isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)):
+                return NOT_APPLIED
+            return UNKNOWN_OUTCOME
+        if isinstance(exc, ConnectionRefusedError):
+            return NOT_APPLIED
+        if isinstance(exc, OSError):
+            return UNKNOWN_OUTCOME
+        return PERMANENT
+
+    async def close(self):
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+
+class SQLiteBackend:
+    """Local SQLite file; queries run on the DB thread pool, one connection per thread."""
+
+    name = "sqlite"
+
+    def __init__(self, path, executor):
+        self.path = path
+        self.executor = executor
+        self.client = SQLiteClient(path)
+
+    async def run(self, func, *args, timeout=None, **kwargs):
+        return await self.executor.run(func, self.client, *args, timeout=timeout, **kwargs)
+
+    def classify(self, exc):
+        if isinstance(exc, asyncio.TimeoutError):
+            return UNKNOWN_OUTCOME
+        if isinstance(exc, sqlite3.OperationalError):
+            message = str(exc).lower()
+            if "locked" in message or "busy" in message:
+                # Still locked after busy_timeout; the transaction was rolled back
+                return NOT_APPLIED
+            if "disk i/o" in message or "unable to open" in message:
+                return UNKNOWN_OUTCOME
+        return PERMANENT
+
+    async def close(self):
+        self.client.close()
+
+
+# -----------------------
+# SQLite client
+# -----------------------
+
+# Column types per table. Mirrors the Supabase tables; JSON columns are stored as text.
+SCHEMA = {
+    "guild_settings": {
+        "key": "guild_id",
+        "columns": {
+            "guild_id": "TEXT PRIMARY KEY",
+            "channel_id": "TEXT",
+            "ping_roles": "TEXT",
+        },
+        "json": {"ping_roles"},
+    },
+    "sent_games": {
+        "key": "id",
+        "columns": {
+            "id": "INTEGER PRIMARY KEY AUTOINCREMENT",
+            "guild_id": "TEXT NOT NULL",
+            "game_identifier": "TEXT NOT NULL",
+            "title": "TEXT",
+            "url": "TEXT",
+            "announced_at": "TEXT",
+        },
+        "json": set(),
+    },
+    "tracked_games": {
+        "key": "id",
+        "columns": {
+            "id": "INTEGER PRIMARY KEY AUTOINCREMENT",
+            "user_id": "TEXT NOT NULL",
+            "channel_id": "TEXT",
+            "game_name": "TEXT",
+            "cheapshark_game_id": "TEXT",
+            "track_type": "TEXT",
+            "threshold": "REAL",
+            "created_at": "TEXT",
+        },
+        "json": set(),
+    },
+}
+
+# Indexes for the lookups utils.database makes: the duplicate check on every announcement,
+# the sent_games cleanup, and per-user track reads
+INDEXES = (
+    "CREATE INDEX IF NOT EXISTS sent_games_guild_game ON sent_games (guild_id, game_identifier)",
+    "CREATE INDEX IF NOT EXISTS sent_games_announced_at ON sent_games (announced_at)",
+    "CREATE INDEX IF NOT EXISTS tracked_games_user ON tracked_games (user_id)",
+    "CREATE INDEX IF NOT EXISTS tracked_games_game ON tracked_games (cheapshark_game_id)",
+)
+
+# Prepared statements kept per connection; query shapes are few, so they all stay cached
+STATEMENT_CACHE = 256
+
+
+class SQLiteResponse:
+    """The part of a PostgREST response utils.database reads."""
+    __slots__ = ("data",)
+
+    def __init__(self, data):
+        self.data = data
+
+
+class SQLiteClient:
+    """Blocking SQLite client with a PostgREST-style query builder.
+
+    Every thread gets its own connection. WAL mode lets readers run while a write is in
+    progress, and statements are built from a fixed set of shapes with bound parameters,
+    so sqlite3 reuses the prepared statements from its cache.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def table(self, name):
+        if name not in SCHEMA:
+            raise ValueError(f"unknown table {name!r}")
+        return SQLiteQuery(self, name)
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False, cached_statements=STATEMENT_CACHE)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=10000")
+            with self._lock:
+                if not self._initialized:
+                    self._create_schema(conn)
+                    self._initialized = True
+                self._connections.append(conn)
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _create_schema(conn):
+        with conn:
+            for table, spec in SCHEMA.items():
+                columns = ", ".join(f"{name} {kind}" for name, kind in spec["columns"].items())
+                conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({columns})")
+            for statement in INDEXES:
+                conn.execute(statement)
+
+    def execute(self, sql, rows_params, json_columns):
+        """Run one statement per parameter tuple in a single transaction; returns all rows."""
+        return self.execute_batch([(sql, params) for params in rows_params], json_columns)
+
+    def execute_batch(self, statements, json_columns):
+        """Run (sql, params) pairs in a single transaction; returns all rows."""
+        conn = self._connection()
+        data = []
+        with conn:
+            for sql, params in statements:
+                for row in conn.execute(sql, params).fetchall():
+                    data.append(_decode(row, json_columns))
+        return data
+
+    def close(self):
+        with self._lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._connections = []
+        self._local = threading.local()
+
+
+def _decode(row, json_columns):
+    data = dict(row)
+    for column in json_columns:
+        if data.get(column) is not None:
+            data[column] = json.loads(data[column])
+    return data
+
+
+class SQLiteQuery:
+    """Builds one SQL statement from the PostgREST chain methods utils.database uses."""
+
+    _OPERATORS = {"eq": "=", "neq": "!=", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+
+    def __init__(self, client, table):
+        self._client = client
+        self._table = table
+        self._spec = SCHEMA[table]
+        self._action = "select"
+        self._columns = "*"
+        self._payload = None
+        self._where = []
+        self._params = []
+        self._order = None
+        self._limit = None
+
+    def _column(self, name):
+        name = name.strip()
+        if name not in self._spec["columns"]:
+            # Same failure PostgREST gives for an unknown column
+            raise sqlite3.OperationalError(f"no such column: {self._table}.{name}")
+        return name
+
+    # Actions
+
+    def select(self, columns="*"):
+        self._action = "select"
+        if columns.strip() != "*":
+            self._columns = ", ".join(self._column(name) for name in columns.split(","))
+        return self
+
+    def insert(self, payload):
+        self._action = "insert"
+        self._payload = payload
+        return self
+
+    def upsert(self, payload):
+        self._action = "upsert"
+        self._payload = payload
+        return self
+
+    def update(self, payload):
+        self._action = "update"
+        self._payload = payload
+        return self
+
+    def delete(self):
+        self._action = "delete"
+        return self
+
+    # Filters and modifiers
+
+    def _filter(self, op, column, value):
+        self._where.append(f"{self._column(column)} {self._OPERATORS[op]} ?")
+        self._params.append(value)
+        return self
+
+    def eq(self, column, value):
+        return self._filter("eq", column, value)
+
+    def neq(self, column, value):
+        return self._filter("neq", column, value)
+
+    def gt(self, column, value):
+        return self._filter("gt", column, value)
+
+    def gte(self, column, value):
+        return self._filter("gte", column, value)
+
+    def lt(self, column, value):
+        return self._filter("lt", column, value)
+
+    def lte(self, column, value):
+        return self._filter("lte", column, value)
+
+    def in_(self, column, values):
+        values = list(values)
+        if not values:
+            self._where.append("0")
+        else:
+            self._where.append(f"{self._column(column)} IN ({', '.join('?' * len(values))})")
+            self._params.extend(values)
+        return self
+
+    def order(self, column, desc=False):
+        self._order = f"{self._column(column)} {'DESC' if desc else 'ASC'}"
+        return self
+
+    def limit(self, count):
+        self._limit = int(count)
+        return self
+
+    # Execution
+
+    def _encode(self, row):
+        return [
+            json.dumps(value) if column in self._spec["json"] and value is not None else value
+            for column, value in row.items()
+        ]
+
+    def _where_sql(self):
+        return f" WHERE {' AND '.join(self._where)}" if self._where else ""
+
+    def execute(self):
+        table, json_columns = self._table, self._spec["json"]
+
+        if self._action == "select":
+            sql = f"SELECT {self._columns} FROM {table}{self._where_sql()}"
+            if self._order:
+                sql += f" ORDER BY {self._order}"
+            if self._limit is not None:
+                sql += f" LIMIT {self._limit}"
+            return SQLiteResponse(self._client.execute(sql, [self._params], json_columns))
+
+        if self._action == "delete":
+            sql = f"DELETE FROM {table}{self._where_sql()} RETURNING *"
+            return SQLiteResponse(self._client.execute(sql, [self._params], json_columns))
+
+        if self._action == "update":
+            assignments = ", ".join(f"{self._column(column)} = ?" for column in self._payload)
+            sql = f"UPDATE {table} SET {assignments}{self._where_sql()} RETURNING *"
+            return SQLiteResponse(self._client.execute(sql, [self._encode(self._payload) + self._params], json_columns))
+
+        # insert / upsert: one statement shape per set of columns, all rows in one
+        # transaction so a bad row rejects the whole payload, as PostgREST does
+        rows = self._payload if isinstance(self._payload, list) else [self._payload]
+        statements = []
+        for columns, group in _group_by_columns(rows).items():
+            names = [self._column(column) for column in columns]
+            sql = f"INSERT INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})"
+            if self._action == "upsert":
+                key = self._spec["key"]
+                updates = ", ".join(f"{name} = excluded.{name}" for name in names if name != key)
+                sql += f" ON CONFLICT ({key}) DO " + (f"UPDATE SET {updates}" if updates else "NOTHING")
+            sql += " RETURNING *"
+            statements.extend((sql, self._encode(row)) for row in group)
+        return SQLiteResponse(self._client.execute_batch(statements, json_columns))
+
+
+def _group_by_columns(rows):
+    groups = {}
+    for row in rows:
+        groups.setdefault(tuple(row.keys()), []).append(row)
+    return groups
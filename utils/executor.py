@@ -0,0 +1,104 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class BoundedExecutor:
+    """A dedicated thread pool for blocking calls, with its own bound and metrics.
+
+    Unlike asyncio.to_thread on the default executor, callers here do not compete with
+    every other to_thread user, and a call that times out only ties up one of this
+    pool's threads until it returns.
+    """
+
+    def __init__(self, name, max_workers=8):
+        self.name = name
+        self.max_workers = max_workers
+        self._pool = None
+        self._slots = None  # created on first use, inside the running loop
+
+        # Metrics
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.active = 0
+        self.queued = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.run_total = 0.0
+        self.run_max = 0.0
+
+    def _ensure_started(self):
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.name)
+            self._slots = asyncio.Semaphore(self.max_workers)
+
+    async def run(self, func, *args, timeout=None, **kwargs):
+        """Run func(*args, **kwargs) on the pool. Raises asyncio.TimeoutError after `timeout`
+        seconds, counting time spent waiting for a free thread."""
+        self._ensure_started()
+        self.submitted += 1
+        queued_at = time.monotonic()
+        deadline = None if timeout is None else queued_at + timeout
+
+        self.queued += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise
+        finally:
+            self.queued -= 1
+
+        started = time.monotonic()
+        waited = started - queued_at
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._pool, lambda: func(*args, **kwargs))
+        self.active += 1
+
+        def _finished(fut):
+            # Frees the slot when the thread is actually done, even if the caller gave up
+            self.active -= 1
+            elapsed = time.monotonic() - started
+            self.run_total += elapsed
+            self.run_max = max(self.run_max, elapsed)
+            if fut.cancelled() or fut.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+            self._slots.release()
+
+        future.add_done_callback(_finished)
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), remaining)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            self._slots = None
+
+    def stats(self):
+        started = self.completed + self.failed
+        return {
+            "name": self.name,
+            "max_workers": self.max_workers,
+            "active": self.active,
+            "queued": self.queued,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "avg_wait": self.wait_total / self.submitted if self.submitted else 0.0,
+            "max_wait": self.wait_max,
+            "avg_run": self.run_total / started if started else 0.0,
+            "max_run": self.run_max,
+        }
@@ -0,0 +1,130 @@
+import math
+import os
+from datetime import datetime, timezone
+
+from aiohttp import web
+from discord.ext import tasks
+
+from utils.metrics import registry, CONTENT_TYPE
+from utils.tracing import tracer
+from utils import database
+
+HEALTH_HOST = os.getenv("HEALTH_HOST", "0.0.0.0")
+HEALTH_PORT = int(os.getenv("PORT", "8080"))
+
+# /healthz fails when the gateway heartbeat is slower than this (seconds)
+MAX_HEARTBEAT_LATENCY = 15
+# A loop whose iteration is this far past its scheduled start counts as stuck
+# (at least one interval, so long fan-outs on hourly loops are not flagged)
+MIN_STUCK_GRACE = 10 * 60
+
+gateway_latency = registry.gauge("gameclaim_gateway_latency_seconds", "Discord gateway heartbeat latency")
+guild_count = registry.gauge("gameclaim_guilds", "Guilds the bot is in")
+loop_running = registry.gauge("gameclaim_loop_running", "1 while a background loop is running and on schedule", ("loop",))
+
+
+def _interval(loop):
+    return (loop.hours or 0) * 3600 + (loop.minutes or 0) * 60 + (loop.seconds or 0)
+
+
+def loop_states(bot):
+    """(name, state) for every tasks.loop on the loaded cogs; state is ok, starting, stopped, failed or stuck."""
+    now = datetime.now(timezone.utc)
+    states = []
+    for cog_name, cog in bot.cogs.items():
+        for attr, value in vars(type(cog)).items():
+            if not isinstance(value, tasks.Loop):
+                continue
+            loop = getattr(cog, attr)
+            if loop.failed():
+                state = "failed"
+            elif not loop.is_running():
+                state = "stopped"
+            elif loop.next_iteration is None:
+                state = "starting"
+            elif (now - loop.next_iteration).total_seconds() > max(MIN_STUCK_GRACE, _interval(loop)):
+                state = "stuck"
+            else:
+                state = "ok"
+            states.append((f"{cog_name}.{attr}", state))
+    return states
+
+
+class HealthServer:
+    """Liveness, readiness and metrics over HTTP, served on the bot's own event loop.
+
+    /healthz  the gateway is connected and heartbeats are answered
+    /readyz   the bot is ready, the DB mirrors are loaded and every loop runs on schedule
+    /metrics  everything in utils.metrics, in Prometheus text format
+    /traces   recent interaction traces as OTLP/JSON (?command=price.slash to filter)
+    """
+
+    def __init__(self, bot, host=HEALTH_HOST, port=HEALTH_PORT):
+        self.bot = bot
+        self.host = host
+        self.port = port
+        self._runner = None
+
+        self.app = web.Application()
+        self.app.router.add_get("/", self.home)
+        self.app.router.add_get("/healthz", self.healthz)
+        self.app.router.add_get("/readyz", self.readyz)
+        self.app.router.add_get("/metrics", self.metrics)
+        self.app.router.add_get("/traces", self.traces)
+
+    async def start(self):
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        print(f"✅ Health server listening on {self.host}:{self.port}")
+
+    async def close(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def _latency(self):
+        latency = self.bot.latency
+        return None if latency is None or math.isinf(latency) or math.isnan(latency) else latency
+
+    async def home(self, request):
+        return web.Response(text="Bot is alive")
+
+    async def healthz(self, request):
+        latency = self._latency()
+        connected = not self.bot.is_closed() and self.bot.ws is not None and latency is not None
+        healthy = connected and latency <= MAX_HEARTBEAT_LATENCY
+        body = {
+            "status": "ok" if healthy else "unhealthy",
+            "connected": connected,
+            "latency_ms": round(latency * 1000) if latency is not None else None,
+        }
+        return web.json_response(body, status=200 if healthy else 503)
+
+    async def readyz(self, request):
+        mirrors = database.mirror_stats()
+        checks = {
+            "discord": self.bot.is_ready(),
+            # Without a database there is nothing to warm
+            "guild_settings": database.backend is None or mirrors["guild_source"] is not None,
+            "sent_games": database.backend is None or mirrors["sent_source"] is not None,
+        }
+        loops = dict(loop_states(self.bot))
+        checks["loops"] = bool(loops) and all(state == "ok" for state in loops.values())
+        ready = all(checks.values())
+        body = {"status": "ready" if ready else "not ready", "checks": checks, "loops": loops}
+        return web.json_response(body, status=200 if ready else 503)
+
+    async def metrics(self, request):
+        latency = self._latency()
+        if latency is not None:
+            gateway_latency.set(latency)
+        guild_count.set(len(self.bot.guilds))
+        for name, state in loop_states(self.bot):
+            loop_running.labels(name).set(1 if state == "ok" else 0)
+        return web.Response(body=registry.render().encode("utf-8"), headers={"Content-Type": CONTENT_TYPE})
+
+    async def traces(self, request):
+        command = request.query.get("command")
+        recent = [root for root in list(tracer.recent) if command is None or root.name == command]
+        return web.json_response(tracer.to_otlp(recent))
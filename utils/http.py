@@ -0,0 +1,224 @@
+import asyncio
+import logging
+import random
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from utils.breaker import CircuitOpenError, get_breaker
+from utils.ratelimit import limiter as default_limiter, PRIORITY_INTERACTIVE
+from utils.metrics import registry
+from utils.tracing import tracer
+
+# Breaker name per upstream host
+UPSTREAMS = {
+    "www.cheapshark.com": "cheapshark",
+    "api.exchangerate-api.com": "exchangerate",
+    "store-site-backend-static.ak.epicgames.com": "epic",
+    "www.gamerpower.com": "gamerpower",
+}
+
+# Total timeout (seconds) per upstream host
+HOST_TIMEOUTS = {
+    "www.cheapshark.com": 8,
+    "api.exchangerate-api.com": 5,
+    "store-site-backend-static.ak.epicgames.com": 10,
+    "www.gamerpower.com": 10,
+}
+DEFAULT_TIMEOUT = 10
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRIES = 2
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 8.0
+
+# Last good responses kept for serving while a breaker is open
+STALE_CACHE_SIZE = 512
+
+USER_AGENT = "GameClaim-Discord-bot (+https://github.com/vaishnavxd/GameClaim-Discord-bot)"
+
+# Per-attempt upstream metrics, labelled by upstream name (bounded, unlike URLs)
+http_seconds = registry.histogram("gameclaim_http_request_seconds", "Upstream request latency per attempt", ("upstream",))
+http_responses = registry.counter(
+    "gameclaim_http_responses_total", "Upstream attempts by status code, or timeout / connection_error / circuit_open", ("upstream", "status")
+)
+http_coalesced = registry.counter("gameclaim_http_coalesced_total", "Requests that joined an identical in-flight request", ("upstream",))
+http_stale = registry.counter("gameclaim_http_stale_served_total", "Responses served from the stale cache while a circuit was open", ("upstream",))
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one in-flight task."""
+
+    def __init__(self):
+        self._inflight = {}
+        self.coalesced = 0
+
+    async def do(self, key, factory, on_coalesce=None):
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _t: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+            if on_coalesce is not None:
+                on_coalesce()
+        # Shield so one cancelled waiter does not cancel the request for everyone else
+        return await asyncio.shield(task)
+
+
+class HttpClient:
+    """Bot-wide aiohttp client: one pooled session, per-host timeouts, retries, rate limiting
+    and circuit breaking.
+
+    Created once in main.py and attached as `bot.http_client`; cogs borrow it and never close it.
+    """
+
+    def __init__(self, limiter=default_limiter):
+        self.limiter = limiter
+        self._session = None
+        self._flights = SingleFlight()
+        self._stale = OrderedDict()
+
+    async def start(self):
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=20,
+                ttl_dns_cache=300,
+                keepalive_timeout=60,
+                enable_cleanup_closed=True,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=DEFAULT_TIMEOUT),
+                headers={"User-Agent": USER_AGENT},
+            )
+        return self
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    @property
+    def session(self):
+        if self._session is None or self._session.closed:
+            raise RuntimeError("HttpClient is not started")
+        return self._session
+
+    @staticmethod
+    def _backoff(attempt, retry_after=None):
+        if retry_after is not None:
+            return min(BACKOFF_CAP, retry_after)
+        return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * (2 ** attempt)))
+
+    def breaker_for(self, url):
+        host = urlsplit(url).hostname or ""
+        return get_breaker(UPSTREAMS.get(host, host))
+
+    def is_open(self, upstream):
+        """True while the named upstream's breaker rejects calls; background sweeps pause on it."""
+        return get_breaker(upstream).is_open()
+
+    def _remember(self, key, data):
+        self._stale[key] = (data, time.time())
+        self._stale.move_to_end(key)
+        while len(self._stale) > STALE_CACHE_SIZE:
+            self._stale.popitem(last=False)
+
+    async def get_json(self, url, params=None, priority=PRIORITY_INTERACTIVE, retries=MAX_RETRIES, allow_stale=True):
+        """GET `url` and decode JSON. Returns (status, data); data is None unless status is 200.
+
+        See get_json_dated for the details, and use it when a stale response must not be
+        stored as a fresh observation.
+        """
+        status, data, _ = await self.get_json_dated(url, params, priority, retries, allow_stale)
+        return status, data
+
+    async def get_json_dated(self, url, params=None, priority=PRIORITY_INTERACTIVE, retries=MAX_RETRIES, allow_stale=True):
+        """GET `url` and decode JSON. Returns (status, data, stale_at).
+
+        data is None unless status is 200. stale_at is None for a live response, and the
+        unix time the served copy was fetched when it came from the stale cache.
+
+        Identical concurrent requests share one upstream call. Connection errors,
+        timeouts, 429 and 5xx responses are retried with jittered backoff; the last
+        connection error or timeout is re-raised to every waiting caller.
+        While the upstream's breaker is open the last good response is served when
+        `allow_stale` is set, otherwise CircuitOpenError is raised without waiting.
+        Returned data is shared between callers and must not be mutated.
+        """
+        key = (url, tuple(sorted((params or {}).items())))
+        upstream = self.breaker_for(url).name
+        with tracer.span("http.get", upstream=upstream) as span:
+            try:
+                status, data = await self._flights.do(
+                    key, lambda: self._get_json(url, params, priority, retries), http_coalesced.labels(upstream).inc
+                )
+            except CircuitOpenError:
+                http_responses.labels(upstream, "circuit_open").inc()
+                if allow_stale and key in self._stale:
+                    http_stale.labels(upstream).inc()
+                    span.set("stale", True)
+                    data, fetched_at = self._stale[key]
+                    return 200, data, fetched_at
+                raise
+            span.set("http.status_code", status)
+            if status == 200:
+                self._remember(key, data)
+            return status, data, None
+
+    async def _get_json(self, url, params, priority, retries):
+        host = urlsplit(url).hostname or ""
+        timeout = aiohttp.ClientTimeout(total=HOST_TIMEOUTS.get(host, DEFAULT_TIMEOUT))
+        breaker = self.breaker_for(url)
+
+        for attempt in range(retries + 1):
+            breaker.check()
+            started = None
+            try:
+                await self.limiter.acquire(url, priority)
+                started = time.monotonic()
+                async with self.session.get(url, params=params, timeout=timeout) as response:
+                    http_seconds.labels(breaker.name).observe(time.monotonic() - started)
+                    http_responses.labels(breaker.name, response.status).inc()
+                    if response.status == 200:
+                        data = await response.json(content_type=None)
+                        breaker.record_success()
+                        return 200, data
+                    if response.status not in RETRY_STATUSES:
+                        # The upstream answered; a 4xx is the caller's problem, not an outage
+                        breaker.record_success()
+                        return response.status, None
+                    breaker.record_failure()
+                    if attempt == retries:
+                        return response.status, None
+                    retry_after = None
+                    if response.status == 429:
+                        try:
+                            retry_after = float(response.headers.get("Retry-After", ""))
+                        except ValueError:
+                            pass
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if started is not None:
+                    http_seconds.labels(breaker.name).observe(time.monotonic() - started)
+                http_responses.labels(breaker.name, "timeout" if isinstance(e, asyncio.TimeoutError) else "connection_error").inc()
+                breaker.record_failure()
+                if attempt == retries:
+                    raise
+                logging.info(f"HTTP retry {attempt + 1}/{retries} for {host}: {e!r}")
+                retry_after = None
+            except BaseException:
+                # Cancelled or undecodable: no verdict on the upstream's health
+                breaker.abandon()
+                raise
+            await asyncio.sleep(self._backoff(attempt, retry_after))
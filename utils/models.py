@@ -0,0 +1,198 @@
+import time
+from datetime import datetime, timezone
+
+
+def _float(value, default=0.0):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _price_text(value):
+    """GamerPower prices come as "$19.99" or "N/A"."""
+    if isinstance(value, str):
+        value = value.strip().lstrip("$").replace(",", "")
+    return _float(value, None)
+
+
+class SearchHit:
+    """One CheapShark /games?title= result (also a title catalog entry)."""
+    __slots__ = ("game_id", "title", "thumb", "cheapest")
+
+    def __init__(self, game_id, title, thumb=None, cheapest=None):
+        self.game_id = str(game_id)
+        self.title = title
+        self.thumb = thumb
+        self.cheapest = cheapest
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(data.get("gameID"), data.get("external"), data.get("thumb"), _float(data.get("cheapest"), None))
+
+    def to_json(self):
+        data = {"gameID": self.game_id, "external": self.title}
+        if self.thumb:
+            data["thumb"] = self.thumb
+        if self.cheapest is not None:
+            data["cheapest"] = self.cheapest
+        return data
+
+
+class Deal:
+    """One store's offer inside a CheapShark game detail."""
+    __slots__ = ("store_id", "deal_id", "price", "retail_price", "savings")
+
+    def __init__(self, store_id, deal_id, price, retail_price, savings):
+        self.store_id = str(store_id)
+        self.deal_id = deal_id
+        self.price = price
+        self.retail_price = retail_price
+        self.savings = savings
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(
+            data.get("storeID"),
+            data.get("dealID"),
+            _float(data.get("price")),
+            _float(data.get("retailPrice")),
+            _float(data.get("savings")),
+        )
+
+    @property
+    def url(self):
+        return f"https://www.cheapshark.com/redirect?dealID={self.deal_id}" if self.deal_id else None
+
+
+class GameDetail:
+    """A CheapShark /games?id= response with prices parsed."""
+    __slots__ = ("game_id", "title", "thumb", "cheapest_ever", "deals", "fetched_at")
+
+    def __init__(self, game_id, title, thumb, cheapest_ever, deals, fetched_at=None):
+        self.game_id = str(game_id)
+        self.title = title
+        self.thumb = thumb
+        self.cheapest_ever = cheapest_ever
+        self.deals = deals
+        self.fetched_at = time.time() if fetched_at is None else fetched_at
+
+    @classmethod
+    def from_json(cls, game_id, data, fetched_at=None):
+        info = data.get("info") or {}
+        return cls(
+            game_id,
+            info.get("title"),
+            info.get("thumb"),
+            _float((data.get("cheapestPriceEver") or {}).get("price")),
+            [Deal.from_json(deal) for deal in data.get("deals") or []],
+            fetched_at,
+        )
+
+    @property
+    def best_deal(self):
+        """Cheapest deal across all stores, or None."""
+        return min(self.deals, key=lambda deal: deal.price, default=None)
+
+    @property
+    def best_price(self):
+        best = self.best_deal
+        return best.price if best else None
+
+
+class FreeGameOffer:
+    """A free-game giveaway from Epic or GamerPower, ready to announce."""
+    __slots__ = ("platform", "key", "title", "url", "thumb", "description", "worth", "starts_at", "ends_at")
+
+    def __init__(self, platform, key, title, url, thumb=None, description=None, worth=None, starts_at=None, ends_at=None):
+        self.platform = platform
+        self.key = key
+        self.title = title
+        self.url = url
+        self.thumb = thumb
+        self.description = description
+        self.worth = worth          # original price in USD, or None if unknown
+        self.starts_at = starts_at  # aware datetimes, or None
+        self.ends_at = ends_at
+
+    @property
+    def start_iso(self):
+        return self.starts_at.isoformat() if self.starts_at else None
+
+    @classmethod
+    def from_epic(cls, game):
+        """Parse an Epic store element; None when it has no promotional offer."""
+        title = game.get("title", "Unknown")
+        promotions = game.get("promotions")
+        if not promotions:
+            return None
+
+        offers = promotions.get("promotionalOffers", [])
+        if not offers or not offers[0]["promotionalOffers"]:
+            return None
+
+        offer = offers[0]["promotionalOffers"][0]
+        start = datetime.fromisoformat(offer["startDate"].replace("Z", "+00:00"))
+        end = datetime.fromisoformat(offer["endDate"].replace("Z", "+00:00"))
+
+        slug = game.get("productSlug") or game.get("catalogNs", {}).get("mappings", [{}])[0].get("pageSlug", "")
+        link = f"https://store.epicgames.com/en-US/p/{slug}" if slug else "https://store.epicgames.com/"
+
+        price_data = game.get("price", {}).get("totalPrice", {})
+        price = price_data.get("originalPrice", 0) / 100
+
+        images = game.get("keyImages", [])
+        thumb = next((img["url"] for img in images if img.get("type") == "Thumbnail"), images[0]["url"] if images else None)
+
+        return cls("epic", slug or title, title, link, thumb, worth=price, starts_at=start, ends_at=end)
+
+    @classmethod
+    def from_gamerpower(cls, game):
+        try:
+            ends_at = datetime.strptime(game.get("end_date", ""), "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
+        except (TypeError, ValueError):
+            ends_at = None
+        return cls(
+            "steam",
+            str(game.get("id")),
+            game.get("title"),
+            game.get("open_giveaway_url", ""),
+            game.get("thumbnail", ""),
+            game.get("description", "Free on Steam!"),
+            worth=_price_text(game.get("worth")),
+            ends_at=ends_at,
+        )
+
+
+class DealListing:
+    """One row of the CheapShark /deals feed."""
+    __slots__ = ("game_id", "title", "thumb", "store_id", "deal_id", "price", "retail_price", "savings", "deal_rating")
+
+    def __init__(self, game_id, title, thumb, store_id, deal_id, price, retail_price, savings, deal_rating):
+        self.game_id = str(game_id)
+        self.title = title
+        self.thumb = thumb
+        self.store_id = str(store_id)
+        self.deal_id = deal_id
+        self.price = price
+        self.retail_price = retail_price
+        self.savings = savings
+        self.deal_rating = deal_rating
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(
+            data.get("gameID"),
+            data.get("title"),
+            data.get("thumb"),
+            data.get("storeID"),
+            data.get("dealID"),
+            _float(data.get("salePrice")),
+            _float(data.get("normalPrice")),
+            _float(data.get("savings")),
+            _float(data.get("dealRating")),
+        )
+
+    @property
+    def url(self):
+        return f"https://www.cheapshark.com/redirect?dealID={self.deal_id}" if self.deal_id else None
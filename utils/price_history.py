@@ -0,0 +1,226 @@
+import bisect
+import json
+import os
+import struct
+import time
+from array import array
+
+from utils.models import Deal, GameDetail
+
+# On-disk layout (little endian):
+#   magic b"GCPH", u16 version, u32 meta length, meta JSON (utf-8), u32 series count,
+#   then per series: u16 game_id length, game_id, u16 store_id length, store_id,
+#   u32 sample count, int64[count] timestamps, float32[count] prices.
+MAGIC = b"GCPH"
+VERSION = 1
+
+DEFAULT_PATH = os.getenv("PRICE_HISTORY_PATH", "data/price_history.bin")
+
+# Samples older than this are dropped on save
+RETENTION_SECONDS = 400 * 86400
+# A flat price is re-sampled at most this often so series show how long it held
+FLAT_RESAMPLE_SECONDS = 86400
+
+
+class PriceSeries:
+    """Append-only time series for one (game, store) pair, held in typed arrays."""
+    __slots__ = ("times", "prices")
+
+    def __init__(self, times=None, prices=None):
+        self.times = times if times is not None else array("q")
+        self.prices = prices if prices is not None else array("f")
+
+    def __len__(self):
+        return len(self.times)
+
+    def append(self, ts, price):
+        if self.times and abs(self.prices[-1] - price) < 0.005 and ts - self.times[-1] < FLAT_RESAMPLE_SECONDS:
+            return False
+        self.times.append(int(ts))
+        self.prices.append(price)
+        return True
+
+    def low_since(self, since):
+        lows = [p for t, p in zip(self.times, self.prices) if t >= since]
+        return min(lows) if lows else None
+
+    def trim(self, before):
+        keep = bisect.bisect_left(self.times, before)
+        if keep:
+            del self.times[:keep]
+            del self.prices[:keep]
+
+
+class PriceHistory:
+    """Local store of observed CheapShark prices, per game and store.
+
+    Fed from every game-detail response (interactive lookups and the tracker sweep).
+    Besides the series it keeps the latest GameDetail per game, so `/isgood` can be
+    answered without a live fetch while that detail is fresh.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self._series = {}  # (game_id, store_id) -> PriceSeries
+        self._stores = {}  # game_id -> store_ids with a series
+        self._details = {} # game_id -> latest GameDetail
+        self.dirty = False
+
+    def __len__(self):
+        return len(self._details)
+
+    def record(self, detail):
+        """Record a parsed GameDetail."""
+        if detail is None:
+            return
+        ts = int(detail.fetched_at)
+        game_id = detail.game_id
+        for deal in detail.deals:
+            series = self._series.get((game_id, deal.store_id))
+            if series is None:
+                series = self._series[(game_id, deal.store_id)] = PriceSeries()
+                self._stores.setdefault(game_id, []).append(deal.store_id)
+            series.append(ts, deal.price)
+        self._details[game_id] = detail
+        self.dirty = True
+
+    def snapshot(self, game_id, max_age):
+        """The latest GameDetail, or None if missing or older than max_age."""
+        detail = self._details.get(str(game_id))
+        if detail is None or time.time() - detail.fetched_at > max_age:
+            return None
+        return detail
+
+    def cheapest_ever(self, game_id):
+        """All-time low from the latest recorded detail, regardless of its age, or None."""
+        detail = self._details.get(str(game_id))
+        return detail.cheapest_ever if detail and detail.cheapest_ever > 0 else None
+
+    def _game_series(self, game_id):
+        game_id = str(game_id)
+        return [self._series[(game_id, store_id)] for store_id in self._stores.get(game_id, [])]
+
+    def low(self, game_id, days=365, now=None):
+        """Lowest price seen for a game across all stores in the last `days` days, or None."""
+        now = time.time() if now is None else now
+        since = now - days * 86400
+        lows = [low for series in self._game_series(game_id) if (low := series.low_since(since)) is not None]
+        return min(lows) if lows else None
+
+    def first_seen(self, game_id):
+        """Timestamp of the oldest sample for a game, or None."""
+        firsts = [series.times[0] for series in self._game_series(game_id) if len(series)]
+        return min(firsts) if firsts else None
+
+    # -----------------------
+    # Persistence
+    # -----------------------
+
+    def export(self, now=None):
+        """Drop expired data and copy out what encode() needs.
+
+        Runs on the event loop: the copies are C-level array copies plus references to
+        GameDetails, which are replaced rather than changed when a game is re-recorded.
+        """
+        now = time.time() if now is None else now
+        cutoff = now - RETENTION_SECONDS
+        series_items = []
+        for (game_id, store_id), series in self._series.items():
+            series.trim(cutoff)
+            if len(series):
+                series_items.append((game_id, store_id, len(series), series.times.tobytes(), series.prices.tobytes()))
+        for game_id in [gid for gid, detail in self._details.items() if detail.fetched_at < cutoff]:
+            del self._details[game_id]
+        return list(self._details.items()), series_items
+
+    @staticmethod
+    def encode(exported):
+        """Serialize an export(). CPU-bound on a large history; call through asyncio.to_thread."""
+        details, series_items = exported
+        meta = json.dumps({
+            game_id: {
+                "title": detail.title,
+                "thumb": detail.thumb,
+                "cheapest_ever": detail.cheapest_ever,
+                "deals": [[d.store_id, d.deal_id, d.price, d.retail_price, d.savings] for d in detail.deals],
+                "updated_at": int(detail.fetched_at),
+            }
+            for game_id, detail in details
+        }, separators=(",", ":")).encode("utf-8")
+        parts = [MAGIC + struct.pack("<HI", VERSION, len(meta)), meta, struct.pack("<I", len(series_items))]
+        for game_id, store_id, count, times, prices in series_items:
+            gid = game_id.encode("utf-8")
+            sid = store_id.encode("utf-8")
+            parts.append(struct.pack("<H", len(gid)) + gid + struct.pack("<H", len(sid)) + sid)
+            parts.append(struct.pack("<I", count))
+            parts.append(times)
+            parts.append(prices)
+        return b"".join(parts)
+
+    def load_bytes(self, blob):
+        if blob[:4] != MAGIC:
+            raise ValueError("not a price history file")
+        version, meta_len = struct.unpack_from("<HI", blob, 4)
+        if version != VERSION:
+            raise ValueError(f"unsupported price history version {version}")
+        offset = 10
+        meta = json.loads(blob[offset:offset + meta_len].decode("utf-8"))
+        offset += meta_len
+        (count,) = struct.unpack_from("<I", blob, offset)
+        offset += 4
+
+        series_map = {}
+        stores = {}
+        for _ in range(count):
+            (n,) = struct.unpack_from("<H", blob, offset)
+            game_id = blob[offset + 2:offset + 2 + n].decode("utf-8")
+            offset += 2 + n
+            (n,) = struct.unpack_from("<H", blob, offset)
+            store_id = blob[offset + 2:offset + 2 + n].decode("utf-8")
+            offset += 2 + n
+            (samples,) = struct.unpack_from("<I", blob, offset)
+            offset += 4
+            times = array("q")
+            times.frombytes(blob[offset:offset + samples * times.itemsize])
+            offset += samples * times.itemsize
+            prices = array("f")
+            prices.frombytes(blob[offset:offset + samples * prices.itemsize])
+            offset += samples * prices.itemsize
+            series_map[(game_id, store_id)] = PriceSeries(times, prices)
+            stores.setdefault(game_id, []).append(store_id)
+
+        self._details = {
+            game_id: GameDetail(
+                game_id, m["title"], m["thumb"], m["cheapest_ever"],
+                [Deal(*deal) for deal in m["deals"]], m["updated_at"]
+            )
+            for game_id, m in meta.items()
+        }
+        self._series = series_map
+        self._stores = stores
+        self.dirty = False
+
+    def load(self):
+        """Load from disk; a missing file leaves the store empty."""
+        try:
+            with open(self.path, "rb") as f:
+                self.load_bytes(f.read())
+        except FileNotFoundError:
+            return
+
+    def save(self, exported):
+        """Encode and write an export(). Blocking; call through asyncio.to_thread."""
+        self.write(self.encode(exported))
+
+    def write(self, blob):
+        """Write serialized bytes atomically. Blocking; call through asyncio.to_thread."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(blob)
+        os.replace(tmp_path, self.path)
+
+
+price_history = PriceHistory()
@@ -0,0 +1,126 @@
+import asyncio
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+# Priority lanes: lower value is served first.
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+LANES = (PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND)
+
+# (requests per second, burst) per upstream host
+HOST_LIMITS = {
+    "www.cheapshark.com": (2.0, 5),
+    "api.exchangerate-api.com": (0.5, 2),
+    "store-site-backend-static.ak.epicgames.com": (1.0, 3),
+    "www.gamerpower.com": (1.0, 3),
+}
+DEFAULT_LIMIT = (2.0, 5)
+
+
+class HostLimiter:
+    """Token bucket for one host. Waiters queue per priority lane and are released in lane order."""
+
+    def __init__(self, host, rate, burst):
+        self.host = host
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lanes = {lane: deque() for lane in LANES}
+        self._dispatcher = None
+
+        # Metrics
+        self.acquired = {lane: 0 for lane in LANES}
+        self.waited = {lane: 0 for lane in LANES}
+        self.wait_total = {lane: 0.0 for lane in LANES}
+        self.wait_max = {lane: 0.0 for lane in LANES}
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _queued(self):
+        return sum(len(q) for q in self._lanes.values())
+
+    def _record(self, lane, waited_for):
+        self.acquired[lane] += 1
+        if waited_for > 0:
+            self.waited[lane] += 1
+            self.wait_total[lane] += waited_for
+            self.wait_max[lane] = max(self.wait_max[lane], waited_for)
+
+    async def acquire(self, priority=PRIORITY_INTERACTIVE):
+        lane = priority if priority in self._lanes else PRIORITY_BACKGROUND
+        self._refill()
+        if not self._queued() and self._tokens >= 1:
+            self._tokens -= 1
+            self._record(lane, 0.0)
+            return
+
+        fut = asyncio.get_running_loop().create_future()
+        self._lanes[lane].append((fut, time.monotonic()))
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        await fut
+
+    async def _dispatch(self):
+        while self._queued():
+            self._refill()
+            while self._tokens >= 1 and self._queued():
+                for lane in LANES:
+                    queue = self._lanes[lane]
+                    if not queue:
+                        continue
+                    fut, enqueued = queue.popleft()
+                    if fut.cancelled():
+                        break
+                    self._tokens -= 1
+                    self._record(lane, time.monotonic() - enqueued)
+                    fut.set_result(None)
+                    break
+            if self._queued():
+                await asyncio.sleep(max(0.0, (1 - self._tokens) / self.rate))
+
+    def stats(self):
+        return {
+            "host": self.host,
+            "rate": self.rate,
+            "burst": self.burst,
+            "tokens": round(self._tokens, 2),
+            "queue_depth": {lane: len(q) for lane, q in self._lanes.items()},
+            "acquired": dict(self.acquired),
+            "waited": dict(self.waited),
+            "avg_wait": {
+                lane: (self.wait_total[lane] / self.waited[lane]) if self.waited[lane] else 0.0
+                for lane in LANES
+            },
+            "max_wait": dict(self.wait_max),
+        }
+
+
+class RateLimiter:
+    """Per-host outbound limiter shared by every cog that talks to an upstream API."""
+
+    def __init__(self, limits=None, default=DEFAULT_LIMIT):
+        self.limits = dict(HOST_LIMITS if limits is None else limits)
+        self.default = default
+        self._hosts = {}
+
+    def for_host(self, host):
+        limiter = self._hosts.get(host)
+        if limiter is None:
+            rate, burst = self.limits.get(host, self.default)
+            limiter = self._hosts[host] = HostLimiter(host, rate, burst)
+        return limiter
+
+    async def acquire(self, url, priority=PRIORITY_INTERACTIVE):
+        """Wait for a request slot for the host of `url`."""
+        await self.for_host(urlsplit(url).hostname or "").acquire(priority)
+
+    def stats(self):
+        return [limiter.stats() for limiter in self._hosts.values()]
+
+
+limiter = RateLimiter()
@@ -0,0 +1,120 @@
+import heapq
+import math
+import random
+import time
+
+# Interval bounds (seconds) for how often a single tracked game is re-checked.
+BASE_INTERVAL = 3 * 3600
+MIN_INTERVAL = 45 * 60
+MAX_INTERVAL = 12 * 3600
+NEAR_ATL_INTERVAL = 90 * 60
+RETRY_INTERVAL = 20 * 60
+
+# A price within this ratio of the all-time low counts as "near ATL".
+NEAR_ATL_RATIO = 1.10
+
+
+class TrackerScheduler:
+    """Keeps a next-check time per distinct tracked game and spreads checks over time.
+
+    Games are checked on their own interval instead of all at once. The interval
+    shrinks when the price moves or sits close to the all-time low and grows
+    while the price stays flat, bounded by MIN_INTERVAL / MAX_INTERVAL.
+    """
+
+    def __init__(self, tick_seconds=60):
+        self.tick_seconds = tick_seconds
+        self._next = {}        # game_id -> epoch seconds of next check
+        self._interval = {}    # game_id -> current interval in seconds
+        self._last_price = {}  # game_id -> last observed best price
+        self._heap = []        # (due, game_id), lazily invalidated
+
+    def __len__(self):
+        return len(self._next)
+
+    def __contains__(self, game_id):
+        return game_id in self._next
+
+    def _push(self, game_id, due):
+        self._next[game_id] = due
+        heapq.heappush(self._heap, (due, game_id))
+
+    def add(self, game_id, soon=False, now=None):
+        """Start scheduling a game. New games are placed at a random offset so load stays flat."""
+        now = time.time() if now is None else now
+        if game_id in self._next:
+            if soon:
+                self._push(game_id, min(self._next[game_id], now + self.tick_seconds))
+            return
+        self._interval[game_id] = BASE_INTERVAL
+        offset = self.tick_seconds if soon else random.uniform(0, BASE_INTERVAL)
+        self._push(game_id, now + offset)
+
+    def remove(self, game_id):
+        self._next.pop(game_id, None)
+        self._interval.pop(game_id, None)
+        self._last_price.pop(game_id, None)
+
+    def sync(self, game_ids, now=None):
+        """Make the scheduled set match `game_ids`, keeping existing due times."""
+        wanted = set(game_ids)
+        for game_id in list(self._next):
+            if game_id not in wanted:
+                self.remove(game_id)
+        for game_id in wanted:
+            self.add(game_id, now=now)
+
+    def _budget(self):
+        """How many checks one tick may run: the steady-state rate plus a little slack to catch up."""
+        rate = sum(self.tick_seconds / iv for iv in self._interval.values())
+        return max(1, math.ceil(rate * 1.5))
+
+    def due(self, now=None):
+        """Pop the games whose check is due, at most one tick's budget worth."""
+        now = time.time() if now is None else now
+        budget = self._budget()
+        result = []
+        while self._heap and len(result) < budget:
+            due, game_id = self._heap[0]
+            if self._next.get(game_id) != due:
+                heapq.heappop(self._heap)  # stale entry
+                continue
+            if due > now:
+                break
+            heapq.heappop(self._heap)
+            result.append(game_id)
+        return result
+
+    def record(self, game_id, best_price, cheapest_ever=None, now=None):
+        """Adapt the interval of a game from a fresh observation and schedule its next check."""
+        if game_id not in self._next:
+            return
+        now = time.time() if now is None else now
+        interval = self._interval.get(game_id, BASE_INTERVAL)
+        last = self._last_price.get(game_id)
+        self._last_price[game_id] = best_price
+
+        if last is not None and best_price is not None and abs(best_price - last) > 0.005:
+            interval = max(MIN_INTERVAL, interval / 2)
+        elif best_price is not None and cheapest_ever and best_price <= cheapest_ever * NEAR_ATL_RATIO:
+            interval = min(NEAR_ATL_INTERVAL, interval * 1.5)
+        else:
+            interval = min(MAX_INTERVAL, interval * 1.5)
+
+        self._interval[game_id] = interval
+        self._push(game_id, now + interval * random.uniform(0.9, 1.1))
+
+    def record_failure(self, game_id, now=None):
+        """Retry a failed check sooner than its normal interval, without changing the interval."""
+        if game_id not in self._next:
+            return
+        now = time.time() if now is None else now
+        self._push(game_id, now + min(RETRY_INTERVAL, self._interval.get(game_id, BASE_INTERVAL)))
+
+    def stats(self):
+        intervals = list(self._interval.values())
+        return {
+            "games": len(self._next),
+            "avg_interval": (sum(intervals) / len(intervals)) if intervals else 0,
+            "budget_per_tick": self._budget() if intervals else 0,
+        }
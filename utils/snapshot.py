@@ -0,0 +1,114 @@
+import json
+import os
+import struct
+import time
+import zlib
+
+# On-disk layout: magic b"GCWS", u16 version, f64 written_at (unix time),
+# then zlib-compressed JSON {section name: section data}.
+MAGIC = b"GCWS"
+VERSION = 1
+HEADER = struct.Struct("<4sHd")
+
+DEFAULT_PATH = os.getenv("WARM_SNAPSHOT_PATH", "data/warm_snapshot.bin")
+
+# A snapshot older than this is ignored rather than trusted
+MAX_AGE_SECONDS = 30 * 86400
+
+
+class WarmSnapshot:
+    """Hot datasets saved to disk so a restart starts warm instead of empty.
+
+    Modules register a named section with an export function (returns JSON-able data,
+    or None to skip) and a restore function. Sections read from disk before their owner
+    registers are kept and handed over on registration, so the snapshot can be loaded
+    before the cogs that use it.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self._sections = {}  # name -> (export, restore)
+        self._pending = {}   # name -> data loaded from disk, not yet restored
+        self.loaded_at = None
+
+    def register(self, name, export, restore):
+        self._sections[name] = (export, restore)
+        if name in self._pending:
+            self._restore(name, restore, self._pending.pop(name))
+
+    @staticmethod
+    def _restore(name, restore, data):
+        try:
+            restore(data)
+        except Exception as e:
+            print(f"❌ Failed to restore warm-start section {name}: {e}")
+
+    def load(self):
+        """Read the snapshot from disk; a missing, old or incompatible file is ignored."""
+        try:
+            with open(self.path, "rb") as f:
+                raw = f.read()
+        except FileNotFoundError:
+            return False
+        if len(raw) < HEADER.size:
+            print("⚠️ Warm-start snapshot is truncated; ignoring it.")
+            return False
+        magic, version, written_at = HEADER.unpack_from(raw)
+        if magic != MAGIC or version != VERSION:
+            print(f"⚠️ Warm-start snapshot has version {version}, expected {VERSION}; ignoring it.")
+            return False
+        if time.time() - written_at > MAX_AGE_SECONDS:
+            print("⚠️ Warm-start snapshot is too old; ignoring it.")
+            return False
+        try:
+            sections = json.loads(zlib.decompress(raw[HEADER.size:]))
+        except (zlib.error, ValueError) as e:
+            print(f"⚠️ Warm-start snapshot is corrupt ({e}); ignoring it.")
+            return False
+
+        for name, data in sections.items():
+            if name in self._sections:
+                self._restore(name, self._sections[name][1], data)
+            else:
+                self._pending[name] = data
+        self.loaded_at = written_at
+        return True
+
+    def export(self):
+        """Collect every section's data. Runs on the event loop; exports are cheap copies."""
+        sections = {}
+        for name, (export, _) in list(self._sections.items()):
+            try:
+                data = export()
+            except Exception as e:
+                print(f"❌ Failed to export warm-start section {name}: {e}")
+                continue
+            if data is not None:
+                sections[name] = data
+        # Sections whose owner never registered this run are carried over unchanged
+        for name, data in self._pending.items():
+            sections.setdefault(name, data)
+        return sections
+
+    @staticmethod
+    def encode(sections):
+        """Serialize exported sections. CPU-bound on large mirrors; call through asyncio.to_thread."""
+        payload = zlib.compress(json.dumps(sections, separators=(",", ":")).encode("utf-8"), 6)
+        return HEADER.pack(MAGIC, VERSION, time.time()) + payload
+
+    def save(self, sections):
+        """Encode and write exported sections. Blocking; call through asyncio.to_thread."""
+        self.write(self.encode(sections))
+
+    def write(self, payload):
+        """Write serialized bytes atomically. Blocking; call through asyncio.to_thread."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, self.path)
+
+
+warm_snapshot = WarmSnapshot()
@@ -0,0 +1,198 @@
+import contextvars
+import functools
+import os
+import secrets
+import time
+from collections import deque
+
+import aiohttp
+
+from utils.metrics import registry
+
+SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "gameclaim-bot")
+
+# OTLP/HTTP JSON collector for finished traces; unset keeps them in memory only
+_OTLP_BASE = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT")
+OTLP_ENDPOINT = os.getenv("OTEL_EXPORTER_OTLP_TRACES_ENDPOINT") or (f"{_OTLP_BASE.rstrip('/')}/v1/traces" if _OTLP_BASE else None)
+
+# Finished traces kept for /traces, and queued for the collector (oldest dropped first)
+RECENT_TRACES = 200
+EXPORT_QUEUE_SIZE = 2000
+EXPORT_BATCH = 200
+
+# OTLP span kinds and status codes
+KIND_INTERNAL = 1
+KIND_SERVER = 2
+STATUS_ERROR = 2
+
+span_seconds = registry.histogram("gameclaim_span_seconds", "Traced interaction steps, by root command and span", ("command", "span"))
+
+_current = contextvars.ContextVar("gameclaim_span", default=None)
+
+
+def _attributes(values):
+    attributes = []
+    for key, value in values.items():
+        if isinstance(value, bool):
+            typed = {"boolValue": value}
+        elif isinstance(value, int):
+            typed = {"intValue": str(value)}
+        elif isinstance(value, float):
+            typed = {"doubleValue": value}
+        else:
+            typed = {"stringValue": str(value)}
+        attributes.append({"key": key, "value": typed})
+    return attributes
+
+
+class Span:
+    """One timed step. The first span of a trace is its root and collects the others."""
+
+    __slots__ = ("tracer", "name", "trace_id", "span_id", "parent_id", "root", "attributes",
+                 "start_ns", "duration", "error", "spans", "_started", "_token")
+
+    def __init__(self, tracer, name, parent, attributes):
+        self.tracer = tracer
+        self.name = name
+        self.span_id = secrets.token_hex(8)
+        if parent is None:
+            self.trace_id = secrets.token_hex(16)
+            self.parent_id = None
+            self.root = self
+        else:
+            self.trace_id = parent.trace_id
+            self.parent_id = parent.span_id
+            self.root = parent.root
+        self.attributes = attributes
+        self.start_ns = None
+        self.duration = None
+        self.error = None
+        self.spans = []
+
+    def set(self, key, value):
+        self.attributes[key] = value
+
+    def __enter__(self):
+        self.start_ns = time.time_ns()
+        self._started = time.perf_counter()
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self._started
+        _current.reset(self._token)
+        if exc_type is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        if self.root is self:
+            self.tracer._finish(self)
+        elif self.root.duration is None:
+            # Spans that outlive their root (e.g. a prefetch) are dropped
+            self.root.spans.append(self)
+        return False
+
+    def to_otlp(self):
+        data = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": KIND_SERVER if self.parent_id is None else KIND_INTERNAL,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.start_ns + int(self.duration * 1e9)),
+            "attributes": _attributes(self.attributes),
+        }
+        if self.parent_id is not None:
+            data["parentSpanId"] = self.parent_id
+        if self.error:
+            data["status"] = {"code": STATUS_ERROR, "message": self.error}
+        return data
+
+
+class _NoSpan:
+    """Stand-in for span() outside a trace, so background work pays nothing."""
+
+    def set(self, key, value):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NO_SPAN = _NoSpan()
+
+
+class Tracer:
+    """Lightweight span tracing for interactions, exportable as OTLP/JSON.
+
+    `trace(name)` (or the `traced(name)` decorator) opens a root span around a command or
+    component callback; `span(name)` times a step inside whatever trace is active and is a
+    no-op when there is none. The current span rides on a contextvar, so steps nest across
+    awaits without being passed around. Finished traces feed the gameclaim_span_seconds
+    histogram, are kept for /traces and, with OTEL_EXPORTER_OTLP_ENDPOINT set, are pushed to
+    an OpenTelemetry collector.
+    """
+
+    def __init__(self, endpoint=OTLP_ENDPOINT):
+        self.endpoint = endpoint
+        self.recent = deque(maxlen=RECENT_TRACES)
+        self._unexported = deque(maxlen=EXPORT_QUEUE_SIZE)
+        self.exported = 0
+        self.export_failures = 0
+
+    def trace(self, name, **attributes):
+        return Span(self, name, _current.get(), attributes)
+
+    def span(self, name, **attributes):
+        parent = _current.get()
+        if parent is None:
+            return NO_SPAN
+        return Span(self, name, parent, attributes)
+
+    def traced(self, name):
+        """Decorator: run a coroutine (command or component callback) as the root span `name`."""
+        def decorator(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                with self.trace(name):
+                    return await func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def _finish(self, root):
+        span_seconds.labels(root.name, root.name).observe(root.duration)
+        for span in root.spans:
+            span_seconds.labels(root.name, span.name).observe(span.duration)
+        self.recent.append(root)
+        if self.endpoint:
+            self._unexported.append(root)
+
+    def to_otlp(self, traces):
+        spans = [span.to_otlp() for root in traces for span in (root, *root.spans)]
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": _attributes({"service.name": SERVICE_NAME})},
+                "scopeSpans": [{"scope": {"name": "gameclaim"}, "spans": spans}],
+            }]
+        }
+
+    async def flush(self, session):
+        """POST queued traces to the collector in batches. Returns how many were sent."""
+        sent = 0
+        while self.endpoint and self._unexported:
+            batch = [self._unexported.popleft() for _ in range(min(EXPORT_BATCH, len(self._unexported)))]
+            try:
+                async with session.post(self.endpoint, json=self.to_otlp(batch), timeout=aiohttp.ClientTimeout(total=10)) as response:
+                    if response.status >= 400:
+                        raise RuntimeError(f"HTTP {response.status}")
+            except Exception as e:
+                self.export_failures += 1
+                print(f"⚠️ Trace export failed, dropped {len(batch)} traces: {e}")
+                break
+            sent += len(batch)
+        self.exported += sent
+        return sent
+
+
+tracer = Tracer()
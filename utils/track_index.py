@@ -0,0 +1,122 @@
+import bisect
+
+
+class GameWatchers:
+    """Every track on one game, grouped by criterion.
+
+    "below" tracks are kept sorted by threshold, so one price observation finds all
+    watchers at or above it with a single binary search. "sale" and "atl" tracks
+    share one trigger per game and fire together.
+    """
+    __slots__ = ("thresholds", "below", "sale", "atl")
+
+    def __init__(self):
+        self.thresholds = []  # sorted thresholds, parallel to `below`
+        self.below = []       # tracks in threshold order
+        self.sale = []
+        self.atl = []
+
+    def __len__(self):
+        return len(self.below) + len(self.sale) + len(self.atl)
+
+    def add(self, track):
+        track_type = track.get("track_type") or "sale"
+        if track_type == "below":
+            try:
+                threshold = float(track.get("threshold"))
+            except (TypeError, ValueError):
+                return
+            pos = bisect.bisect_right(self.thresholds, threshold)
+            self.thresholds.insert(pos, threshold)
+            self.below.insert(pos, track)
+        elif track_type == "atl":
+            self.atl.append(track)
+        else:
+            self.sale.append(track)
+
+    def remove(self, track_id):
+        for index, track in enumerate(self.below):
+            if track.get("id") == track_id:
+                del self.below[index]
+                del self.thresholds[index]
+                return True
+        for bucket in (self.sale, self.atl):
+            for index, track in enumerate(bucket):
+                if track.get("id") == track_id:
+                    del bucket[index]
+                    return True
+        return False
+
+    def hits(self, deals, cheapest_ever):
+        """Tracks satisfied by the current Deal list, as (track, deal, kind) tuples."""
+        cheapest_deal, cheapest_price = None, None
+        sale_deal, sale_price = None, None
+        for deal in deals:
+            price = deal.price
+            if cheapest_price is None or price < cheapest_price:
+                cheapest_deal, cheapest_price = deal, price
+            if deal.savings > 0 and (sale_price is None or price < sale_price):
+                sale_deal, sale_price = deal, price
+
+        found = []
+        if cheapest_deal is not None and self.below:
+            # Everyone whose threshold is at or above the current price
+            start = bisect.bisect_left(self.thresholds, cheapest_price)
+            found.extend((track, cheapest_deal, "below") for track in self.below[start:])
+        if sale_deal is not None:
+            found.extend((track, sale_deal, "sale") for track in self.sale)
+            if sale_price <= cheapest_ever:
+                found.extend((track, sale_deal, "atl") for track in self.atl)
+        return found
+
+
+class TrackIndex:
+    """Tracked rows indexed by CheapShark game ID.
+
+    `fired` maps track ID -> game ID for tracks whose alert was sent but whose row is
+    not deleted yet. They stay indexed (a reload would bring them back anyway) but
+    hits() skips them, so a failed delete never sends the same alert twice.
+    """
+
+    def __init__(self, fired=None):
+        self._games = {}
+        self.fired = {} if fired is None else fired
+
+    def __len__(self):
+        return len(self._games)
+
+    def __contains__(self, game_id):
+        return game_id in self._games
+
+    def game_ids(self):
+        return self._games.keys()
+
+    def add(self, track):
+        game_id = track.get("cheapshark_game_id")
+        if game_id:
+            self._games.setdefault(game_id, GameWatchers()).add(track)
+
+    def rebuild(self, tracks):
+        self._games = {}
+        for track in tracks:
+            self.add(track)
+
+    def get(self, game_id):
+        return self._games.get(game_id)
+
+    def remove(self, game_id, track_id):
+        watchers = self._games.get(game_id)
+        if watchers is None:
+            return
+        watchers.remove(track_id)
+        if not watchers:
+            del self._games[game_id]
+
+    def hits(self, game_id, deals, cheapest_ever):
+        watchers = self._games.get(game_id)
+        if not watchers:
+            return []
+        found = watchers.hits(deals, cheapest_ever)
+        if self.fired:
+            found = [hit for hit in found if hit[0].get("id") not in self.fired]
+        return found
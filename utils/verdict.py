@@ -0,0 +1,56 @@
+import numpy as np
+
+# Verdict tiers, best first
+BUY_NOW = 0
+VERY_GOOD = 1
+GOOD = 2
+WAIT = 3
+
+# A price within these factors of the all-time low, or a discount of at least
+# these percentages, earns the tier
+VERY_GOOD_ATL_FACTOR = 1.10
+VERY_GOOD_SAVINGS = 75
+GOOD_ATL_FACTOR = 1.25
+GOOD_SAVINGS = 50
+
+
+def verdict_tier(price, atl, savings):
+    """Verdict tier for one deal; atl may be None when the all-time low is unknown."""
+    if atl is not None and price <= atl:
+        return BUY_NOW
+    if (atl is not None and price <= atl * VERY_GOOD_ATL_FACTOR) or savings >= VERY_GOOD_SAVINGS:
+        return VERY_GOOD
+    if (atl is not None and price <= atl * GOOD_ATL_FACTOR) or savings >= GOOD_SAVINGS:
+        return GOOD
+    return WAIT
+
+
+def verdict_tiers(prices, atls, savings):
+    """verdict_tier over whole arrays; NaN in `atls` marks an unknown all-time low."""
+    prices = np.asarray(prices, dtype=np.float64)
+    atls = np.asarray(atls, dtype=np.float64)
+    savings = np.asarray(savings, dtype=np.float64)
+    # Comparisons against NaN are False, so unknown lows fall through to the savings tests
+    with np.errstate(invalid="ignore"):
+        return np.select(
+            [
+                prices <= atls,
+                (prices <= atls * VERY_GOOD_ATL_FACTOR) | (savings >= VERY_GOOD_SAVINGS),
+                (prices <= atls * GOOD_ATL_FACTOR) | (savings >= GOOD_SAVINGS),
+            ],
+            [BUY_NOW, VERY_GOOD, GOOD],
+            default=WAIT,
+        )
+
+
+def rank_deals(prices, atls, savings, limit=10):
+    """Indices of the best-value deals: best tier first, then closest to the all-time low, then biggest discount."""
+    prices = np.asarray(prices, dtype=np.float64)
+    atls = np.asarray(atls, dtype=np.float64)
+    savings = np.asarray(savings, dtype=np.float64)
+    tiers = verdict_tiers(prices, atls, savings)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        above_atl = np.where(atls > 0, (prices - atls) / atls, np.inf)
+    # lexsort sorts by the last key first
+    order = np.lexsort((-savings, above_atl, tiers))
+    return order[:limit], tiers